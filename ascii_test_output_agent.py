@@ -5,19 +5,86 @@ Real-time test visualization and strip reporting
 Agent: Elena Rodriguez (QA Visualization Engineer)
 """
 
+import asyncio
 import json
 import time
 import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
 import hashlib
 
+from terminal_frame_renderer import DISPLAY_FPS, TerminalFrameRenderer
+
+STATUS_SYMBOLS = {
+    'pending': '○',
+    'running': '●',
+    'passed': '✓',
+    'failed': '✗',
+    'timeout': '⧗'
+}
+
+# Tests shown at once by the async monitor; the rest are summarized in one line
+MONITOR_MAX_ROWS = 40
+
+STRIP_SEPARATOR = "═" * 79
+
+@lru_cache(maxsize=4096)
+def _bar(filled: int, width: int) -> str:
+    return "█" * filled + "░" * (width - filled)
+
+@dataclass
+class TestRun:
+    """Progress of one test as reported by step events"""
+    test_id: str
+    steps: Dict[int, Dict] = field(default_factory=dict)
+    total_steps: int = 0
+    passed_steps: int = 0
+    failed_steps: int = 0
+    current_step: Optional[Dict] = None
+    status: str = 'RUNNING'
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    def update_step(self, number: int, update: Dict):
+        step = self.steps.setdefault(number, {'step': number, 'status': 'pending'})
+        previous = step['status']
+        step.update(update)
+        status = step['status']
+        if previous != status:
+            self.passed_steps += (status == 'passed') - (previous == 'passed')
+            self.failed_steps += (status in ('failed', 'timeout')) - (previous in ('failed', 'timeout'))
+        if status == 'running':
+            self.current_step = step
+        elif self.current_step is step:
+            self.current_step = None
+        self.total_steps = max(self.total_steps, number)
+
+    def finish(self, status: Optional[str] = None):
+        self.status = status or ('FAILED' if self.failed_steps else 'PASSED')
+        self.finished = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def results(self) -> Dict:
+        return {
+            'test_id': self.test_id,
+            'status': self.status,
+            'duration': self.duration,
+            'passed_steps': self.passed_steps,
+            'total_steps': self.total_steps
+        }
+
 class AsciiTestOutputAgent:
     def __init__(self):
         self.agent_name = "Elena Rodriguez"
         self.agent_role = "QA Visualization Engineer"
         self.voice_enabled = True
         self.blockchain_hash = None
+        self.skipped_events = 0  # Malformed monitor events that were ignored
 
     def generate_ascii_header(self, test_name: str) -> str:
         """Generate ASCII art header for test execution"""
@@ -36,7 +103,7 @@ class AsciiTestOutputAgent:
     def generate_progress_bar(self, current: int, total: int, width: int = 50) -> str:
         """Generate ASCII progress bar"""
         filled = int(width * current / total)
-        bar = "█" * filled + "░" * (width - filled)
+        bar = _bar(filled, width)
         percentage = (current / total) * 100
         return f"[{bar}] {percentage:6.2f}% ({current}/{total})"
 
@@ -47,15 +114,7 @@ class AsciiTestOutputAgent:
         status = step.get('status', 'pending')
         timeout = step.get('timeout', 'N/A')
 
-        status_symbols = {
-            'pending': '○',
-            'running': '●',
-            'passed': '✓',
-            'failed': '✗',
-            'timeout': '⧗'
-        }
-
-        symbol = status_symbols.get(status, '?')
+        symbol = STATUS_SYMBOLS.get(status, '?')
 
         return f"  {symbol} Step {step_num:2d}: {action:<30} │ Timeout: {timeout:<5} │ {status.upper()}"
 
@@ -92,6 +151,27 @@ class AsciiTestOutputAgent:
         """
         return strip
 
+    def generate_strip_reports(self, batch: Iterable[Dict]) -> str:
+        """Strip report for many results at once: one row per test plus a totals row, built in a single pass"""
+        rows = []
+        counts = {"PASSED": 0, "FAILED": 0}
+        total_duration = 0.0
+        for test_results in batch:
+            status = test_results.get('status', 'Unknown')
+            duration = test_results.get('duration', 0)
+            status_icon = "✓" if status == "PASSED" else "✗" if status == "FAILED" else "⧗"
+            rows.append(
+                f"  {status_icon} {test_results.get('test_id', 'Unknown'):<30} │ {status:<8} │ {duration:>6.2f}s │ "
+                f"{test_results.get('passed_steps', 0)}/{test_results.get('total_steps', 0)} steps"
+            )
+            counts[status] = counts.get(status, 0) + 1
+            total_duration += duration
+
+        other = len(rows) - counts["PASSED"] - counts["FAILED"]
+        totals = (f"  {len(rows)} tests │ {counts['PASSED']} passed │ {counts['FAILED']} failed │ "
+                  f"{other} other │ {total_duration:.2f}s total")
+        return "\n".join([STRIP_SEPARATOR, *rows, STRIP_SEPARATOR, totals, STRIP_SEPARATOR])
+
     def generate_voice_summary(self, test_results: Dict) -> str:
         """Generate natural voice summary for spoken reports"""
         test_id = test_results.get('test_id', 'Unknown test')
@@ -193,6 +273,138 @@ Execution time was {duration:.1f} seconds.
 
         return final_results
 
+    async def real_time_monitor_async(
+        self,
+        events: Union[asyncio.Queue, AsyncIterator],
+        stream=None,
+        fps: float = DISPLAY_FPS
+    ) -> List[Dict]:
+        """Event-driven monitoring of any number of concurrent tests.
+
+        ``events`` is an asyncio.Queue (``None`` ends the stream) or an async
+        iterator such as a WebSocket connection; items are dicts or JSON text:
+
+            {"type": "test_start", "test_id": ..., "test_sequence": [...]}
+            {"type": "step", "test_id": ..., "step": 2, "status": "running"}
+            {"type": "test_end", "test_id": ..., "status": "PASSED"}
+            {"type": "stream_end"}
+
+        Events are applied as they arrive; the display is redrawn at most
+        ``fps`` times per second. Returns the results of every test seen.
+        """
+        runs: Dict[str, TestRun] = {}
+        renderer = TerminalFrameRenderer(stream, fps)
+        dirty = asyncio.Event()
+
+        async def draw():
+            while True:
+                await dirty.wait()
+                wait = renderer.last_render + renderer.min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                dirty.clear()
+                renderer.render(self.compose_monitor_frame(runs))
+
+        drawer = asyncio.create_task(draw())
+        try:
+            async for event in self._step_events(events):
+                try:
+                    self.apply_step_event(runs, event)
+                except (TypeError, ValueError, AttributeError) as e:
+                    # Events come from queues and sockets; one bad one must not end the monitor
+                    self.skipped_events += 1
+                    print(f"[MONITOR] Skipped malformed event {event!r}: {e}", file=sys.stderr)
+                    continue
+                dirty.set()
+        finally:
+            drawer.cancel()
+            await asyncio.gather(drawer, return_exceptions=True)
+        renderer.render(self.compose_monitor_frame(runs))
+
+        return [run.results() for run in runs.values()]
+
+    async def _step_events(self, events) -> AsyncIterator[Dict]:
+        if isinstance(events, asyncio.Queue):
+            async def drain():
+                while (item := await events.get()) is not None:
+                    yield item
+            source = drain()
+        else:
+            source = events
+
+        async for event in source:
+            if isinstance(event, (str, bytes)):
+                try:
+                    event = json.loads(event)
+                except ValueError as e:
+                    self.skipped_events += 1
+                    print(f"[MONITOR] Skipped undecodable event: {e}", file=sys.stderr)
+                    continue
+            if not isinstance(event, dict):
+                self.skipped_events += 1
+                print(f"[MONITOR] Skipped non-object event {event!r}", file=sys.stderr)
+                continue
+            if event.get('type') == 'stream_end':
+                return
+            yield event
+
+    def apply_step_event(self, runs: Dict[str, 'TestRun'], event: Dict):
+        """Fold one step event into the per-test state.
+
+        Step numbers arriving as JSON strings are coerced to int; anything that
+        cannot be raises TypeError/ValueError before the state is touched.
+        """
+        test_id = str(event.get('test_id', 'Unknown Test'))
+        event_type = event.get('type', 'step')
+        run = runs.get(test_id) or TestRun(test_id)
+
+        if event_type == 'test_start':
+            steps = [
+                (int(step.get('step', number)), step)
+                for number, step in enumerate(event.get('test_sequence', []), start=1)
+            ]
+            runs[test_id] = run
+            for number, step in steps:
+                run.update_step(number, {**step, 'step': number, 'status': step.get('status', 'pending')})
+        elif event_type == 'test_end':
+            runs[test_id] = run
+            run.finish(event.get('status'))
+        else:
+            number = int(event.get('step', run.total_steps + 1))
+            update = {key: event[key] for key in ('action', 'timeout', 'status') if key in event}
+            runs[test_id] = run
+            run.update_step(number, update)
+
+    def compose_monitor_frame(self, runs: Dict[str, 'TestRun'], width: int = 20) -> List[str]:
+        """One line per test, running tests first"""
+        running = [run for run in runs.values() if run.finished is None]
+        finished = [run for run in runs.values() if run.finished is not None]
+        shown = (running + finished[::-1])[:MONITOR_MAX_ROWS]
+
+        lines = [
+            f"CTAS-7 TEST EXECUTION │ Agent: {self.agent_name} │ {datetime.now().strftime('%H:%M:%S')}",
+            f"Running: {len(running)} │ Finished: {len(finished)} │ "
+            f"Failed: {sum(1 for run in finished if run.status != 'PASSED')}",
+            ""
+        ]
+        for run in shown:
+            total = run.total_steps or 1
+            done = run.passed_steps + run.failed_steps
+            if run.finished is not None:
+                symbol = STATUS_SYMBOLS['passed' if run.status == 'PASSED' else 'failed']
+                detail = run.status
+            else:
+                symbol = STATUS_SYMBOLS['running']
+                step = run.current_step
+                detail = f"Step {step['step']:2d}: {step.get('action', '')}" if step else "starting"
+            lines.append(
+                f"  {symbol} {run.test_id[:30]:<30} [{_bar(int(width * done / total), width)}] "
+                f"{done:>3}/{run.total_steps:<3} │ {run.duration:6.1f}s │ {detail}"
+            )
+        if len(runs) > len(shown):
+            lines.append(f"  ... and {len(runs) - len(shown)} more")
+        return lines
+
     def log_to_supabase(self, test_results: Dict):
         """Log results to Supabase for UI consumption"""
         # Generate blockchain hash for verification
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+CTAS-7 Voice WebSocket Server Benchmark
+Concurrent handle_voice_request throughput: blocking requests.post vs the pooled aiohttp client
+
+Runs a local stand-in for the ElevenLabs text-to-speech endpoint with a fixed
+response latency, then fires concurrent voice requests at VoiceWebSocketServer
+using the original blocking synthesis call and the pooled async client.
+
+Usage: python benchmark_voice_websocket_server.py [--requests 64] [--latency-ms 150] [--concurrency 8]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_AUDIO = b"ID3" + b"\x00" * 16 * 1024
+
+def start_fake_elevenlabs(latency: float) -> ThreadingHTTPServer:
+    """Serve POST /v1/text-to-speech/<voice> on an ephemeral port, answering after ``latency`` seconds"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(len(FAKE_AUDIO)))
+            self.end_headers()
+            self.wfile.write(FAKE_AUDIO)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class FakeWebSocket:
+    """Collects frames sent by the server"""
+
+    def __init__(self):
+        self.frames = 0
+        self.audio_bytes = 0
+
+    async def send(self, message):
+        self.frames += 1
+        if isinstance(message, bytes):
+            self.audio_bytes += len(message)
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Largest delay seen between scheduled wake-ups of the event loop"""
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - expected)
+    return worst
+
+async def run_variant(server, requests_count: int) -> dict:
+    websocket = FakeWebSocket()
+    request = {
+        "command": "voice_request",
+        "report_type": "test_completion",
+        "priority": "high",
+        "test_data": {"test_name": "Threat Correlation", "status": "PASSED", "duration": 4.2}
+    }
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(server.handle_voice_request(websocket, request) for _ in range(requests_count)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    max_lag = await lag_task
+
+    return {
+        "requests": requests_count,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests_count / elapsed, 1),
+        "max_loop_lag_ms": round(max_lag * 1000, 1),
+        "audio_bytes": websocket.audio_bytes
+    }
+
+async def main_async(args) -> dict:
+    import requests
+    import voice_websocket_server as vws
+
+    class BlockingVoiceWebSocketServer(vws.VoiceWebSocketServer):
+        """Synthesis as it was before the pooled client: one blocking requests.post per call"""
+
+        async def synthesize_speech(self, text: str) -> bytes:
+            response = requests.post(
+                f"{vws.ELEVENLABS_BASE_URL}/v1/text-to-speech/{self.voice_id}",
+                json={"text": text, "model_id": "eleven_monolingual_v1"},
+                headers={"Accept": "audio/mpeg", "xi-api-key": self.elevenlabs_api_key}
+            )
+            return response.content if response.status_code == 200 else b''
+
+    results = {}
+    for name, server_class in (("blocking_requests", BlockingVoiceWebSocketServer),
+                               ("pooled_aiohttp", vws.VoiceWebSocketServer)):
+        server = server_class()
+        try:
+            results[name] = await run_variant(server, args.requests)
+        finally:
+            await server.close()
+    results["speedup"] = round(results["pooled_aiohttp"]["requests_per_second"] /
+                               results["blocking_requests"]["requests_per_second"], 2)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=64, help="Concurrent voice requests per variant")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Simulated ElevenLabs response latency")
+    parser.add_argument("--concurrency", type=int, default=8, help="VOICE_TTS_MAX_CONCURRENCY for the pooled client")
+    args = parser.parse_args()
+
+    upstream = start_fake_elevenlabs(args.latency_ms / 1000)
+    os.environ["ELEVENLABS_BASE_URL"] = f"http://127.0.0.1:{upstream.server_address[1]}"
+    os.environ["ELEVENLABS_API_KEY"] = "benchmark"
+    os.environ["VOICE_TTS_MAX_CONCURRENCY"] = str(args.concurrency)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    # The server prints a line per report; keep the benchmark output readable
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        results = asyncio.run(main_async(args))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+        upstream.shutdown()
+
+    print(json.dumps({"latency_ms": args.latency_ms, "concurrency": args.concurrency, **results}, indent=2))
+
+if __name__ == "__main__":
+    main()
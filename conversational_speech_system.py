@@ -13,23 +13,64 @@ import io
 import numpy as np
 from datetime import datetime
 import speech_recognition as sr
-import requests
+import aiohttp
 import threading
-import queue
 import time
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
 
 # Set API key
 os.environ['ELEVENLABS_API_KEY'] = "sk_fcfce0cd2d5b3d05165b62d8f1fcba80fcdb9a2950689111"
 
+# Bounds on work waiting between pipeline stages; when the user talks faster
+# than Natasha can answer, the oldest waiting phrase is dropped
+CAPTURE_QUEUE_SIZE = 4
+UTTERANCE_QUEUE_SIZE = 4
+PLAYBACK_QUEUE_SIZE = 2
+# Number of recent turns kept for latency statistics
+LATENCY_WINDOW = 100
+
+@dataclass
+class Utterance:
+    """One user phrase moving through the pipeline, with monotonic stage timestamps"""
+    audio: sr.AudioData
+    heard_at: float
+    text: str = ""
+    recognized_at: float = 0.0
+    response_text: str = ""
+    synthesized_at: float = 0.0
+    playback_started_at: float = 0.0
+
+    def latency_ms(self) -> Dict[str, float]:
+        return {
+            'recognition': round((self.recognized_at - self.heard_at) * 1000, 1),
+            'response': round((self.synthesized_at - self.recognized_at) * 1000, 1),
+            'playback_wait': round((self.playback_started_at - self.synthesized_at) * 1000, 1),
+            'turn': round((self.playback_started_at - self.heard_at) * 1000, 1)
+        }
+
 class ConversationalSpeechSystem:
     def __init__(self):
         self.elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')
         self.natasha_voice_id = "EXAVITQu4vr4xnSDxMaL"  # Natasha voice
 
-        # Real-time audio queues
-        self.audio_input_queue = queue.Queue()
-        self.audio_output_queue = queue.Queue()
+        # Pipeline: microphone thread -> capture queue -> recognition -> utterance
+        # queue -> response + TTS -> playback queue -> playback. Everything but the
+        # microphone and the audio device runs on one event loop.
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.capture_queue: Optional[asyncio.Queue] = None
+        self.utterance_queue: Optional[asyncio.Queue] = None
+        self.playback_queue: Optional[asyncio.Queue] = None
+        self.pipeline_tasks = []
+        self.broadcast_tasks = set()
+        self.capture_thread: Optional[threading.Thread] = None
+        self.playback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="natasha-playback")
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.mixer_ready = False
+        self.dropped_utterances = 0
+        self.turn_latencies = deque(maxlen=LATENCY_WINDOW)
 
         # Speech recognition
         self.recognizer = sr.Recognizer()
@@ -48,68 +89,116 @@ class ConversationalSpeechSystem:
 
     async def start_conversation_mode(self):
         """Start full-duplex conversation mode"""
+        if self.conversation_active:
+            return
         print("🚀 Starting conversational speech mode...")
 
-        # Start background threads
-        threading.Thread(target=self.continuous_speech_recognition, daemon=True).start()
-        threading.Thread(target=self.continuous_audio_playback, daemon=True).start()
-
+        self.loop = asyncio.get_running_loop()
+        self.capture_queue = asyncio.Queue(maxsize=CAPTURE_QUEUE_SIZE)
+        self.utterance_queue = asyncio.Queue(maxsize=UTTERANCE_QUEUE_SIZE)
+        self.playback_queue = asyncio.Queue(maxsize=PLAYBACK_QUEUE_SIZE)
         self.conversation_active = True
+
+        self.pipeline_tasks = [
+            asyncio.create_task(self.recognition_worker()),
+            asyncio.create_task(self.response_worker()),
+            asyncio.create_task(self.playback_worker())
+        ]
+        # Microphone reads block, so capture keeps its own thread and hands
+        # phrases to the loop
+        self.capture_thread = threading.Thread(target=self.continuous_speech_capture, daemon=True)
+        self.capture_thread.start()
+
         print("✅ Conversation mode active - speak naturally with Natasha!")
 
-    def continuous_speech_recognition(self):
-        """Continuous speech recognition in background"""
+    async def stop_conversation_mode(self):
+        """Stop capture and the pipeline stages"""
+        self.conversation_active = False
+        tasks = self.pipeline_tasks + list(self.broadcast_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.pipeline_tasks = []
+        if self.capture_thread is not None:
+            # The microphone thread notices within one listen timeout
+            await asyncio.to_thread(self.capture_thread.join)
+            self.capture_thread = None
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+
+    def continuous_speech_capture(self):
+        """Capture phrases from the microphone (runs in its own thread)"""
         with self.microphone as source:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
             print("🎤 Microphone calibrated for ambient noise")
 
-        while self.conversation_active:
+            while self.conversation_active:
+                if self.is_speaking:  # Don't capture Natasha's own voice
+                    time.sleep(0.05)
+                    continue
+                try:
+                    # Short timeout for responsiveness
+                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
+                except sr.WaitTimeoutError:
+                    continue  # Timeout is normal, continue listening
+                except Exception as e:
+                    print(f"🔴 Microphone error: {e}")
+                    time.sleep(1)
+                    continue
+
+                utterance = Utterance(audio=audio, heard_at=time.monotonic())
+                self.loop.call_soon_threadsafe(self._enqueue_latest, self.capture_queue, utterance)
+
+    def _enqueue_latest(self, target: asyncio.Queue, utterance: Utterance):
+        """Queue without blocking the producer, dropping the oldest waiting phrase when full"""
+        if target.full():
+            target.get_nowait()
+            self.dropped_utterances += 1
+            print("🟡 Falling behind - dropped oldest waiting phrase")
+        target.put_nowait(utterance)
+
+    async def recognition_worker(self):
+        """Turn captured audio into text while earlier responses are synthesized and played"""
+        while True:
+            utterance = await self.capture_queue.get()
             try:
-                if not self.is_speaking:  # Only listen when not speaking
-                    with self.microphone as source:
-                        # Short timeout for responsiveness
-                        audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-
-                    try:
-                        # Use Google's speech recognition for speed
-                        text = self.recognizer.recognize_google(audio)
-                        if text.strip():
-                            print(f"👤 You: {text}")
-                            # Process the speech input
-                            asyncio.create_task(self.process_voice_input(text))
-
-                    except sr.UnknownValueError:
-                        pass  # No speech detected, continue listening
-                    except sr.RequestError as e:
-                        print(f"🔴 Speech recognition error: {e}")
-                        time.sleep(1)
-
-            except sr.WaitTimeoutError:
-                pass  # Timeout is normal, continue listening
+                # Use Google's speech recognition for speed
+                utterance.text = await asyncio.to_thread(self.recognizer.recognize_google, utterance.audio)
+            except sr.UnknownValueError:
+                continue  # No speech detected, continue listening
+            except sr.RequestError as e:
+                print(f"🔴 Speech recognition error: {e}")
+                continue
             except Exception as e:
-                print(f"🔴 Microphone error: {e}")
-                time.sleep(1)
-
-    async def process_voice_input(self, text: str):
+                # Keep the stage alive; a dead worker would stall the whole pipeline
+                print(f"🔴 Unexpected recognition error: {e}")
+                continue
+
+            if utterance.text.strip():
+                utterance.recognized_at = time.monotonic()
+                print(f"👤 You: {utterance.text}")
+                self._enqueue_latest(self.utterance_queue, utterance)
+
+    async def response_worker(self):
+        """Generate and synthesize replies in order; waits when playback is backed up"""
+        while True:
+            utterance = await self.utterance_queue.get()
+            await self.process_voice_input(utterance)
+
+    async def process_voice_input(self, utterance: Utterance):
         """Process voice input and generate response"""
         try:
             # Generate Natasha's response
-            response_text = await self.generate_natasha_response(text)
+            utterance.response_text = await self.generate_natasha_response(utterance.text)
 
             # Convert to speech
-            audio_data = await self.text_to_speech(response_text)
+            audio_data = await self.text_to_speech(utterance.response_text)
+            utterance.synthesized_at = time.monotonic()
 
             if audio_data:
                 # Queue for playback
-                self.audio_output_queue.put(audio_data)
-
-                # Send to WebSocket clients
-                await self.broadcast_to_clients({
-                    'type': 'voice_exchange',
-                    'user_input': text,
-                    'natasha_response': response_text,
-                    'timestamp': datetime.now().isoformat()
-                })
+                await self.playback_queue.put((utterance, audio_data))
 
         except Exception as e:
             print(f"🔴 Error processing voice input: {e}")
@@ -172,50 +261,79 @@ class ConversationalSpeechSystem:
                 }
             }
 
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            if self.http_session is None:
+                # Kept open across turns so each reply reuses the connection
+                self.http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
 
-            if response.status_code == 200:
-                return response.content
-            else:
-                print(f"🔴 ElevenLabs API error: {response.status_code}")
+            async with self.http_session.post(url, json=data, headers=headers) as response:
+                if response.status == 200:
+                    return await response.read()
+                print(f"🔴 ElevenLabs API error: {response.status}")
                 return None
 
         except Exception as e:
             print(f"🔴 Text-to-speech error: {e}")
             return None
 
-    def continuous_audio_playback(self):
-        """Continuous audio playback from queue"""
-        import pygame
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-
-        while self.conversation_active:
+    async def playback_worker(self):
+        """Play replies in order and report each completed turn"""
+        while True:
+            utterance, audio_data = await self.playback_queue.get()
             try:
-                if not self.audio_output_queue.empty():
-                    audio_data = self.audio_output_queue.get()
+                utterance.playback_started_at = time.monotonic()
+                latency = utterance.latency_ms()
+                self.turn_latencies.append(latency)
 
-                    # Set speaking flag to pause listening
-                    self.is_speaking = True
+                # Start playback first; a slow WebSocket client must not delay the audio
+                playback = self.loop.run_in_executor(self.playback_executor, self.play_audio, audio_data)
 
-                    # Play audio
-                    audio_io = io.BytesIO(audio_data)
-                    pygame.mixer.music.load(audio_io)
-                    pygame.mixer.music.play()
+                broadcast = asyncio.create_task(self.broadcast_to_clients({
+                    'type': 'voice_exchange',
+                    'user_input': utterance.text,
+                    'natasha_response': utterance.response_text,
+                    'latency_ms': latency,
+                    'timestamp': datetime.now().isoformat()
+                }))
+                self.broadcast_tasks.add(broadcast)
+                broadcast.add_done_callback(self.broadcast_tasks.discard)
 
-                    # Wait for audio to finish
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
+                await playback
+            except Exception as e:
+                print(f"🔴 Audio playback error: {e}")
 
-                    # Resume listening
-                    self.is_speaking = False
+    def play_audio(self, audio_data: bytes):
+        """Play one clip to completion (runs on the playback thread)"""
+        import pygame
+        if not self.mixer_ready:
+            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            self.mixer_ready = True
 
-                else:
-                    time.sleep(0.1)
+        # Set speaking flag to pause listening
+        self.is_speaking = True
+        try:
+            audio_io = io.BytesIO(audio_data)
+            pygame.mixer.music.load(audio_io)
+            pygame.mixer.music.play()
 
-            except Exception as e:
-                print(f"🔴 Audio playback error: {e}")
-                self.is_speaking = False
-                time.sleep(1)
+            # Wait for audio to finish
+            while pygame.mixer.music.get_busy():
+                time.sleep(0.02)
+        finally:
+            # Resume listening
+            self.is_speaking = False
+
+    def get_latency_stats(self) -> Dict:
+        """Average and percentile stage latencies over recent turns"""
+        stats = {'turns': len(self.turn_latencies), 'dropped_utterances': self.dropped_utterances}
+        for stage in ('recognition', 'response', 'playback_wait', 'turn'):
+            values = sorted(latency[stage] for latency in self.turn_latencies)
+            if values:
+                stats[stage] = {
+                    'avg_ms': round(sum(values) / len(values), 1),
+                    'p50_ms': values[len(values) // 2],
+                    'p95_ms': values[min(len(values) - 1, int(len(values) * 0.95))]
+                }
+        return stats
 
     async def handle_websocket_client(self, websocket, path):
         """Handle WebSocket client connections"""
@@ -243,11 +361,17 @@ class ConversationalSpeechSystem:
                         }))
 
                     elif data.get('command') == 'stop_conversation':
-                        self.conversation_active = False
+                        await self.stop_conversation_mode()
                         await websocket.send(json.dumps({
                             'type': 'conversation_stopped'
                         }))
 
+                    elif data.get('command') == 'latency_stats':
+                        await websocket.send(json.dumps({
+                            'type': 'latency_stats',
+                            'stats': self.get_latency_stats()
+                        }))
+
                 except json.JSONDecodeError:
                     pass
 
@@ -261,10 +385,11 @@ class ConversationalSpeechSystem:
         """Broadcast message to all connected clients"""
         if self.connected_clients:
             disconnected = set()
-            for client in self.connected_clients:
+            for client in list(self.connected_clients):
                 try:
                     await client.send(json.dumps(message))
-                except websockets.exceptions.ConnectionClosed:
+                except Exception:
+                    # Closed or broken; drop it rather than failing the broadcast
                     disconnected.add(client)
 
             # Remove disconnected clients
@@ -277,9 +402,13 @@ class ConversationalSpeechSystem:
         print(f"🎙️ Agent: Natasha Volkov (Russian accent)")
         print(f"🔄 Mode: Real-time speech-to-speech")
 
-        async with websockets.serve(self.handle_websocket_client, host, port):
-            print(f"✅ Server ready! Connect and start speaking!")
-            await asyncio.Future()  # Run forever
+        try:
+            async with websockets.serve(self.handle_websocket_client, host, port):
+                print(f"✅ Server ready! Connect and start speaking!")
+                await asyncio.Future()  # Run forever
+        finally:
+            await self.stop_conversation_mode()
+            self.playback_executor.shutdown(wait=False)
 
 async def main():
     """Main function"""
@@ -21,6 +21,13 @@ import websockets
 import requests
 from bs4 import BeautifulSoup
 import xml.etree.ElementTree as ET
+import os
+import sys
+
+# Shared command-center modules live in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from websocket_broadcaster import Broadcaster
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -505,7 +512,8 @@ class PlasmaDisplay:
     def __init__(self, usim: CybersecurityUSIM):
         self.usim = usim
         self.active_threats = []
-        self.websocket_clients = set()
+        # Threat updates are full snapshots, so a lagging client only needs the latest one
+        self.broadcaster = Broadcaster("plasma_display")
         self.update_interval = 30  # seconds
 
     async def start_plasma_server(self, host: str = "localhost", port: int = 8765):
@@ -513,7 +521,7 @@ class PlasmaDisplay:
         logger.info(f"Starting plasma display server on {host}:{port}")
 
         async def handle_client(websocket, path):
-            self.websocket_clients.add(websocket)
+            self.broadcaster.add(websocket)
             logger.info(f"New plasma client connected: {websocket.remote_address}")
 
             try:
@@ -525,7 +533,7 @@ class PlasmaDisplay:
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
             finally:
-                self.websocket_clients.discard(websocket)
+                await self.broadcaster.remove(websocket)
 
         await websockets.serve(handle_client, host, port)
 
@@ -581,14 +589,9 @@ class PlasmaDisplay:
         # Send to specific client or broadcast
         message = json.dumps(threat_data)
         if websocket:
-            await websocket.send(message)
+            self.broadcaster.send_to(websocket, message, conflate_key="threat_update")
         else:
-            # Broadcast to all clients
-            for client in self.websocket_clients.copy():
-                try:
-                    await client.send(message)
-                except:
-                    self.websocket_clients.discard(client)
+            self.broadcaster.publish(message, conflate_key="threat_update")
 
     def generate_threat_map(self) -> Dict[str, Any]:
         """Generate threat landscape map for visualization"""
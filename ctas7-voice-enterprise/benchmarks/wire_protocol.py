@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+CTAS-7 Voice Wire Protocol Benchmark
+Compares bytes on the wire and server encode CPU per synthesized second
+for the legacy JSON/base64 mode and the binary audio frame mode.
+
+Usage:
+    python benchmarks/wire_protocol.py [--iterations 200]
+"""
+
+import os
+import time
+import uuid
+import argparse
+
+from ctas7_voice_enterprise.protocol import PROTOCOL_JSON, PROTOCOL_BINARY, encode_message
+
+# mp3_44100_128 output is 128 kbit/s
+BYTES_PER_SECOND = 128_000 // 8
+CLIP_SECONDS = [1, 5, 15, 60]
+
+def _message_dict(clip_seconds: int) -> dict:
+    return {
+        "message_id": str(uuid.uuid4()),
+        "type": "synthesis_response",
+        "session_id": None,
+        "agent_id": "natasha",
+        "content": {
+            "success": True,
+            "text": "Tactical analysis complete. " * clip_seconds,
+            "duration": 0.42,
+            "agent_name": "Natasha Volkov"
+        },
+        "timestamp": time.time(),
+        "metadata": {"agent_id": "natasha", "streaming": False}
+    }
+
+def _measure(protocol: str, clip_seconds: int, iterations: int) -> dict:
+    audio = os.urandom(BYTES_PER_SECOND * clip_seconds)
+    message_dict = _message_dict(clip_seconds)
+
+    frames = encode_message(message_dict, audio, protocol)
+    wire_bytes = sum(len(f.encode('utf-8')) if isinstance(f, str) else len(f) for f in frames)
+
+    start = time.process_time()
+    for _ in range(iterations):
+        encode_message(message_dict, audio, protocol)
+    cpu = (time.process_time() - start) / iterations
+
+    return {
+        "frames": len(frames),
+        "wire_bytes_per_second": wire_bytes / clip_seconds,
+        "cpu_us_per_second": cpu * 1e6 / clip_seconds
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark voice WebSocket wire protocols")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'clip':>6} {'protocol':>8} {'frames':>7} {'wire B/s':>12} {'overhead':>9} {'CPU us/s':>10}")
+    for clip_seconds in CLIP_SECONDS:
+        for protocol in (PROTOCOL_JSON, PROTOCOL_BINARY):
+            result = _measure(protocol, clip_seconds, args.iterations)
+            overhead = result["wire_bytes_per_second"] / BYTES_PER_SECOND - 1
+            print(f"{clip_seconds:>5}s {protocol:>8} {result['frames']:>7} "
+                  f"{result['wire_bytes_per_second']:>12.0f} {overhead:>8.1%} "
+                  f"{result['cpu_us_per_second']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
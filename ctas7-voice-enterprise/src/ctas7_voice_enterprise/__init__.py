@@ -7,16 +7,82 @@ __version__ = "1.0.0"
 __author__ = "Charlie Payne"
 __email__ = "usneodcp@gmail.com"
 
-from .config import VoiceConfig, VoiceAgentConfig, ElevenLabsConfig, LoggingConfig, ServerConfig
-from .core import VoiceOrchestrator, VoiceAgent, VoiceResponse
-from .agents import NatashaVolkovAgent, MarcusChenAgent, VoiceAgentFactory, ConversationContext
-from .server import VoiceServer
-from .errors import (
-    CTAS7VoiceException, ElevenLabsAPIError, VoiceAgentError, WebSocketError,
-    ConfigurationError, ErrorHandler, ErrorSeverity, ErrorCategory,
-    initialize_error_handler, handle_error
-)
-from .cli import main
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> defining submodule. Submodules are imported on first attribute
+# access, so the CLI entry point does not pay for FastAPI, ElevenLabs and
+# websockets on commands that never touch them.
+_EXPORTS = {
+    "VoiceConfig": ".config",
+    "VoiceAgentConfig": ".config",
+    "ElevenLabsConfig": ".config",
+    "LoggingConfig": ".config",
+    "ServerConfig": ".config",
+    "SchedulerConfig": ".config",
+    "AudioCacheConfig": ".config",
+    "PrewarmConfig": ".config",
+    "SpeechToTextConfig": ".config",
+    "load_config": ".config",
+    "VoiceOrchestrator": ".core",
+    "VoiceAgent": ".core",
+    "VoiceResponse": ".core",
+    "VoiceSettings": ".core",
+    "AudioCache": ".audio_cache",
+    "NatashaVolkovAgent": ".agents",
+    "MarcusChenAgent": ".agents",
+    "VoiceAgentFactory": ".agents",
+    "ConversationContext": ".agents",
+    "ConversationTurn": ".agents",
+    "VoiceScheduler": ".scheduler",
+    "SynthesisPriority": ".scheduler",
+    "VoiceServer": ".server",
+    "SharedStore": ".shared_store",
+    "SQLiteSharedStore": ".shared_store",
+    "SpeechToTextService": ".stt",
+    "CTAS7VoiceException": ".errors",
+    "ElevenLabsAPIError": ".errors",
+    "VoiceAgentError": ".errors",
+    "WebSocketError": ".errors",
+    "ConfigurationError": ".errors",
+    "SpeechRecognitionError": ".errors",
+    "ErrorHandler": ".errors",
+    "ErrorSeverity": ".errors",
+    "ErrorCategory": ".errors",
+    "initialize_error_handler": ".errors",
+    "handle_error": ".errors",
+    "main": ".cli",
+}
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+if TYPE_CHECKING:
+    from .config import (
+        VoiceConfig, VoiceAgentConfig, ElevenLabsConfig, LoggingConfig, ServerConfig, SchedulerConfig,
+        AudioCacheConfig, PrewarmConfig, SpeechToTextConfig, load_config
+    )
+    from .core import VoiceOrchestrator, VoiceAgent, VoiceResponse, VoiceSettings
+    from .audio_cache import AudioCache
+    from .agents import NatashaVolkovAgent, MarcusChenAgent, VoiceAgentFactory, ConversationContext, ConversationTurn
+    from .scheduler import VoiceScheduler, SynthesisPriority
+    from .server import VoiceServer
+    from .shared_store import SharedStore, SQLiteSharedStore
+    from .stt import SpeechToTextService
+    from .errors import (
+        CTAS7VoiceException, ElevenLabsAPIError, VoiceAgentError, WebSocketError,
+        ConfigurationError, SpeechRecognitionError, ErrorHandler, ErrorSeverity, ErrorCategory,
+        initialize_error_handler, handle_error
+    )
+    from .cli import main
 
 __all__ = [
     # Core classes
@@ -25,16 +91,29 @@ __all__ = [
     "ElevenLabsConfig",
     "LoggingConfig",
     "ServerConfig",
+    "SchedulerConfig",
+    "AudioCacheConfig",
+    "PrewarmConfig",
+    "SpeechToTextConfig",
+    "load_config",
     "VoiceOrchestrator",
     "VoiceAgent",
     "VoiceResponse",
+    "VoiceSettings",
+    "AudioCache",
     "VoiceServer",
+    "SharedStore",
+    "SQLiteSharedStore",
+    "SpeechToTextService",
+    "VoiceScheduler",
+    "SynthesisPriority",
 
     # Specialized agents
     "NatashaVolkovAgent",
     "MarcusChenAgent",
     "VoiceAgentFactory",
     "ConversationContext",
+    "ConversationTurn",
 
     # Error handling
     "CTAS7VoiceException",
@@ -42,6 +121,7 @@ __all__ = [
     "VoiceAgentError",
     "WebSocketError",
     "ConfigurationError",
+    "SpeechRecognitionError",
     "ErrorHandler",
     "ErrorSeverity",
     "ErrorCategory",
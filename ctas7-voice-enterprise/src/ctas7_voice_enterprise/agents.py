@@ -6,30 +6,130 @@ Specialized voice agents for Natasha Volkov and Marcus Chen with personality-awa
 import asyncio
 import time
 import json
-from typing import Dict, Any, Optional, List, Callable
-from dataclasses import dataclass
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Deque
+from dataclasses import dataclass, field
 import structlog
 from elevenlabs.client import ElevenLabs
 
 from .config import VoiceConfig, VoiceAgentConfig
-from .core import VoiceAgent, VoiceResponse
+from .core import VoiceAgent, VoiceResponse, VoiceSettings
 from .errors import VoiceAgentError, handle_error, ErrorSeverity, ErrorCategory
+from .persona_text import natasha_transform, marcus_transform
+
+# Personality-tuned voice settings (immutable, shared safely across requests)
+NATASHA_VOICE_SETTINGS = VoiceSettings(
+    stability=0.6,  # More stable for authority
+    similarity_boost=0.8,  # High similarity for consistency
+    style=0.7,  # Stronger style for accent
+    use_speaker_boost=True
+)
+
+MARCUS_VOICE_SETTINGS = VoiceSettings(
+    stability=0.7,  # Very stable for technical clarity
+    similarity_boost=0.75,  # Good similarity for consistency
+    style=0.4,  # Lower style for neutral tone
+    use_speaker_boost=True
+)
+
+# Conversation turns kept in memory per session; older turns are folded into a summary
+DEFAULT_HISTORY_WINDOW = 50
+
+@dataclass(slots=True)
+class ConversationTurn:
+    """One entry in a conversation's history"""
+    timestamp: float
+    type: str
+    original_text: str
+    enhanced_text: str
+    context: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "type": self.type,
+            "original_text": self.original_text,
+            "enhanced_text": self.enhanced_text,
+            "context": self.context
+        }
+
+def summarize_evicted_turn(summary: Optional[Dict[str, Any]], turn: ConversationTurn) -> Dict[str, Any]:
+    """Fold a turn leaving the history window into the session's running summary"""
+    if summary is None:
+        summary = {"turns": 0, "first_timestamp": turn.timestamp, "types": {}}
+    summary["turns"] += 1
+    summary["last_timestamp"] = turn.timestamp
+    summary["types"][turn.type] = summary["types"].get(turn.type, 0) + 1
+    summary["last_text"] = turn.original_text[:200]
+    return summary
 
 @dataclass
 class ConversationContext:
-    """Context for conversational interactions"""
+    """Context for conversational interactions.
+
+    History is a ring buffer of the last ``history_window`` turns. Turns pushed
+    out of the window are folded into ``evicted_summary`` when
+    ``summarize_evicted`` is set; ``total_turns`` counts every turn.
+    """
     session_id: str
     agent_name: str
-    conversation_history: List[Dict[str, Any]]
     user_preferences: Dict[str, Any]
     start_time: float
     last_interaction: float
+    history_window: int = DEFAULT_HISTORY_WINDOW
+    summarize_evicted: bool = True
+    total_turns: int = 0
+    evicted_summary: Optional[Dict[str, Any]] = None
+    conversation_history: Deque[ConversationTurn] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.conversation_history = deque(maxlen=self.history_window)
+
+    def add_turn(self, turn: ConversationTurn):
+        """Append a turn, summarizing the oldest one if the window is full"""
+        if self.summarize_evicted and len(self.conversation_history) == self.history_window:
+            self.evicted_summary = summarize_evicted_turn(self.evicted_summary, self.conversation_history[0])
+        self.conversation_history.append(turn)
+        self.total_turns += 1
+        self.last_interaction = turn.timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "agent_name": self.agent_name,
+            "user_preferences": self.user_preferences,
+            "start_time": self.start_time,
+            "last_interaction": self.last_interaction,
+            "history_window": self.history_window,
+            "summarize_evicted": self.summarize_evicted,
+            "total_turns": self.total_turns,
+            "evicted_summary": self.evicted_summary,
+            "conversation_history": [turn.to_dict() for turn in self.conversation_history]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationContext":
+        """Rebuild a context from :meth:`to_dict` output"""
+        context = cls(
+            session_id=data["session_id"],
+            agent_name=data["agent_name"],
+            user_preferences=data.get("user_preferences") or {},
+            start_time=data["start_time"],
+            last_interaction=data["last_interaction"],
+            history_window=data.get("history_window", DEFAULT_HISTORY_WINDOW),
+            summarize_evicted=data.get("summarize_evicted", True),
+            total_turns=data.get("total_turns", 0),
+            evicted_summary=data.get("evicted_summary")
+        )
+        context.conversation_history.extend(ConversationTurn(**turn) for turn in data.get("conversation_history", []))
+        return context
 
 class NatashaVolkovAgent(VoiceAgent):
     """Natasha Volkov - Strategic AI persona with Russian accent and authoritative tone"""
 
-    def __init__(self, config: VoiceAgentConfig, elevenlabs_client: ElevenLabs, error_handler, debug: bool = False):
-        super().__init__(config, elevenlabs_client, error_handler, debug)
+    def __init__(self, config: VoiceAgentConfig, elevenlabs_client: ElevenLabs, error_handler, debug: bool = False,
+                 agent_id: Optional[str] = None):
+        super().__init__(config, elevenlabs_client, error_handler, debug, agent_id=agent_id)
         self.logger = structlog.get_logger("natasha_agent")
 
         # Natasha's personality settings
@@ -41,6 +141,9 @@ class NatashaVolkovAgent(VoiceAgent):
             "communication_style": "direct_professional"
         }
 
+        # Text rewrite rules, built once per agent
+        self.text_transform = natasha_transform()
+
         # Conversation context
         self.active_sessions: Dict[str, ConversationContext] = {}
 
@@ -63,15 +166,13 @@ class NatashaVolkovAgent(VoiceAgent):
 
             # Get session context if available
             if session_id and session_id in self.active_sessions:
-                session_context = self.active_sessions[session_id]
-                session_context.last_interaction = time.time()
-                session_context.conversation_history.append({
-                    "timestamp": time.time(),
-                    "type": "synthesis_request",
-                    "original_text": text,
-                    "enhanced_text": enhanced_text,
-                    "context": context
-                })
+                self.active_sessions[session_id].add_turn(ConversationTurn(
+                    timestamp=time.time(),
+                    type="synthesis_request",
+                    original_text=text,
+                    enhanced_text=enhanced_text,
+                    context=context
+                ))
 
             # Use personality-tuned voice settings
             personality_settings = self._get_personality_voice_settings()
@@ -81,10 +182,11 @@ class NatashaVolkovAgent(VoiceAgent):
                             original_length=len(text),
                             enhanced_length=len(enhanced_text))
 
+            # Settings travel with the request, so concurrent persona requests never share state
             if streaming:
-                audio_data = await self._synthesize_streaming_with_personality(enhanced_text, personality_settings)
+                audio_data = await self.synthesize_streaming(enhanced_text, personality_settings)
             else:
-                audio_data = await self._synthesize_standard_with_personality(enhanced_text, personality_settings)
+                audio_data = await self.synthesize_standard(enhanced_text, personality_settings)
 
             # Create enhanced response
             response = VoiceResponse(
@@ -99,7 +201,7 @@ class NatashaVolkovAgent(VoiceAgent):
                     "session_id": session_id,
                     "context": context,
                     "personality_traits": self.personality_traits,
-                    "voice_settings": personality_settings
+                    "voice_settings": personality_settings.to_dict()
                 }
             )
 
@@ -121,91 +223,29 @@ class NatashaVolkovAgent(VoiceAgent):
 
     def _enhance_text_for_natasha(self, text: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Apply Natasha's personality enhancements to text"""
+        # Strategic term emphasis and measured pauses for authority
+        return self.text_transform.apply(text)
 
-        # Strategic communication patterns
-        enhanced = text
-
-        # Add strategic emphasis for key terms
-        strategic_terms = {
-            "mission": "mission objective",
-            "target": "designated target",
-            "enemy": "hostile forces",
-            "plan": "tactical plan",
-            "status": "operational status"
-        }
-
-        for term, replacement in strategic_terms.items():
-            if term in enhanced.lower():
-                enhanced = enhanced.replace(term, replacement)
-
-        # Add measured pauses for authority
-        if len(enhanced) > 50:
-            sentences = enhanced.split('. ')
-            if len(sentences) > 1:
-                enhanced = '. ... '.join(sentences)
-
-        return enhanced
-
-    def _get_personality_voice_settings(self) -> Dict[str, Any]:
+    def _get_personality_voice_settings(self) -> VoiceSettings:
         """Get voice settings tuned for Natasha's personality"""
-        return {
-            "stability": 0.6,  # More stable for authority
-            "similarity_boost": 0.8,  # High similarity for consistency
-            "style": 0.7,  # Stronger style for accent
-            "use_speaker_boost": True
-        }
-
-    async def _synthesize_streaming_with_personality(self, text: str, settings: Dict[str, Any]) -> bytes:
-        """Streaming synthesis with personality settings"""
-        # Override default settings with personality settings
-        original_config = {
-            "stability": self.config.stability,
-            "similarity_boost": self.config.similarity_boost,
-            "style": self.config.style,
-            "use_speaker_boost": self.config.use_speaker_boost
-        }
-
-        # Temporarily apply personality settings
-        for key, value in settings.items():
-            setattr(self.config, key, value)
-
-        try:
-            return await self.synthesize_streaming(text)
-        finally:
-            # Restore original settings
-            for key, value in original_config.items():
-                setattr(self.config, key, value)
-
-    async def _synthesize_standard_with_personality(self, text: str, settings: Dict[str, Any]) -> bytes:
-        """Standard synthesis with personality settings"""
-        # Override default settings with personality settings
-        original_config = {
-            "stability": self.config.stability,
-            "similarity_boost": self.config.similarity_boost,
-            "style": self.config.style,
-            "use_speaker_boost": self.config.use_speaker_boost
-        }
+        return NATASHA_VOICE_SETTINGS
 
-        # Temporarily apply personality settings
-        for key, value in settings.items():
-            setattr(self.config, key, value)
-
-        try:
-            return await self.synthesize_standard(text)
-        finally:
-            # Restore original settings
-            for key, value in original_config.items():
-                setattr(self.config, key, value)
-
-    def start_conversation_session(self, session_id: str, user_preferences: Optional[Dict[str, Any]] = None) -> ConversationContext:
+    def start_conversation_session(
+        self,
+        session_id: str,
+        user_preferences: Optional[Dict[str, Any]] = None,
+        history_window: int = DEFAULT_HISTORY_WINDOW,
+        summarize_evicted: bool = True
+    ) -> ConversationContext:
         """Start a new conversation session with Natasha"""
         context = ConversationContext(
             session_id=session_id,
             agent_name=self.config.name,
-            conversation_history=[],
             user_preferences=user_preferences or {},
             start_time=time.time(),
-            last_interaction=time.time()
+            last_interaction=time.time(),
+            history_window=history_window,
+            summarize_evicted=summarize_evicted
         )
 
         self.active_sessions[session_id] = context
@@ -228,7 +268,7 @@ class NatashaVolkovAgent(VoiceAgent):
             "session_id": session_id,
             "agent_name": self.config.name,
             "duration_seconds": duration,
-            "total_interactions": len(session.conversation_history),
+            "total_interactions": session.total_turns,
             "start_time": session.start_time,
             "end_time": time.time()
         }
@@ -236,7 +276,7 @@ class NatashaVolkovAgent(VoiceAgent):
         self.logger.info("Ended conversation session with Natasha",
                         session_id=session_id,
                         duration=duration,
-                        interactions=len(session.conversation_history))
+                        interactions=session.total_turns)
 
         return summary
 
@@ -244,8 +284,9 @@ class NatashaVolkovAgent(VoiceAgent):
 class MarcusChenAgent(VoiceAgent):
     """Marcus Chen - Technical AI persona with analytical approach and calm demeanor"""
 
-    def __init__(self, config: VoiceAgentConfig, elevenlabs_client: ElevenLabs, error_handler, debug: bool = False):
-        super().__init__(config, elevenlabs_client, error_handler, debug)
+    def __init__(self, config: VoiceAgentConfig, elevenlabs_client: ElevenLabs, error_handler, debug: bool = False,
+                 agent_id: Optional[str] = None):
+        super().__init__(config, elevenlabs_client, error_handler, debug, agent_id=agent_id)
         self.logger = structlog.get_logger("marcus_agent")
 
         # Marcus's personality settings
@@ -257,6 +298,9 @@ class MarcusChenAgent(VoiceAgent):
             "communication_style": "methodical_detailed"
         }
 
+        # Text rewrite rules, built once per agent
+        self.text_transform = marcus_transform()
+
         # Conversation context
         self.active_sessions: Dict[str, ConversationContext] = {}
 
@@ -279,15 +323,13 @@ class MarcusChenAgent(VoiceAgent):
 
             # Get session context if available
             if session_id and session_id in self.active_sessions:
-                session_context = self.active_sessions[session_id]
-                session_context.last_interaction = time.time()
-                session_context.conversation_history.append({
-                    "timestamp": time.time(),
-                    "type": "synthesis_request",
-                    "original_text": text,
-                    "enhanced_text": enhanced_text,
-                    "context": context
-                })
+                self.active_sessions[session_id].add_turn(ConversationTurn(
+                    timestamp=time.time(),
+                    type="synthesis_request",
+                    original_text=text,
+                    enhanced_text=enhanced_text,
+                    context=context
+                ))
 
             # Use personality-tuned voice settings
             personality_settings = self._get_personality_voice_settings()
@@ -297,10 +339,11 @@ class MarcusChenAgent(VoiceAgent):
                             original_length=len(text),
                             enhanced_length=len(enhanced_text))
 
+            # Settings travel with the request, so concurrent persona requests never share state
             if streaming:
-                audio_data = await self._synthesize_streaming_with_personality(enhanced_text, personality_settings)
+                audio_data = await self.synthesize_streaming(enhanced_text, personality_settings)
             else:
-                audio_data = await self._synthesize_standard_with_personality(enhanced_text, personality_settings)
+                audio_data = await self.synthesize_standard(enhanced_text, personality_settings)
 
             # Create enhanced response
             response = VoiceResponse(
@@ -315,7 +358,7 @@ class MarcusChenAgent(VoiceAgent):
                     "session_id": session_id,
                     "context": context,
                     "personality_traits": self.personality_traits,
-                    "voice_settings": personality_settings
+                    "voice_settings": personality_settings.to_dict()
                 }
             )
 
@@ -337,90 +380,29 @@ class MarcusChenAgent(VoiceAgent):
 
     def _enhance_text_for_marcus(self, text: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Apply Marcus's personality enhancements to text"""
+        # Technical term precision and pauses between clauses for clarity
+        return self.text_transform.apply(text)
 
-        # Technical communication patterns
-        enhanced = text
-
-        # Add technical precision to key terms
-        technical_terms = {
-            "error": "system error",
-            "problem": "technical issue",
-            "fix": "resolution",
-            "data": "dataset",
-            "analysis": "comprehensive analysis"
-        }
-
-        for term, replacement in technical_terms.items():
-            if term in enhanced.lower():
-                enhanced = enhanced.replace(term, replacement)
-
-        # Add methodical structure
-        if "," in enhanced and len(enhanced) > 40:
-            # Add slight pauses for clarity
-            enhanced = enhanced.replace(", ", ", ... ")
-
-        return enhanced
-
-    def _get_personality_voice_settings(self) -> Dict[str, Any]:
+    def _get_personality_voice_settings(self) -> VoiceSettings:
         """Get voice settings tuned for Marcus's personality"""
-        return {
-            "stability": 0.7,  # Very stable for technical clarity
-            "similarity_boost": 0.75,  # Good similarity for consistency
-            "style": 0.4,  # Lower style for neutral tone
-            "use_speaker_boost": True
-        }
-
-    async def _synthesize_streaming_with_personality(self, text: str, settings: Dict[str, Any]) -> bytes:
-        """Streaming synthesis with personality settings"""
-        # Override default settings with personality settings
-        original_config = {
-            "stability": self.config.stability,
-            "similarity_boost": self.config.similarity_boost,
-            "style": self.config.style,
-            "use_speaker_boost": self.config.use_speaker_boost
-        }
+        return MARCUS_VOICE_SETTINGS
 
-        # Temporarily apply personality settings
-        for key, value in settings.items():
-            setattr(self.config, key, value)
-
-        try:
-            return await self.synthesize_streaming(text)
-        finally:
-            # Restore original settings
-            for key, value in original_config.items():
-                setattr(self.config, key, value)
-
-    async def _synthesize_standard_with_personality(self, text: str, settings: Dict[str, Any]) -> bytes:
-        """Standard synthesis with personality settings"""
-        # Override default settings with personality settings
-        original_config = {
-            "stability": self.config.stability,
-            "similarity_boost": self.config.similarity_boost,
-            "style": self.config.style,
-            "use_speaker_boost": self.config.use_speaker_boost
-        }
-
-        # Temporarily apply personality settings
-        for key, value in settings.items():
-            setattr(self.config, key, value)
-
-        try:
-            return await self.synthesize_standard(text)
-        finally:
-            # Restore original settings
-            for key, value in original_config.items():
-                setattr(self.config, key, value)
-
-    def start_conversation_session(self, session_id: str, user_preferences: Optional[Dict[str, Any]] = None) -> ConversationContext:
+    def start_conversation_session(
+        self,
+        session_id: str,
+        user_preferences: Optional[Dict[str, Any]] = None,
+        history_window: int = DEFAULT_HISTORY_WINDOW,
+        summarize_evicted: bool = True
+    ) -> ConversationContext:
         """Start a new conversation session with Marcus"""
         context = ConversationContext(
             session_id=session_id,
             agent_name=self.config.name,
-            conversation_history=[],
             user_preferences=user_preferences or {},
             start_time=time.time(),
-            last_interaction=time.time()
+            last_interaction=time.time(),
+            history_window=history_window,
+            summarize_evicted=summarize_evicted
         )
 
         self.active_sessions[session_id] = context
@@ -443,7 +425,7 @@ class MarcusChenAgent(VoiceAgent):
             "session_id": session_id,
             "agent_name": self.config.name,
             "duration_seconds": duration,
-            "total_interactions": len(session.conversation_history),
+            "total_interactions": session.total_turns,
             "start_time": session.start_time,
             "end_time": time.time()
         }
@@ -451,7 +433,7 @@ class MarcusChenAgent(VoiceAgent):
         self.logger.info("Ended conversation session with Marcus",
                         session_id=session_id,
                         duration=duration,
-                        interactions=len(session.conversation_history))
+                        interactions=session.total_turns)
 
         return summary
 
@@ -470,12 +452,12 @@ class VoiceAgentFactory:
         """Create specialized voice agent based on type"""
 
         if agent_type.lower() in ["natasha", "natasha_volkov"]:
-            return NatashaVolkovAgent(config, elevenlabs_client, error_handler, debug)
+            return NatashaVolkovAgent(config, elevenlabs_client, error_handler, debug, agent_id=agent_type)
         elif agent_type.lower() in ["marcus", "marcus_chen"]:
-            return MarcusChenAgent(config, elevenlabs_client, error_handler, debug)
+            return MarcusChenAgent(config, elevenlabs_client, error_handler, debug, agent_id=agent_type)
         else:
             # Default to base VoiceAgent
-            return VoiceAgent(config, elevenlabs_client, error_handler, debug)
+            return VoiceAgent(config, elevenlabs_client, error_handler, debug, agent_id=agent_type)
 
     @staticmethod
     def get_available_agent_types() -> List[str]:
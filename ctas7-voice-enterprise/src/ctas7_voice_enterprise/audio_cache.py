@@ -0,0 +1,116 @@
+"""
+CTAS-7 Enterprise Voice Audio Cache
+Byte-bounded LRU cache of synthesized audio
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Hashable
+from prometheus_client import Counter, Gauge
+
+from .shared_store import SharedStore
+
+# Shared store namespace for audio published by any worker
+AUDIO_NAMESPACE = "audio"
+
+audio_cache_requests_total = Counter('ctas7_voice_audio_cache_requests_total', 'Audio cache lookups', ['result'])
+audio_cache_bytes = Gauge('ctas7_voice_audio_cache_bytes', 'Audio bytes held in the cache')
+
+CacheKey = Tuple[Hashable, ...]
+
+class AudioCache:
+    """LRU cache of synthesized audio bounded by total bytes.
+
+    Keys identify everything that changes the audio (agent, voice, model,
+    settings, output format, text). Clips larger than ``max_entry_bytes`` are
+    not cached so one long utterance cannot flush the working set.
+
+    With a ``shared`` store, a local miss falls through to audio published by
+    other workers (kept for ``shared_ttl`` seconds), and new audio is published.
+    Shared reads and writes run in a worker thread, and the shared namespace is
+    trimmed to ``shared_max_bytes`` after each write.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 4 * 1024 * 1024,
+        shared: Optional[SharedStore] = None,
+        shared_ttl: float = 3600.0,
+        shared_max_bytes: int = 256 * 1024 * 1024
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.shared_max_bytes = shared_max_bytes
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _shared_key(key: CacheKey) -> str:
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    async def get(self, key: CacheKey) -> Optional[bytes]:
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            audio_cache_requests_total.labels(result="hit").inc()
+            return audio
+
+        if self.shared is not None:
+            audio = await asyncio.to_thread(self.shared.get, AUDIO_NAMESPACE, self._shared_key(key))
+            if audio is not None:
+                self._store(key, audio)
+                self.hits += 1
+                audio_cache_requests_total.labels(result="shared_hit").inc()
+                return audio
+
+        self.misses += 1
+        audio_cache_requests_total.labels(result="miss").inc()
+        return None
+
+    async def put(self, key: CacheKey, audio: bytes):
+        if not audio or len(audio) > self.max_entry_bytes:
+            return
+        self._store(key, audio)
+        if self.shared is not None:
+            await asyncio.to_thread(self._publish, self._shared_key(key), audio)
+
+    def _publish(self, shared_key: str, audio: bytes):
+        self.shared.set(AUDIO_NAMESPACE, shared_key, audio, self.shared_ttl)
+        self.shared.trim(AUDIO_NAMESPACE, self.shared_max_bytes)
+
+    def _store(self, key: CacheKey, audio: bytes):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self._entries[key] = audio
+        self.size_bytes += len(audio)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+        audio_cache_bytes.set(self.size_bytes)
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+        audio_cache_bytes.set(0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
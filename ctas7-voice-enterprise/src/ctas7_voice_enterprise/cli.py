@@ -3,34 +3,90 @@ CTAS-7 Enterprise Voice CLI
 Command-line interface for testing and debugging
 """
 
+import time
+
+_import_start = time.perf_counter()
+
 import asyncio
 import sys
-import time
 import json
-from typing import Optional
+from typing import Optional, List, Tuple
 import click
-import structlog
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.syntax import Syntax
 
-from .config import VoiceConfig
-from .core import VoiceOrchestrator
-from .errors import initialize_error_handler, CTAS7VoiceException
+from .config import load_config
+from .errors import initialize_error_handler
+
+# Rich widgets, the orchestrator (ElevenLabs, websockets) and the server stack are
+# imported inside the commands that use them so short commands start fast.
 
 console = Console()
 
+class StartupProfile:
+    """Wall-clock timings of CLI startup phases, printed by --startup-profile"""
+
+    # Heavy dependencies worth reporting when a command ends up importing them
+    WATCHED_MODULES = ("rich.table", "rich.progress", "pydantic", "elevenlabs", "websockets",
+                       "fastapi", "uvicorn", "prometheus_client", "structlog")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.phases: List[Tuple[str, float]] = []
+
+    def record(self, phase: str, since: float):
+        self.phases.append((phase, time.perf_counter() - since))
+
+    def report(self):
+        from rich.table import Table
+
+        table = Table(title="Startup Profile")
+        table.add_column("Phase", style="cyan")
+        table.add_column("ms", justify="right")
+        for phase, seconds in self.phases:
+            table.add_row(phase, f"{seconds * 1000:.1f}")
+        table.add_row("total since CLI import", f"{(time.perf_counter() - self.start) * 1000:.1f}", style="bold")
+        console.print(table)
+
+        loaded = [name for name in self.WATCHED_MODULES if name in sys.modules]
+        console.print(f"Modules loaded: {len(sys.modules)} ({', '.join(loaded) or 'no heavy dependencies'})")
+        console.print("For a per-module breakdown run with: python -X importtime -m ctas7_voice_enterprise.cli ...")
+
+_profile = StartupProfile(_import_start)
+_profile.record("cli imports", _import_start)
+
+def _load_config():
+    """Memoized configuration"""
+    start = time.perf_counter()
+    config = load_config()
+    _profile.record("config load", start)
+    return config
+
+def _init_logging(config, debug: bool):
+    """Configure logging and return the global error handler"""
+    start = time.perf_counter()
+    error_handler = initialize_error_handler(config.setup_logging(), debug)
+    _profile.record("logging setup", start)
+    return error_handler
+
+def _create_orchestrator(config):
+    start = time.perf_counter()
+    from .core import VoiceOrchestrator
+    orchestrator = VoiceOrchestrator(config)
+    _profile.record("orchestrator init", start)
+    return orchestrator
+
 @click.group()
 @click.option('--debug', is_flag=True, help='Enable debug mode with verbose logging')
 @click.option('--config-file', type=click.Path(exists=True), help='Path to configuration file')
+@click.option('--startup-profile', is_flag=True, help='Print timings of CLI startup phases on exit')
 @click.pass_context
-def cli(ctx, debug, config_file):
+def cli(ctx, debug, config_file, startup_profile):
     """CTAS-7 Enterprise Voice System CLI"""
     ctx.ensure_object(dict)
     ctx.obj['debug'] = debug
     ctx.obj['config_file'] = config_file
+    if startup_profile:
+        ctx.call_on_close(_profile.report)
 
 @cli.command()
 @click.pass_context
@@ -79,8 +135,81 @@ def interactive(ctx):
 
     asyncio.run(_interactive_session(debug))
 
+@cli.command()
+@click.option('--host', default='127.0.0.1', help='Bind address')
+@click.option('--port', default=8900, type=int, help='Bind port')
+@click.option('--latency', default=0.15, type=float, help='Seconds before first audio byte')
+@click.option('--chunk-size', default=4096, type=int, help='Audio bytes per streamed chunk')
+@click.option('--error-rate', default=0.0, type=float, help='Fraction of requests that fail')
+def mock_server(host, port, latency, chunk_size, error_rate):
+    """Run a local mock ElevenLabs TTS server"""
+    from .mock_elevenlabs import MockTTSSettings, run_mock_server
+
+    console.print(f"\n🧪 [bold blue]Mock TTS server on http://{host}:{port}/v1[/bold blue]")
+    console.print(f"Point the voice server at it with ELEVENLABS_BASE_URL=http://{host}:{port}/v1 "
+                  f"ELEVENLABS_WS_URL=ws://{host}:{port}/v1")
+    run_mock_server(host, port, MockTTSSettings(latency=latency, chunk_size=chunk_size, error_rate=error_rate))
+
+@cli.command()
+@click.option('--url', default='ws://localhost:8765/ws', help='Voice server WebSocket URL')
+@click.option('--connections', default=10, type=int, help='Concurrent client connections')
+@click.option('--requests', default=10, type=int, help='Synthesis requests per connection')
+@click.option('--agent', default='natasha', help='Voice agent to use (natasha/marcus)')
+@click.option('--text', default='Tactical analysis complete. All systems nominal.', help='Text to synthesize')
+@click.option('--streaming', is_flag=True, help='Use streaming synthesis')
+@click.option('--protocol', type=click.Choice(['json', 'binary']), default='json', help='Wire protocol')
+@click.option('--audio-format', help='Preferred audio format(s), comma separated (e.g. opus_48000_32)')
+@click.option('--output', type=click.Path(), help='Write the JSON summary to a file')
+def load_test(url, connections, requests, agent, text, streaming, protocol, audio_format, output):
+    """Load test a running voice server"""
+    from urllib.parse import urlparse
+    from .loadtest import run_load_test
+
+    parsed = urlparse(url)
+    scheme = "https" if parsed.scheme == "wss" else "http"
+    health_url = f"{scheme}://{parsed.netloc}/health"
+
+    console.print(f"\n📈 [bold blue]Load testing {url}[/bold blue] "
+                  f"({connections} connections x {requests} requests, {protocol})")
+
+    result = asyncio.run(run_load_test(
+        url=url,
+        connections=connections,
+        requests_per_connection=requests,
+        agent_id=agent,
+        text=text,
+        streaming=streaming,
+        protocol=protocol,
+        audio_format=audio_format,
+        health_url=health_url
+    ))
+    summary = result.summary()
+
+    from rich.table import Table
+    table = Table(title="Load Test Results")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value")
+    table.add_row("Requests", f"{summary['succeeded']}/{summary['requests']} succeeded")
+    table.add_row("Throughput", f"{summary['throughput_rps']} req/s, {summary['audio_mbps']} Mbit/s audio")
+    for label, key in (("Time to first audio", "ttfa_ms"), ("End-to-end latency", "latency_ms")):
+        dist = summary[key]
+        table.add_row(label, f"p50 {dist['p50']} ms / p90 {dist['p90']} ms / p99 {dist['p99']} ms")
+    rss = summary["server_rss_mb"]
+    table.add_row("Server RSS", f"start {rss['start']} MB / peak {rss['peak']} MB / end {rss['end']} MB")
+    console.print(table)
+
+    for error, count in summary["errors"].items():
+        console.print(f"  • {count}x {error}", style="red")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(summary, f, indent=2)
+        console.print(f"Summary written to {output}")
+
 async def _run_tests(debug: bool):
     """Run comprehensive system tests"""
+    from rich.table import Table
+    from rich.progress import Progress, SpinnerColumn, TextColumn
 
     test_results = []
 
@@ -93,9 +222,8 @@ async def _run_tests(debug: bool):
         # Test 1: Configuration
         task = progress.add_task("Testing configuration...", total=None)
         try:
-            config = VoiceConfig.from_env()
-            logger = config.setup_logging()
-            error_handler = initialize_error_handler(logger, debug)
+            config = _load_config()
+            error_handler = _init_logging(config, debug)
 
             validation = config.validate_configuration()
             if validation["valid"]:
@@ -111,7 +239,7 @@ async def _run_tests(debug: bool):
         # Test 2: ElevenLabs API Connection
         task = progress.add_task("Testing ElevenLabs API...", total=None)
         try:
-            orchestrator = VoiceOrchestrator(config)
+            orchestrator = _create_orchestrator(config)
             agents = await orchestrator.get_available_agents()
 
             if agents:
@@ -207,15 +335,15 @@ async def _run_tests(debug: bool):
 
 async def _speak_text(agent: str, text: str, streaming: bool, play_audio: bool, debug: bool):
     """Synthesize and optionally play text"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
 
     console.print(f"\n🎙️ [bold blue]Synthesizing speech with {agent}[/bold blue]")
 
     try:
         # Setup
-        config = VoiceConfig.from_env()
-        logger = config.setup_logging()
-        error_handler = initialize_error_handler(logger, debug)
-        orchestrator = VoiceOrchestrator(config)
+        config = _load_config()
+        error_handler = _init_logging(config, debug)
+        orchestrator = _create_orchestrator(config)
 
         # Synthesis
         with Progress(
@@ -275,14 +403,14 @@ async def _speak_text(agent: str, text: str, streaming: bool, play_audio: bool,
 
 async def _health_check(debug: bool):
     """Check system health"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
 
     console.print("\n🏥 [bold blue]System Health Check[/bold blue]")
 
     try:
-        config = VoiceConfig.from_env()
-        logger = config.setup_logging()
-        error_handler = initialize_error_handler(logger, debug)
-        orchestrator = VoiceOrchestrator(config)
+        config = _load_config()
+        error_handler = _init_logging(config, debug)
+        orchestrator = _create_orchestrator(config)
 
         with Progress(
             SpinnerColumn(),
@@ -341,8 +469,10 @@ def _check_configuration(debug: bool):
     console.print("\n⚙️ [bold blue]Configuration Validation[/bold blue]")
 
     try:
-        config = VoiceConfig.from_env()
+        config = _load_config()
+        start = time.perf_counter()
         validation = config.validate_configuration()
+        _profile.record("config validation", start)
 
         if validation["valid"]:
             console.print("✅ [green]Configuration is valid[/green]")
@@ -370,6 +500,7 @@ def _check_configuration(debug: bool):
             if "elevenlabs" in config_dict and "api_key" in config_dict["elevenlabs"]:
                 config_dict["elevenlabs"]["api_key"] = config_dict["elevenlabs"]["api_key"][:10] + "..."
 
+            from rich.syntax import Syntax
             syntax = Syntax(json.dumps(config_dict, indent=2), "json")
             console.print(syntax)
 
@@ -383,10 +514,9 @@ async def _interactive_session(debug: bool):
     console.print("Type 'quit' to exit, 'help' for commands")
 
     try:
-        config = VoiceConfig.from_env()
-        logger = config.setup_logging()
-        error_handler = initialize_error_handler(logger, debug)
-        orchestrator = VoiceOrchestrator(config)
+        config = _load_config()
+        error_handler = _init_logging(config, debug)
+        orchestrator = _create_orchestrator(config)
 
         agents = await orchestrator.get_available_agents()
         current_agent = "natasha"
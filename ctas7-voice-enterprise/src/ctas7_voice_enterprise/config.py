@@ -6,12 +6,30 @@ Centralized configuration management with validation and defaults
 import os
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
-from pydantic import BaseModel, Field, validator
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, List, Set, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, validator
+from dotenv import find_dotenv, dotenv_values
+
+# .env file found relative to this package (as load_dotenv() would), "" when absent
+_DOTENV_PATH = find_dotenv()
+
+# Keys set from .env rather than the real environment; a changed .env may update these
+_dotenv_keys: Set[str] = set()
+
+def _load_dotenv_file():
+    """Load .env without overriding variables that were set in the real environment"""
+    values = dotenv_values(_DOTENV_PATH) if _DOTENV_PATH and os.path.exists(_DOTENV_PATH) else {}
+    for key in _dotenv_keys - values.keys():
+        # Removed from .env since the last load
+        os.environ.pop(key, None)
+        _dotenv_keys.discard(key)
+    for key, value in values.items():
+        if value is not None and (key in _dotenv_keys or key not in os.environ):
+            os.environ[key] = value
+            _dotenv_keys.add(key)
 
 # Load environment variables
-load_dotenv()
+_load_dotenv_file()
 
 class LoggingConfig(BaseModel):
     """Logging configuration"""
@@ -63,6 +81,78 @@ class ServerConfig(BaseModel):
     debug: bool = Field(default=False, description="Debug mode")
     cors_origins: list = Field(default=["*"], description="CORS allowed origins")
     max_connections: int = Field(default=100, description="Maximum WebSocket connections")
+    send_queue_size: int = Field(default=64, ge=1, description="Outbound messages buffered per connection")
+    audio_degrade_queue_ratio: float = Field(default=0.5, ge=0, le=1, description="Send queue fill ratio at which responses switch to the lightest accepted audio format (0 disables)")
+    max_synthesis_per_connection: int = Field(default=2, ge=1, description="Concurrent synthesis requests per connection")
+    max_concurrent_synthesis: int = Field(default=16, ge=1, description="Concurrent synthesis requests across the server")
+    idle_timeout: float = Field(default=300.0, gt=0, description="Seconds without client messages before a connection is closed")
+    reaper_interval: float = Field(default=30.0, gt=0, description="Seconds between idle connection/session sweeps")
+    max_sessions: int = Field(default=1000, ge=1, description="Conversation sessions held in memory")
+    session_ttl: float = Field(default=3600.0, gt=0, description="Seconds of inactivity before a session is evicted")
+    session_archive_path: Optional[str] = Field(default=None, description="JSON-lines file for ended/evicted sessions")
+    history_window: int = Field(default=50, ge=1, description="Conversation turns kept in memory per session")
+    summarize_evicted_history: bool = Field(default=True, description="Fold turns leaving the history window into a summary")
+    workers: int = Field(default=1, ge=1, description="Worker processes sharing the port via SO_REUSEPORT")
+    shared_store: str = Field(default="memory", description="Session/cache store shared by workers (memory/sqlite)")
+    shared_store_path: str = Field(default="ctas7_voice_shared.db", description="SQLite shared store file")
+
+    @validator('shared_store')
+    def validate_shared_store(cls, v):
+        if v.lower() not in ("memory", "sqlite"):
+            raise ValueError("Shared store must be 'memory' or 'sqlite'")
+        return v.lower()
+
+class SchedulerConfig(BaseModel):
+    """Synthesis scheduler configuration"""
+    max_queue_size: int = Field(default=256, ge=1, description="Queued requests before lower priorities are shed")
+    per_agent_concurrency: int = Field(default=4, ge=1, description="Concurrent synthesis requests per agent")
+    critical_reserve: int = Field(default=2, ge=0, description="Extra slots usable only by critical requests")
+    deadlines: Dict[str, float] = Field(
+        default_factory=lambda: {"critical": 30.0, "high": 15.0, "medium": 10.0, "low": 5.0},
+        description="Maximum queue wait in seconds per priority"
+    )
+
+class AudioCacheConfig(BaseModel):
+    """Synthesized audio cache configuration"""
+    enabled: bool = Field(default=True, description="Cache synthesized audio")
+    max_bytes: int = Field(default=64 * 1024 * 1024, ge=0, description="Total audio bytes cached")
+    max_entry_bytes: int = Field(default=4 * 1024 * 1024, ge=0, description="Largest clip that is cached")
+    shared_max_bytes: int = Field(default=256 * 1024 * 1024, ge=0, description="Audio bytes kept in the shared store")
+
+class PrewarmConfig(BaseModel):
+    """Startup prewarm configuration"""
+    enabled: bool = Field(default=True, description="Prewarm before reporting ready")
+    connect_streaming: bool = Field(default=True, description="Open upstream streaming connections for each agent")
+    phrases: List[str] = Field(default_factory=list, description="Phrases pre-synthesized into the audio cache for each agent")
+    timeout: float = Field(default=30.0, gt=0, description="Seconds allowed for prewarm before reporting ready anyway")
+
+class SpeechToTextConfig(BaseModel):
+    """Streaming speech-to-text for audio_chunk messages"""
+    enabled: bool = Field(default=False, description="Transcribe client audio_chunk messages")
+    backend: str = Field(default="cli", description="whisper.cpp backend: 'cli' (binary per utterance) or 'server' (resident whisper-server)")
+    whisper_binary: str = Field(default="whisper.cpp/build/bin/whisper-cli", description="whisper.cpp CLI binary")
+    whisper_model: str = Field(default="whisper.cpp/models/ggml-base.en.bin", description="whisper.cpp GGML model")
+    server_url: str = Field(default="http://127.0.0.1:8080/inference", description="whisper-server inference endpoint")
+    language: str = Field(default="en", description="Spoken language")
+    threads: int = Field(default=2, ge=1, description="Threads per recognition")
+    workers: int = Field(default=2, ge=1, description="Concurrent recognitions across the server")
+    timeout: float = Field(default=30.0, gt=0, description="Seconds allowed per recognition")
+    sample_rate: int = Field(default=16000, description="Expected PCM sample rate (whisper.cpp uses 16 kHz)")
+    frame_ms: int = Field(default=30, ge=10, le=100, description="VAD frame length")
+    vad_threshold_ratio: float = Field(default=3.0, gt=1, description="Speech energy relative to the tracked noise floor")
+    vad_min_rms: float = Field(default=300.0, ge=0, description="Minimum frame RMS counted as speech")
+    vad_start_ms: int = Field(default=90, ge=0, description="Voiced audio needed to start an utterance")
+    vad_hangover_ms: int = Field(default=600, ge=0, description="Silence that ends an utterance")
+    preroll_ms: int = Field(default=300, ge=0, description="Audio kept before detected speech onset")
+    partial_interval: float = Field(default=1.0, ge=0, description="Seconds of new speech between partial transcripts (0 disables)")
+    max_utterance_seconds: float = Field(default=30.0, gt=0, description="Utterances are finalized at this length")
+    max_finals_per_connection: int = Field(default=2, ge=1, description="Final transcripts running or queued per connection")
+
+    @validator('backend')
+    def validate_backend(cls, v):
+        if v.lower() not in ("cli", "server"):
+            raise ValueError("STT backend must be 'cli' or 'server'")
+        return v.lower()
 
 class VoiceConfig(BaseModel):
     """Main voice system configuration"""
@@ -75,13 +165,22 @@ class VoiceConfig(BaseModel):
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     elevenlabs: ElevenLabsConfig
     server: ServerConfig = Field(default_factory=ServerConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
+    audio_cache: AudioCacheConfig = Field(default_factory=AudioCacheConfig)
+    prewarm: PrewarmConfig = Field(default_factory=PrewarmConfig)
+    stt: SpeechToTextConfig = Field(default_factory=SpeechToTextConfig)
 
     # Voice agents
     agents: Dict[str, VoiceAgentConfig] = Field(default_factory=dict)
 
+    # validate_configuration() result, computed once per instance
+    _validation: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
     # Monitoring
     enable_metrics: bool = Field(default=True, description="Enable Prometheus metrics")
     metrics_port: int = Field(default=9090, description="Metrics server port")
+    trace_sample_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Fraction of synthesis requests traced")
+    trace_log_file: Optional[str] = Field(default=None, description="JSON-lines trace log path (structured log if unset)")
 
     class Config:
         env_prefix = "CTAS7_VOICE_"
@@ -112,12 +211,69 @@ class VoiceConfig(BaseModel):
         )
 
         # ElevenLabs config
-        elevenlabs_config = ElevenLabsConfig(api_key=api_key)
+        elevenlabs_config = ElevenLabsConfig(
+            api_key=api_key,
+            base_url=os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io/v1"),
+            websocket_url=os.getenv("ELEVENLABS_WS_URL", "wss://api.elevenlabs.io/v1")
+        )
 
         # Server config
         server_config = ServerConfig(
             debug=debug,
-            port=int(os.getenv("CTAS7_VOICE_PORT", "8765"))
+            port=int(os.getenv("CTAS7_VOICE_PORT", "8765")),
+            max_connections=int(os.getenv("CTAS7_VOICE_MAX_CONNECTIONS", "100")),
+            send_queue_size=int(os.getenv("CTAS7_VOICE_SEND_QUEUE_SIZE", "64")),
+            audio_degrade_queue_ratio=float(os.getenv("CTAS7_VOICE_AUDIO_DEGRADE_QUEUE_RATIO", "0.5")),
+            max_synthesis_per_connection=int(os.getenv("CTAS7_VOICE_MAX_SYNTHESIS_PER_CONNECTION", "2")),
+            max_concurrent_synthesis=int(os.getenv("CTAS7_VOICE_MAX_CONCURRENT_SYNTHESIS", "16")),
+            idle_timeout=float(os.getenv("CTAS7_VOICE_IDLE_TIMEOUT", "300")),
+            max_sessions=int(os.getenv("CTAS7_VOICE_MAX_SESSIONS", "1000")),
+            session_ttl=float(os.getenv("CTAS7_VOICE_SESSION_TTL", "3600")),
+            session_archive_path=os.getenv("CTAS7_VOICE_SESSION_ARCHIVE"),
+            history_window=int(os.getenv("CTAS7_VOICE_HISTORY_WINDOW", "50")),
+            summarize_evicted_history=os.getenv("CTAS7_VOICE_SUMMARIZE_HISTORY", "true").lower() in ("true", "1", "yes"),
+            workers=int(os.getenv("CTAS7_VOICE_WORKERS", "1")),
+            shared_store=os.getenv("CTAS7_VOICE_SHARED_STORE", "memory"),
+            shared_store_path=os.getenv("CTAS7_VOICE_SHARED_STORE_PATH", "ctas7_voice_shared.db")
+        )
+
+        # Scheduler config
+        scheduler_config = SchedulerConfig(
+            max_queue_size=int(os.getenv("CTAS7_VOICE_SCHEDULER_QUEUE_SIZE", "256")),
+            per_agent_concurrency=int(os.getenv("CTAS7_VOICE_PER_AGENT_CONCURRENCY", "4"))
+        )
+
+        # Audio cache and startup prewarm
+        audio_cache_bytes = int(float(os.getenv("CTAS7_VOICE_AUDIO_CACHE_MB", "64")) * 1024 * 1024)
+        audio_cache_config = AudioCacheConfig(
+            enabled=audio_cache_bytes > 0,
+            max_bytes=audio_cache_bytes,
+            shared_max_bytes=int(float(os.getenv("CTAS7_VOICE_SHARED_AUDIO_MB", "256")) * 1024 * 1024)
+        )
+
+        phrases: List[str] = []
+        phrases_file = os.getenv("CTAS7_VOICE_PREWARM_PHRASES_FILE")
+        if phrases_file:
+            with open(phrases_file) as f:
+                phrases = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+        prewarm_config = PrewarmConfig(
+            enabled=os.getenv("CTAS7_VOICE_PREWARM", "true").lower() in ("true", "1", "yes"),
+            phrases=phrases
+        )
+
+        # Speech-to-text for inbound audio
+        stt_config = SpeechToTextConfig(
+            enabled=os.getenv("CTAS7_VOICE_STT", "false").lower() in ("true", "1", "yes"),
+            backend=os.getenv("CTAS7_VOICE_STT_BACKEND", "cli"),
+            whisper_binary=os.getenv("CTAS7_VOICE_WHISPER_BIN", "whisper.cpp/build/bin/whisper-cli"),
+            whisper_model=os.getenv("CTAS7_VOICE_WHISPER_MODEL", "whisper.cpp/models/ggml-base.en.bin"),
+            server_url=os.getenv("CTAS7_VOICE_WHISPER_SERVER_URL", "http://127.0.0.1:8080/inference"),
+            language=os.getenv("CTAS7_VOICE_STT_LANGUAGE", "en"),
+            workers=int(os.getenv("CTAS7_VOICE_STT_WORKERS", "2")),
+            partial_interval=float(os.getenv("CTAS7_VOICE_STT_PARTIAL_INTERVAL", "1.0")),
+            vad_hangover_ms=int(os.getenv("CTAS7_VOICE_STT_HANGOVER_MS", "600")),
+            max_finals_per_connection=int(os.getenv("CTAS7_VOICE_STT_MAX_FINALS_PER_CONNECTION", "2"))
         )
 
         # Default agents
@@ -140,19 +296,31 @@ class VoiceConfig(BaseModel):
 
         return cls(
             debug=debug,
+            trace_sample_rate=float(os.getenv("CTAS7_VOICE_TRACE_SAMPLE_RATE", "0")),
+            trace_log_file=os.getenv("CTAS7_VOICE_TRACE_LOG_FILE"),
             logging=logging_config,
             elevenlabs=elevenlabs_config,
             server=server_config,
+            scheduler=scheduler_config,
+            audio_cache=audio_cache_config,
+            prewarm=prewarm_config,
+            stt=stt_config,
             agents=agents
         )
 
-    def setup_logging(self) -> logging.Logger:
-        """Setup structured logging"""
-        import structlog
-        from logging.handlers import RotatingFileHandler
+    def setup_logging(self) -> "logging.Logger":
+        """Setup structured logging; a no-op when already configured with the same settings"""
+        global _logging_configured_for
 
         # Configure standard logging
         logger = logging.getLogger("ctas7_voice")
+        logging_key = tuple(self.logging.dict().values())
+        if _logging_configured_for == logging_key:
+            return logger
+
+        import structlog
+        from logging.handlers import RotatingFileHandler
+
         logger.setLevel(getattr(logging, self.logging.level))
 
         # Remove existing handlers
@@ -196,10 +364,14 @@ class VoiceConfig(BaseModel):
             cache_logger_on_first_use=True,
         )
 
+        _logging_configured_for = logging_key
         return logger
 
     def validate_configuration(self) -> Dict[str, Any]:
-        """Validate configuration and return status"""
+        """Validate configuration and return status (computed once per instance)"""
+        if self._validation is not None:
+            return self._validation
+
         status = {
             "valid": True,
             "errors": [],
@@ -227,4 +399,50 @@ class VoiceConfig(BaseModel):
             status["warnings"].append("Debug mode enabled - performance may be impacted")
             status["info"].append(f"Logging to file: {self.logging.file_path}")
 
-        return status
\ No newline at end of file
+        self._validation = status
+        return status
+
+# Logging settings last applied by VoiceConfig.setup_logging()
+_logging_configured_for: Optional[Tuple] = None
+
+def _mtime(path: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+# Memoized load_config() result and the inputs it was built from
+_config: Optional[VoiceConfig] = None
+_config_signature: Optional[Tuple] = None
+_dotenv_mtime: Optional[int] = _mtime(_DOTENV_PATH)
+
+def _config_inputs() -> Tuple:
+    """Fingerprint of what VoiceConfig.from_env() reads: every CTAS7_VOICE_* and
+    ELEVENLABS_* variable (sorted, so additions and removals are seen) and the
+    prewarm phrases file."""
+    return (
+        tuple(sorted(
+            (key, value) for key, value in os.environ.items()
+            if key.startswith(("CTAS7_VOICE_", "ELEVENLABS_"))
+        )),
+        _mtime(os.getenv("CTAS7_VOICE_PREWARM_PHRASES_FILE"))
+    )
+
+def load_config(reload: bool = False) -> VoiceConfig:
+    """Return the process-wide configuration, building it from the environment on first use.
+
+    The cached instance is rebuilt when the .env file, a relevant environment
+    variable or the prewarm phrases file changes, or when ``reload`` is set.
+    """
+    global _config, _config_signature, _dotenv_mtime
+
+    dotenv_mtime = _mtime(_DOTENV_PATH)
+    if dotenv_mtime != _dotenv_mtime:
+        _load_dotenv_file()
+        _dotenv_mtime = dotenv_mtime
+
+    signature = _config_inputs()
+    if reload or _config is None or signature != _config_signature:
+        _config = VoiceConfig.from_env()
+        _config_signature = signature
+    return _config
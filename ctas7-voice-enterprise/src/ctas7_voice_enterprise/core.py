@@ -8,8 +8,8 @@ import json
 import base64
 import time
 import logging
-from typing import Dict, Any, Optional, AsyncGenerator, Callable
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, AsyncGenerator, Callable, List
+from dataclasses import dataclass, asdict
 import websockets
 import structlog
 from elevenlabs.client import ElevenLabs
@@ -20,6 +20,34 @@ from .errors import (
     ErrorHandler, ElevenLabsAPIError, VoiceAgentError, WebSocketError,
     handle_error, ErrorSeverity, ErrorCategory
 )
+from .telemetry import record_stage
+from .audio_cache import AudioCache
+from .shared_store import SharedStore
+from .protocol import DEFAULT_AUDIO_FORMAT
+
+# Seconds the upstream stream-input socket may sit idle (API maximum) so prewarmed connections survive
+UPSTREAM_INACTIVITY_TIMEOUT = 180
+
+@dataclass(frozen=True)
+class VoiceSettings:
+    """Immutable per-request voice settings"""
+    stability: float
+    similarity_boost: float
+    style: float
+    use_speaker_boost: bool = True
+
+    @classmethod
+    def from_config(cls, config: VoiceAgentConfig) -> "VoiceSettings":
+        """Default settings for an agent configuration"""
+        return cls(
+            stability=config.stability,
+            similarity_boost=config.similarity_boost,
+            style=config.style,
+            use_speaker_boost=config.use_speaker_boost
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 @dataclass
 class VoiceResponse:
@@ -35,14 +63,18 @@ class VoiceResponse:
 class VoiceOrchestrator:
     """Main voice orchestration system"""
 
-    def __init__(self, config: VoiceConfig):
+    def __init__(self, config: VoiceConfig, shared_store: Optional[SharedStore] = None):
         self.config = config
         self.logger = structlog.get_logger("voice_orchestrator")
         self.error_handler = ErrorHandler(self.logger.logger, config.debug)
 
         # Initialize ElevenLabs client
         try:
-            self.elevenlabs_client = ElevenLabs(api_key=config.elevenlabs.api_key)
+            # SDK paths already include /v1, so the configured base URL is trimmed
+            self.elevenlabs_client = ElevenLabs(
+                api_key=config.elevenlabs.api_key,
+                base_url=config.elevenlabs.base_url.removesuffix("/v1")
+            )
             self.logger.info("ElevenLabs client initialized", api_key_prefix=config.elevenlabs.api_key[:10])
         except Exception as e:
             error_context = self.error_handler.handle_error(
@@ -57,6 +89,16 @@ class VoiceOrchestrator:
         # WebSocket connections for streaming
         self.websocket_connections: Dict[str, websockets.WebSocketServerProtocol] = {}
 
+        # Synthesized audio, shared across agents and requests
+        self.audio_cache: Optional[AudioCache] = None
+        if config.audio_cache.enabled:
+            self.audio_cache = AudioCache(
+                config.audio_cache.max_bytes,
+                config.audio_cache.max_entry_bytes,
+                shared=shared_store,
+                shared_max_bytes=config.audio_cache.shared_max_bytes
+            )
+
         self.logger.info("VoiceOrchestrator initialized",
                         agents=list(self.agents.keys()),
                         debug_mode=config.debug)
@@ -69,7 +111,9 @@ class VoiceOrchestrator:
                     config=agent_config,
                     elevenlabs_client=self.elevenlabs_client,
                     error_handler=self.error_handler,
-                    debug=self.config.debug
+                    debug=self.config.debug,
+                    websocket_url=self.config.elevenlabs.websocket_url,
+                    agent_id=agent_id
                 )
                 self.agents[agent_id] = agent
                 self.logger.info("Voice agent initialized",
@@ -88,9 +132,11 @@ class VoiceOrchestrator:
         self,
         agent_id: str,
         text: str,
-        streaming: bool = False
+        streaming: bool = False,
+        voice_settings: Optional[VoiceSettings] = None,
+        output_format: str = DEFAULT_AUDIO_FORMAT
     ) -> VoiceResponse:
-        """Synthesize speech using specified agent"""
+        """Synthesize speech using specified agent in the given ElevenLabs output format"""
         start_time = time.time()
 
         try:
@@ -101,18 +147,46 @@ class VoiceOrchestrator:
                 )
 
             agent = self.agents[agent_id]
+            settings = voice_settings or agent.default_voice_settings
+
+            cache_key = self._cache_key(agent_id, agent, settings, text, output_format)
+            if self.audio_cache is not None:
+                cached_audio = await self.audio_cache.get(cache_key)
+                if cached_audio is not None:
+                    return VoiceResponse(
+                        agent_name=agent.config.name,
+                        text=text,
+                        audio_data=cached_audio,
+                        duration=time.time() - start_time,
+                        success=True,
+                        metadata={
+                            "agent_id": agent_id,
+                            "voice_id": agent.config.voice_id,
+                            "model_id": agent.config.model_id,
+                            "streaming": streaming,
+                            "output_format": output_format,
+                            "cached": True
+                        }
+                    )
 
             self.logger.info("Starting speech synthesis",
                            agent_id=agent_id,
                            text_length=len(text),
-                           streaming=streaming)
+                           streaming=streaming,
+                           output_format=output_format)
 
+            synthesis_start = time.perf_counter()
             if streaming:
                 # Use WebSocket streaming for real-time synthesis
-                audio_data = await agent.synthesize_streaming(text)
+                audio_data = await agent.synthesize_streaming(text, settings, output_format)
             else:
                 # Use standard API for complete synthesis
-                audio_data = await agent.synthesize_standard(text)
+                audio_data = await agent.synthesize_standard(text, settings, output_format)
+            record_stage("synthesis", time.perf_counter() - synthesis_start,
+                         agent=agent_id, mode="streaming" if streaming else "standard")
+
+            if self.audio_cache is not None:
+                await self.audio_cache.put(cache_key, audio_data)
 
             duration = time.time() - start_time
 
@@ -126,7 +200,9 @@ class VoiceOrchestrator:
                     "agent_id": agent_id,
                     "voice_id": agent.config.voice_id,
                     "model_id": agent.config.model_id,
-                    "streaming": streaming
+                    "streaming": streaming,
+                    "output_format": output_format,
+                    "cached": False
                 }
             )
 
@@ -154,6 +230,44 @@ class VoiceOrchestrator:
                 error=error_context.message
             )
 
+    @staticmethod
+    def _cache_key(agent_id: str, agent: "VoiceAgent", settings: VoiceSettings, text: str, output_format: str) -> tuple:
+        """Everything that changes the synthesized audio"""
+        return (agent_id, agent.config.voice_id, agent.config.model_id, output_format, settings, text)
+
+    async def prewarm(self, phrases: Optional[List[str]] = None, connect_streaming: bool = True) -> Dict[str, Any]:
+        """Open upstream connections and pre-synthesize phrases into the audio cache for every agent"""
+
+        async def warm_agent(agent_id: str, agent: "VoiceAgent") -> Dict[str, Any]:
+            status = {"streaming_connected": False, "phrases_cached": 0, "errors": []}
+            if connect_streaming:
+                try:
+                    await agent.prewarm()
+                    status["streaming_connected"] = True
+                except Exception as e:
+                    status["errors"].append(str(e))
+                    self.error_handler.handle_error(e, {"agent_id": agent_id, "phase": "prewarm"})
+            for phrase in phrases or []:
+                # Routed through synthesize_speech so the audio lands in the cache under its normal key
+                response = await self.synthesize_speech(agent_id, phrase)
+                if response.success:
+                    status["phrases_cached"] += 1
+                else:
+                    status["errors"].append(response.error)
+            return status
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[warm_agent(agent_id, agent) for agent_id, agent in self.agents.items()])
+        agents = dict(zip(self.agents.keys(), results))
+
+        summary = {
+            "duration_seconds": round(time.perf_counter() - start, 3),
+            "agents": agents,
+            "warm": all(not status["errors"] for status in agents.values())
+        }
+        self.logger.info("Prewarm completed", **summary)
+        return summary
+
     async def get_available_agents(self) -> Dict[str, Dict[str, Any]]:
         """Get information about available voice agents"""
         agents_info = {}
@@ -173,7 +287,8 @@ class VoiceOrchestrator:
             "timestamp": time.time(),
             "services": {},
             "agents": {},
-            "errors": self.error_handler.get_error_summary()
+            "errors": self.error_handler.get_error_summary(),
+            "audio_cache": self.audio_cache.get_stats() if self.audio_cache else None
         }
 
         # Check ElevenLabs API connectivity
@@ -208,43 +323,51 @@ class VoiceAgent:
         config: VoiceAgentConfig,
         elevenlabs_client: ElevenLabs,
         error_handler: ErrorHandler,
-        debug: bool = False
+        debug: bool = False,
+        websocket_url: str = "wss://api.elevenlabs.io/v1",
+        agent_id: Optional[str] = None
     ):
         self.config = config
+        # Metric label; matches the orchestrator's agent key rather than the display name
+        self.agent_id = agent_id or config.name
         self.elevenlabs_client = elevenlabs_client
         self.error_handler = error_handler
         self.debug = debug
+        self.websocket_url = websocket_url
         self.logger = structlog.get_logger("voice_agent", agent_name=config.name)
 
-        # WebSocket connection for streaming
-        self.websocket_connection: Optional[websockets.WebSocketClientProtocol] = None
-        self.is_connected = False
+        # Defaults used when a request does not carry its own settings
+        self.default_voice_settings = VoiceSettings.from_config(config)
+
+        # Streaming sockets, one per output format (fixed at connect time); one reader at a time on each
+        self.websocket_connections: Dict[str, websockets.WebSocketClientProtocol] = {}
+        self._stream_locks: Dict[str, asyncio.Lock] = {}
 
         self.logger.info("Voice agent created", voice_id=config.voice_id)
 
-    async def synthesize_standard(self, text: str) -> bytes:
+    @property
+    def is_connected(self) -> bool:
+        return any(not connection.closed for connection in self.websocket_connections.values())
+
+    def _stream_lock(self, output_format: str) -> asyncio.Lock:
+        lock = self._stream_locks.get(output_format)
+        if lock is None:
+            lock = self._stream_locks[output_format] = asyncio.Lock()
+        return lock
+
+    async def synthesize_standard(
+        self,
+        text: str,
+        voice_settings: Optional[VoiceSettings] = None,
+        output_format: str = DEFAULT_AUDIO_FORMAT
+    ) -> bytes:
         """Standard speech synthesis using REST API"""
+        settings = voice_settings or self.default_voice_settings
         try:
             self.logger.debug("Starting standard synthesis", text_length=len(text))
 
-            # Use the ElevenLabs client for standard synthesis
-            audio = self.elevenlabs_client.text_to_speech.convert(
-                text=text,
-                voice_id=self.config.voice_id,
-                model_id=self.config.model_id,
-                output_format="mp3_44100_128",
-                voice_settings={
-                    "stability": self.config.stability,
-                    "similarity_boost": self.config.similarity_boost,
-                    "style": self.config.style,
-                    "use_speaker_boost": self.config.use_speaker_boost
-                }
-            )
-
-            # Convert generator to bytes
-            audio_bytes = b""
-            for chunk in audio:
-                audio_bytes += chunk
+            # The ElevenLabs client is blocking; run it off the event loop so requests overlap
+            audio_bytes = await asyncio.to_thread(self._convert_standard, text, settings, output_format)
 
             self.logger.debug("Standard synthesis completed", audio_size=len(audio_bytes))
             return audio_bytes
@@ -270,62 +393,41 @@ class VoiceAgent:
                     details={"text_length": len(text)}
                 )
 
-    async def synthesize_streaming(self, text: str) -> bytes:
+    def _convert_standard(self, text: str, settings: VoiceSettings, output_format: str) -> bytes:
+        """Blocking REST synthesis; runs in a worker thread"""
+        request_start = time.perf_counter()
+        audio = self.elevenlabs_client.text_to_speech.convert(
+            text=text,
+            voice_id=self.config.voice_id,
+            model_id=self.config.model_id,
+            output_format=output_format,
+            voice_settings=settings.to_dict()
+        )
+
+        # Convert generator to bytes
+        chunks: List[bytes] = []
+        first_chunk_at = None
+        for chunk in audio:
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+                record_stage("ttfb", first_chunk_at - request_start, agent=self.agent_id, mode="standard")
+            chunks.append(chunk)
+        if first_chunk_at is not None:
+            record_stage("stream", time.perf_counter() - first_chunk_at, agent=self.agent_id, mode="standard")
+
+        return b"".join(chunks)
+
+    async def synthesize_streaming(
+        self,
+        text: str,
+        voice_settings: Optional[VoiceSettings] = None,
+        output_format: str = DEFAULT_AUDIO_FORMAT
+    ) -> bytes:
         """Streaming speech synthesis using WebSocket"""
+        settings = voice_settings or self.default_voice_settings
         try:
-            self.logger.debug("Starting streaming synthesis", text_length=len(text))
-
-            # Ensure WebSocket connection
-            await self._ensure_websocket_connection()
-
-            # Send text for synthesis
-            message = {
-                "text": text,
-                "voice_settings": {
-                    "stability": self.config.stability,
-                    "similarity_boost": self.config.similarity_boost,
-                    "style": self.config.style,
-                    "use_speaker_boost": self.config.use_speaker_boost
-                },
-                "generation_config": {
-                    "chunk_length_schedule": [120, 160, 250, 290]
-                }
-            }
-
-            await self.websocket_connection.send(json.dumps(message))
-
-            # Collect audio chunks
-            audio_chunks = []
-            while True:
-                try:
-                    response = await asyncio.wait_for(
-                        self.websocket_connection.recv(),
-                        timeout=30
-                    )
-
-                    if isinstance(response, bytes):
-                        # Binary audio data
-                        audio_chunks.append(response)
-                    else:
-                        # JSON message (potentially end of stream or error)
-                        data = json.loads(response)
-                        if data.get("type") == "audio_stream_end":
-                            break
-                        elif data.get("error"):
-                            raise ElevenLabsAPIError(
-                                message=f"Streaming error: {data['error']}",
-                                response_data=data
-                            )
-
-                except asyncio.TimeoutError:
-                    break
-
-            audio_data = b"".join(audio_chunks)
-            self.logger.debug("Streaming synthesis completed",
-                            chunks=len(audio_chunks),
-                            audio_size=len(audio_data))
-
-            return audio_data
+            async with self._stream_lock(output_format):
+                return await self._stream_on_connection(text, settings, output_format)
 
         except Exception as e:
             if isinstance(e, (ElevenLabsAPIError, VoiceAgentError)):
@@ -337,14 +439,86 @@ class VoiceAgent:
                     details={"agent_name": self.config.name}
                 )
 
-    async def _ensure_websocket_connection(self):
-        """Ensure WebSocket connection is established"""
-        if self.websocket_connection and not self.websocket_connection.closed:
-            return
+    async def _stream_on_connection(self, text: str, settings: VoiceSettings, output_format: str) -> bytes:
+        """Send one request over the shared upstream socket for the format and collect its audio"""
+        self.logger.debug("Starting streaming synthesis", text_length=len(text), output_format=output_format)
+
+        # Ensure WebSocket connection
+        connection = await self._ensure_websocket_connection(output_format)
+
+        # Send text for synthesis
+        message = {
+            "text": text,
+            "voice_settings": settings.to_dict(),
+            "generation_config": {
+                "chunk_length_schedule": [120, 160, 250, 290]
+            },
+            "flush": True
+        }
+
+        await connection.send(json.dumps(message))
+        request_start = time.perf_counter()
+        first_chunk_at = None
+
+        # Collect audio chunks
+        audio_chunks = []
+        while True:
+            try:
+                response = await asyncio.wait_for(
+                    connection.recv(),
+                    timeout=30
+                )
+
+                if isinstance(response, bytes):
+                    # Binary audio data
+                    if first_chunk_at is None:
+                        first_chunk_at = time.perf_counter()
+                        record_stage("ttfb", first_chunk_at - request_start, agent=self.agent_id, mode="streaming")
+                    audio_chunks.append(response)
+                else:
+                    # JSON message (audio, end of stream or error)
+                    data = json.loads(response)
+                    if data.get("audio"):
+                        if first_chunk_at is None:
+                            first_chunk_at = time.perf_counter()
+                            record_stage("ttfb", first_chunk_at - request_start, agent=self.agent_id, mode="streaming")
+                        audio_chunks.append(base64.b64decode(data["audio"]))
+                    if data.get("type") == "audio_stream_end" or data.get("isFinal"):
+                        break
+                    elif data.get("error"):
+                        raise ElevenLabsAPIError(
+                            message=f"Streaming error: {data['error']}",
+                            response_data=data
+                        )
+
+            except asyncio.TimeoutError:
+                break
+
+        if first_chunk_at is not None:
+            record_stage("stream", time.perf_counter() - first_chunk_at, agent=self.agent_id, mode="streaming")
+
+        audio_data = b"".join(audio_chunks)
+        self.logger.debug("Streaming synthesis completed",
+                        chunks=len(audio_chunks),
+                        audio_size=len(audio_data))
+
+        return audio_data
+
+    async def _ensure_websocket_connection(
+        self,
+        output_format: str = DEFAULT_AUDIO_FORMAT
+    ) -> websockets.WebSocketClientProtocol:
+        """Ensure the WebSocket connection for an output format is established"""
+        connection = self.websocket_connections.get(output_format)
+        if connection and not connection.closed:
+            return connection
 
         try:
             # WebSocket URL for streaming
-            ws_url = f"wss://api.elevenlabs.io/v1/text-to-speech/{self.config.voice_id}/stream-input"
+            ws_url = (
+                f"{self.websocket_url}/text-to-speech/{self.config.voice_id}/stream-input"
+                f"?output_format={output_format}&inactivity_timeout={UPSTREAM_INACTIVITY_TIMEOUT}"
+            )
 
             # Connection headers
             headers = {
@@ -353,7 +527,8 @@ class VoiceAgent:
 
             self.logger.debug("Establishing WebSocket connection", url=ws_url)
 
-            self.websocket_connection = await websockets.connect(
+            connect_start = time.perf_counter()
+            connection = await websockets.connect(
                 ws_url,
                 extra_headers=headers,
                 ping_interval=20,
@@ -363,31 +538,35 @@ class VoiceAgent:
             # Send initial message to keep connection alive
             initial_message = {
                 "text": " ",
-                "voice_settings": {
-                    "stability": self.config.stability,
-                    "similarity_boost": self.config.similarity_boost,
-                    "style": self.config.style,
-                    "use_speaker_boost": self.config.use_speaker_boost
-                }
+                "voice_settings": self.default_voice_settings.to_dict()
             }
-            await self.websocket_connection.send(json.dumps(initial_message))
+            await connection.send(json.dumps(initial_message))
+            record_stage("upstream_connect", time.perf_counter() - connect_start,
+                         agent=self.agent_id, mode="streaming")
 
-            self.is_connected = True
-            self.logger.info("WebSocket connection established")
+            self.websocket_connections[output_format] = connection
+            self.logger.info("WebSocket connection established", output_format=output_format)
+            return connection
 
         except Exception as e:
-            self.is_connected = False
             raise WebSocketError(
                 message=f"Failed to establish WebSocket connection: {e}",
-                details={"agent_name": self.config.name, "voice_id": self.config.voice_id}
+                details={"agent_name": self.config.name, "voice_id": self.config.voice_id,
+                         "output_format": output_format}
             )
 
+    async def prewarm(self, output_format: str = DEFAULT_AUDIO_FORMAT):
+        """Open the upstream streaming connection ahead of the first request"""
+        async with self._stream_lock(output_format):
+            await self._ensure_websocket_connection(output_format)
+
     async def close_websocket(self):
-        """Close WebSocket connection"""
-        if self.websocket_connection and not self.websocket_connection.closed:
-            await self.websocket_connection.close()
-            self.is_connected = False
-            self.logger.info("WebSocket connection closed")
+        """Close all WebSocket connections"""
+        for output_format, connection in list(self.websocket_connections.items()):
+            if not connection.closed:
+                await connection.close()
+                self.logger.info("WebSocket connection closed", output_format=output_format)
+        self.websocket_connections.clear()
 
     def is_healthy(self) -> bool:
         """Check if agent is healthy"""
@@ -400,5 +579,6 @@ class VoiceAgent:
             "name": self.config.name,
             "voice_id": self.config.voice_id,
             "websocket_connected": self.is_connected,
+            "websocket_formats": [fmt for fmt, conn in self.websocket_connections.items() if not conn.closed],
             "last_check": time.time()
         }
\ No newline at end of file
@@ -5,9 +5,11 @@ Comprehensive error definitions and handling with debugging support
 
 import time
 import json
+import random
 import logging
 import traceback
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Dict, Any, Optional, List, Deque, Tuple
 from enum import Enum
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -28,6 +30,7 @@ class ErrorCategory(Enum):
     VOICE_SYNTHESIS = "voice_synthesis"
     WEBSOCKET = "websocket"
     USER_INPUT = "user_input"
+    SPEECH_RECOGNITION = "speech_recognition"
     SYSTEM = "system"
 
 @dataclass
@@ -73,7 +76,7 @@ class CTAS7VoiceException(Exception):
         self.timestamp = datetime.now().isoformat()
         self.error_id = f"CTAS7_{int(time.time())}_{id(self)}"
 
-    def get_context(self) -> ErrorContext:
+    def get_context(self, capture_stack: bool = True) -> ErrorContext:
         """Get rich error context"""
         return ErrorContext(
             timestamp=self.timestamp,
@@ -82,7 +85,7 @@ class CTAS7VoiceException(Exception):
             severity=self.severity,
             message=self.message,
             details=self.details,
-            stack_trace=traceback.format_exc(),
+            stack_trace=traceback.format_exc() if capture_stack else None,
             suggestions=self.suggestions,
             user_message=self.user_message
         )
@@ -207,13 +210,122 @@ class ConfigurationError(CTAS7VoiceException):
             **kwargs
         )
 
+class SpeechRecognitionError(CTAS7VoiceException):
+    """Speech-to-text recognizer errors"""
+
+    def __init__(self, message: str, backend: Optional[str] = None, **kwargs):
+        details = kwargs.pop('details', {})
+        if backend:
+            details['backend'] = backend
+
+        suggestions = [
+            "Check the whisper.cpp binary and model paths",
+            "Verify the whisper.cpp server is running when using the server backend",
+            "Send 16 kHz mono 16-bit PCM audio"
+        ]
+
+        super().__init__(
+            message=message,
+            category=ErrorCategory.SPEECH_RECOGNITION,
+            severity=ErrorSeverity.MEDIUM,
+            details=details,
+            suggestions=suggestions,
+            user_message="Speech could not be transcribed.",
+            **kwargs
+        )
+
+class RollingErrorCounter:
+    """Error counts by category and severity over sliding time windows.
+
+    Counts land in fixed-width time buckets held in a ring, so recording is
+    O(1) and a window query sums at most ``horizon / bucket_seconds`` buckets.
+    """
+
+    def __init__(self, bucket_seconds: float = 10.0, horizon: float = 3600.0):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = int(horizon // bucket_seconds)
+        self._slots: List[int] = [-1] * self.bucket_count
+        self._buckets: List[Dict[Tuple[str, str], int]] = [{} for _ in range(self.bucket_count)]
+
+    def record(self, category: str, severity: str, now: Optional[float] = None):
+        slot = int((now or time.time()) // self.bucket_seconds)
+        index = slot % self.bucket_count
+        if self._slots[index] != slot:
+            self._slots[index] = slot
+            self._buckets[index] = {}
+        bucket = self._buckets[index]
+        key = (category, severity)
+        bucket[key] = bucket.get(key, 0) + 1
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Counts by category and severity over the last ``seconds``"""
+        current = int((now or time.time()) // self.bucket_seconds)
+        oldest = current - min(int(seconds // self.bucket_seconds), self.bucket_count) + 1
+        categories: Dict[str, int] = {}
+        severities: Dict[str, int] = {}
+        total = 0
+        for slot, bucket in zip(self._slots, self._buckets):
+            if slot < oldest or slot > current:
+                continue
+            for (category, severity), count in bucket.items():
+                categories[category] = categories.get(category, 0) + count
+                severities[severity] = severities.get(severity, 0) + count
+                total += count
+        return {"total": total, "categories": categories, "severities": severities}
+
+class _BurstLimiter:
+    """Allows ``burst`` events per key per ``window`` seconds and counts the rest"""
+
+    def __init__(self, burst: int, window: float):
+        self.burst = burst
+        self.window = window
+        self._state: Dict[Any, List[float]] = {}  # key -> [window_start, allowed, suppressed]
+
+    def allow(self, key: Any, now: float) -> Tuple[bool, int]:
+        """Return whether the event is allowed and, at a window rollover, how many were suppressed"""
+        state = self._state.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = int(state[2]) if state else 0
+            self._state[key] = [now, 1, 0]
+            return True, suppressed
+        if state[1] < self.burst:
+            state[1] += 1
+            return True, 0
+        state[2] += 1
+        return False, 0
+
 class ErrorHandler:
-    """Centralized error handling and logging"""
+    """Centralized error handling and logging.
 
-    def __init__(self, logger: Optional[logging.Logger] = None, debug: bool = False):
+    Under error storms the per-error cost stays flat: history is a bounded
+    deque, counts go to rolling time buckets, and log lines and stack-trace
+    capture are rate limited per category/severity. Once a category exceeds
+    its stack burst, only ``stack_sample_rate`` of its errors capture a trace.
+    Critical errors are always logged, and debug mode captures every trace.
+    """
+
+    # Windows reported by get_error_summary
+    SUMMARY_WINDOWS = {"1m": 60.0, "5m": 300.0, "1h": 3600.0}
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        debug: bool = False,
+        history_size: int = 100,
+        log_burst: int = 20,
+        log_window: float = 60.0,
+        stack_burst: int = 5,
+        stack_sample_rate: float = 0.01
+    ):
         self.logger = logger or logging.getLogger(__name__)
         self.debug = debug
-        self.error_history: List[ErrorContext] = []
+        self.error_history: Deque[ErrorContext] = deque(maxlen=history_size)
+        self.counters = RollingErrorCounter()
+        self.total_errors = 0
+        self.suppressed_logs = 0
+        self.stack_sample_rate = stack_sample_rate
+        self._log_limiter = _BurstLimiter(log_burst, log_window)
+        self._stack_limiter = _BurstLimiter(stack_burst, log_window)
 
     def handle_error(
         self,
@@ -232,28 +344,42 @@ class ErrorHandler:
                 details={"original_type": type(error).__name__}
             )
 
-        # Get error context
-        error_context = error.get_context()
+        now = time.time()
+
+        # Get error context, capturing the stack only within budget
+        error_context = error.get_context(capture_stack=self._should_capture_stack(error.category, now))
 
         # Add additional context
         if context:
             error_context.details.update(context)
 
-        # Log the error
-        self._log_error(error_context)
-
-        # Store in history (limited to last 100 errors)
+        # Count and store (history keeps the last history_size errors)
+        self.total_errors += 1
+        self.counters.record(error.category.value, error.severity.value, now)
         self.error_history.append(error_context)
-        if len(self.error_history) > 100:
-            self.error_history.pop(0)
 
-        # Debug mode: print detailed information
-        if self.debug:
-            self._debug_print(error_context)
+        # Log the error unless this category/severity is over its log budget
+        logged, suppressed = self._log_limiter.allow((error.category, error.severity), now)
+        if error.severity == ErrorSeverity.CRITICAL:
+            logged = True
+        if logged:
+            self._log_error(error_context, suppressed)
+
+            # Debug mode: print detailed information
+            if self.debug:
+                self._debug_print(error_context)
+        else:
+            self.suppressed_logs += 1
 
         return error_context
 
-    def _log_error(self, error_context: ErrorContext):
+    def _should_capture_stack(self, category: ErrorCategory, now: float) -> bool:
+        if self.debug:
+            return True
+        allowed, _ = self._stack_limiter.allow(category, now)
+        return allowed or random.random() < self.stack_sample_rate
+
+    def _log_error(self, error_context: ErrorContext, suppressed: int = 0):
         """Log error with appropriate level"""
         level_map = {
             ErrorSeverity.LOW: logging.INFO,
@@ -263,16 +389,20 @@ class ErrorHandler:
         }
 
         level = level_map[error_context.severity]
+        message = f"[{error_context.error_id}] {error_context.category.value.upper()}: {error_context.message}"
+        if suppressed:
+            message += f" ({suppressed} similar errors suppressed in the last window)"
 
         self.logger.log(
             level,
-            f"[{error_context.error_id}] {error_context.category.value.upper()}: {error_context.message}",
+            message,
             extra={
                 "error_id": error_context.error_id,
                 "category": error_context.category.value,
                 "severity": error_context.severity.value,
                 "details": error_context.details,
-                "suggestions": error_context.suggestions
+                "suggestions": error_context.suggestions,
+                "suppressed": suppressed
             }
         )
 
@@ -307,29 +437,28 @@ class ErrorHandler:
 
     def get_error_summary(self) -> Dict[str, Any]:
         """Get summary of recent errors"""
-        if not self.error_history:
+        if not self.total_errors:
             return {"total_errors": 0, "recent_errors": []}
 
-        categories = {}
-        severities = {}
-
-        for error in self.error_history[-10:]:  # Last 10 errors
-            cat = error.category.value
-            sev = error.severity.value
-
-            categories[cat] = categories.get(cat, 0) + 1
-            severities[sev] = severities.get(sev, 0) + 1
+        now = time.time()
+        windows = {name: self.counters.window(seconds, now) for name, seconds in self.SUMMARY_WINDOWS.items()}
+        recent = list(self.error_history)[-5:]
 
         return {
-            "total_errors": len(self.error_history),
-            "recent_errors": [e.to_dict() for e in self.error_history[-5:]],
-            "categories": categories,
-            "severities": severities
+            "total_errors": self.total_errors,
+            "recent_errors": [e.to_dict() for e in recent],
+            "categories": windows["5m"]["categories"],
+            "severities": windows["5m"]["severities"],
+            "windows": windows,
+            "suppressed_logs": self.suppressed_logs
         }
 
     def clear_history(self):
         """Clear error history"""
         self.error_history.clear()
+        self.counters = RollingErrorCounter()
+        self.total_errors = 0
+        self.suppressed_logs = 0
         self.logger.info("Error history cleared")
 
 # Global error handler instance
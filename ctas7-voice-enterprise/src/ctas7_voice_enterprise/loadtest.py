@@ -0,0 +1,183 @@
+"""
+CTAS-7 Enterprise Voice Load Generator
+Opens N client WebSockets against /ws and reports throughput, time-to-first-audio,
+latency percentiles and server memory
+"""
+
+import asyncio
+import json
+import time
+import uuid
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List
+import websockets
+
+@dataclass
+class LoadTestResult:
+    """Raw measurements from a load test run"""
+    connections: int
+    requests_sent: int = 0
+    requests_ok: int = 0
+    requests_failed: int = 0
+    audio_bytes: int = 0
+    wall_time: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    time_to_first_audio: List[float] = field(default_factory=list)
+    server_rss_bytes: List[int] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the run into reportable numbers"""
+        return {
+            "connections": self.connections,
+            "requests": self.requests_sent,
+            "succeeded": self.requests_ok,
+            "failed": self.requests_failed,
+            "wall_time_seconds": round(self.wall_time, 3),
+            "throughput_rps": round(self.requests_ok / self.wall_time, 2) if self.wall_time else 0.0,
+            "audio_mbps": round(self.audio_bytes * 8 / self.wall_time / 1e6, 3) if self.wall_time else 0.0,
+            "ttfa_ms": _distribution(self.time_to_first_audio),
+            "latency_ms": _distribution(self.latencies),
+            "server_rss_mb": {
+                "start": round(self.server_rss_bytes[0] / 1e6, 1) if self.server_rss_bytes else None,
+                "peak": round(max(self.server_rss_bytes) / 1e6, 1) if self.server_rss_bytes else None,
+                "end": round(self.server_rss_bytes[-1] / 1e6, 1) if self.server_rss_bytes else None
+            },
+            "errors": self.errors
+        }
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(values)
+    return {
+        "p50": round(_percentile(ordered, 50) * 1000, 1),
+        "p90": round(_percentile(ordered, 90) * 1000, 1),
+        "p99": round(_percentile(ordered, 99) * 1000, 1),
+        "max": round(ordered[-1] * 1000, 1)
+    }
+
+def _fetch_server_rss(health_url: str) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(health_url, timeout=5) as response:
+            health = json.loads(response.read())
+        return health.get("process", {}).get("rss_bytes")
+    except Exception:
+        return None
+
+async def _sample_memory(health_url: str, result: LoadTestResult, interval: float, stop: asyncio.Event):
+    while not stop.is_set():
+        rss = await asyncio.to_thread(_fetch_server_rss, health_url)
+        if rss:
+            result.server_rss_bytes.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+async def _receive_response(websocket, request_id: str) -> Dict[str, Any]:
+    """Read frames until the response to request_id is complete; returns timing marks"""
+    while True:
+        frame = await websocket.recv()
+        if isinstance(frame, bytes):
+            continue
+        message = json.loads(frame)
+        message_type = message.get("type")
+        content = message.get("content") or {}
+
+        if message_type == "synthesis_response":
+            first_audio_at = time.perf_counter()
+            if content.get("audio_encoding") == "binary":
+                audio_bytes = 0
+                for _ in range(content.get("audio_frames", 0)):
+                    audio_bytes += len(await websocket.recv())
+            else:
+                audio_bytes = len(content.get("audio_data", "")) * 3 // 4
+            return {"ok": True, "first_audio_at": first_audio_at, "audio_bytes": audio_bytes}
+
+        if message_type in ("synthesis_error", "error"):
+            if message_type == "error" and content.get("original_message_id") not in (None, request_id):
+                continue
+            return {"ok": False, "error": content.get("error", message_type)}
+
+async def _run_client(
+    url: str,
+    agent_id: str,
+    text: str,
+    requests: int,
+    streaming: bool,
+    result: LoadTestResult
+):
+    async with websockets.connect(url, max_size=None) as websocket:
+        await websocket.recv()  # connection_established
+
+        for _ in range(requests):
+            request_id = str(uuid.uuid4())
+            sent_at = time.perf_counter()
+            await websocket.send(json.dumps({
+                "type": "synthesis_request",
+                "message_id": request_id,
+                "agent_id": agent_id,
+                "content": {"text": text, "streaming": streaming}
+            }))
+            result.requests_sent += 1
+
+            response = await _receive_response(websocket, request_id)
+            done_at = time.perf_counter()
+
+            if response["ok"]:
+                result.requests_ok += 1
+                result.audio_bytes += response["audio_bytes"]
+                result.time_to_first_audio.append(response["first_audio_at"] - sent_at)
+                result.latencies.append(done_at - sent_at)
+            else:
+                result.requests_failed += 1
+                error = str(response["error"])[:80]
+                result.errors[error] = result.errors.get(error, 0) + 1
+
+async def run_load_test(
+    url: str = "ws://localhost:8765/ws",
+    connections: int = 10,
+    requests_per_connection: int = 10,
+    agent_id: str = "natasha",
+    text: str = "Tactical analysis complete. All systems nominal.",
+    streaming: bool = False,
+    protocol: str = "json",
+    audio_format: Optional[str] = None,
+    health_url: Optional[str] = None,
+    memory_interval: float = 1.0
+) -> LoadTestResult:
+    """Drive the voice server with concurrent WebSocket clients"""
+    result = LoadTestResult(connections=connections)
+    client_url = f"{url}?protocol={protocol}"
+    if audio_format:
+        client_url += f"&audio_format={audio_format}"
+
+    stop = asyncio.Event()
+    sampler = None
+    if health_url:
+        sampler = asyncio.create_task(_sample_memory(health_url, result, memory_interval, stop))
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *[_run_client(client_url, agent_id, text, requests_per_connection, streaming, result)
+          for _ in range(connections)],
+        return_exceptions=True
+    )
+    result.wall_time = time.perf_counter() - start
+
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            error = f"connection: {outcome}"[:80]
+            result.errors[error] = result.errors.get(error, 0) + 1
+
+    if sampler:
+        stop.set()
+        await sampler
+
+    return result
@@ -0,0 +1,102 @@
+"""
+CTAS-7 Enterprise Voice Mock TTS Server
+Local ElevenLabs stand-in for offline load testing (REST text-to-speech and stream-input WebSocket)
+"""
+
+import asyncio
+import json
+import base64
+import random
+from dataclasses import dataclass
+from typing import Optional
+import structlog
+import uvicorn
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# mp3_44100_128 produces 16 kB of audio per second; speech runs ~15 characters per second
+AUDIO_BYTES_PER_CHAR = 16_000 // 15
+
+@dataclass
+class MockTTSSettings:
+    """Behaviour of the mock TTS server"""
+    latency: float = 0.15  # Seconds before the first audio byte
+    jitter: float = 0.05  # Uniform +/- jitter applied to latency
+    chunk_size: int = 4096  # Audio bytes per chunk / stream-input message
+    chunk_interval: float = 0.01  # Seconds between chunks
+    error_rate: float = 0.0  # Fraction of requests that fail
+    seed: Optional[int] = None
+
+def _fake_audio(text: str) -> bytes:
+    """Deterministic placeholder audio sized like real mp3 output"""
+    size = max(AUDIO_BYTES_PER_CHAR * len(text.strip()), 1)
+    pattern = b"\xff\xfb\x90\x64" + bytes(range(60))
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+def create_mock_app(settings: MockTTSSettings) -> FastAPI:
+    """Create a FastAPI app speaking the subset of the ElevenLabs API used by VoiceAgent"""
+    app = FastAPI(title="CTAS-7 Mock TTS Server")
+    logger = structlog.get_logger("mock_tts")
+    rng = random.Random(settings.seed)
+
+    async def first_byte_delay():
+        delay = settings.latency + rng.uniform(-settings.jitter, settings.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+
+    def should_fail() -> bool:
+        return rng.random() < settings.error_rate
+
+    @app.post("/v1/text-to-speech/{voice_id}")
+    @app.post("/v1/text-to-speech/{voice_id}/stream")
+    async def text_to_speech(voice_id: str, body: dict):
+        if should_fail():
+            status = rng.choice([429, 500])
+            return JSONResponse(status_code=status, content={"detail": {"status": "mock_error", "message": f"Injected {status}"}})
+
+        audio = _fake_audio(body.get("text", ""))
+
+        async def stream():
+            await first_byte_delay()
+            for offset in range(0, len(audio), settings.chunk_size):
+                yield audio[offset:offset + settings.chunk_size]
+                await asyncio.sleep(settings.chunk_interval)
+
+        return StreamingResponse(stream(), media_type="audio/mpeg")
+
+    @app.websocket("/v1/text-to-speech/{voice_id}/stream-input")
+    async def stream_input(websocket: WebSocket, voice_id: str):
+        await websocket.accept()
+        try:
+            async for raw in websocket.iter_text():
+                text = json.loads(raw).get("text", "")
+                if text == "":
+                    # Empty text closes the stream, as with the real API
+                    await websocket.send_text(json.dumps({"isFinal": True}))
+                    break
+                if not text.strip():
+                    # Initial keep-alive message
+                    continue
+
+                if should_fail():
+                    await websocket.send_text(json.dumps({"error": "mock_error", "message": "Injected stream error"}))
+                    continue
+
+                await first_byte_delay()
+                audio = _fake_audio(text)
+                for offset in range(0, len(audio), settings.chunk_size):
+                    chunk = audio[offset:offset + settings.chunk_size]
+                    await websocket.send_text(json.dumps({
+                        "audio": base64.b64encode(chunk).decode("utf-8"),
+                        "isFinal": False
+                    }))
+                    await asyncio.sleep(settings.chunk_interval)
+                await websocket.send_text(json.dumps({"isFinal": True}))
+
+        except WebSocketDisconnect:
+            logger.debug("Mock stream-input client disconnected", voice_id=voice_id)
+
+    return app
+
+def run_mock_server(host: str = "127.0.0.1", port: int = 8900, settings: Optional[MockTTSSettings] = None):
+    """Run the mock TTS server (blocking)"""
+    uvicorn.run(create_mock_app(settings or MockTTSSettings()), host=host, port=port, log_level="warning")
@@ -0,0 +1,72 @@
+"""
+CTAS-7 Enterprise Voice Persona Text Transforms
+Per-persona text rewrites built once per agent with a cache of enhanced output
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+# Natasha: strategic emphasis for key terms
+NATASHA_STRATEGIC_TERMS = {
+    "mission": "mission objective",
+    "target": "designated target",
+    "enemy": "hostile forces",
+    "plan": "tactical plan",
+    "status": "operational status"
+}
+
+# Marcus: technical precision for key terms
+MARCUS_TECHNICAL_TERMS = {
+    "error": "system error",
+    "problem": "technical issue",
+    "fix": "resolution",
+    "data": "dataset",
+    "analysis": "comprehensive analysis"
+}
+
+# Enhanced texts remembered per agent; report phrasing repeats heavily
+ENHANCED_TEXT_CACHE_SIZE = 1024
+
+class PersonaTextTransform:
+    """A persona's text rewrite rules, prepared once per agent.
+
+    Term rewrites are held as a tuple of (term, replacement) pairs applied with
+    C-level substring checks; the former per-request ``text.lower()`` calls and
+    dict construction are gone. Pauses are inserted after ``pause_after`` when
+    the rewritten text is longer than ``pause_min_length``. Results are cached
+    by input text.
+    """
+
+    def __init__(
+        self,
+        terms: Dict[str, str],
+        pause_after: str,
+        pause_min_length: int,
+        cache_size: int = ENHANCED_TEXT_CACHE_SIZE
+    ):
+        self.rules: Tuple[Tuple[str, str], ...] = tuple(terms.items())
+        self.pause_after = pause_after
+        self.pause_with = pause_after + "... "
+        self.pause_min_length = pause_min_length
+        self.apply = lru_cache(maxsize=cache_size)(self._apply)
+
+    def _apply(self, text: str) -> str:
+        enhanced = text
+        for term, replacement in self.rules:
+            if term in enhanced:
+                enhanced = enhanced.replace(term, replacement)
+        if len(enhanced) > self.pause_min_length and self.pause_after in enhanced:
+            enhanced = enhanced.replace(self.pause_after, self.pause_with)
+        return enhanced
+
+    def cache_info(self) -> Dict[str, Any]:
+        info = self.apply.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+def natasha_transform(cache_size: int = ENHANCED_TEXT_CACHE_SIZE) -> PersonaTextTransform:
+    """Natasha's measured delivery: strategic terms, pauses between sentences"""
+    return PersonaTextTransform(NATASHA_STRATEGIC_TERMS, ". ", 50, cache_size)
+
+def marcus_transform(cache_size: int = ENHANCED_TEXT_CACHE_SIZE) -> PersonaTextTransform:
+    """Marcus's methodical delivery: technical terms, pauses between clauses"""
+    return PersonaTextTransform(MARCUS_TECHNICAL_TERMS, ", ", 40, cache_size)
@@ -0,0 +1,100 @@
+"""
+CTAS-7 Enterprise Voice Wire Protocol
+Frame encoding for the /ws endpoint with legacy JSON/base64 and negotiated binary audio modes,
+plus negotiation of the audio output format
+"""
+
+import json
+import base64
+from typing import Dict, Any, Optional, List, Union
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+SUPPORTED_PROTOCOLS = (PROTOCOL_JSON, PROTOCOL_BINARY)
+
+# Raw audio is split into binary frames of at most this many bytes
+AUDIO_FRAME_SIZE = 32 * 1024
+
+Frame = Union[str, bytes]
+
+# ElevenLabs output formats a client may negotiate, with their approximate bitrate in kbps
+AUDIO_FORMATS: Dict[str, int] = {
+    "mp3_44100_128": 128,
+    "mp3_22050_32": 32,
+    "opus_48000_64": 64,
+    "opus_48000_32": 32,
+    "pcm_16000": 256,
+    "pcm_22050": 353,
+    "pcm_44100": 706,
+}
+DEFAULT_AUDIO_FORMAT = "mp3_44100_128"
+
+def negotiate_protocol(requested: Optional[str]) -> str:
+    """Return the protocol to use for a client request, falling back to JSON"""
+    if requested and requested.lower() in SUPPORTED_PROTOCOLS:
+        return requested.lower()
+    return PROTOCOL_JSON
+
+def negotiate_audio_formats(
+    requested: Optional[Union[str, List[str]]],
+    default: Optional[str] = DEFAULT_AUDIO_FORMAT
+) -> List[str]:
+    """Return the supported formats from a client's preference list (comma separated or a list).
+
+    Unknown formats are dropped; order is kept, the first entry being the
+    client's preferred format. Falls back to ``[default]`` (or an empty list
+    without a default) when nothing requested is supported.
+    """
+    if isinstance(requested, str):
+        requested = requested.split(",")
+    accepted: List[str] = []
+    for audio_format in requested or []:
+        audio_format = str(audio_format).strip().lower()
+        if audio_format in AUDIO_FORMATS and audio_format not in accepted:
+            accepted.append(audio_format)
+    if not accepted and default:
+        accepted.append(default)
+    return accepted
+
+def select_audio_format(accepted: List[str], queue_ratio: float = 0.0, degrade_ratio: float = 0.5) -> str:
+    """Pick the format for one response.
+
+    Uses the client's preferred format unless the outbound queue is at least
+    ``degrade_ratio`` full, in which case the lowest-bitrate accepted format is
+    used so the backlog drains faster.
+    """
+    if degrade_ratio > 0 and queue_ratio >= degrade_ratio:
+        return min(accepted, key=AUDIO_FORMATS.__getitem__)
+    return accepted[0]
+
+def encode_message(
+    message_dict: Dict[str, Any],
+    audio: Optional[bytes] = None,
+    protocol: str = PROTOCOL_JSON,
+    frame_size: int = AUDIO_FRAME_SIZE
+) -> List[Frame]:
+    """Encode a message into WebSocket frames.
+
+    JSON mode embeds audio as base64 in ``content.audio_data``. Binary mode sends
+    a JSON header frame describing the audio, followed by raw audio frames.
+    """
+    if audio is None:
+        return [json.dumps(message_dict)]
+
+    content = dict(message_dict.get("content") or {})
+
+    if protocol == PROTOCOL_BINARY:
+        frame_count = (len(audio) + frame_size - 1) // frame_size
+        content.update({
+            "audio_encoding": "binary",
+            "audio_size": len(audio),
+            "audio_frames": frame_count
+        })
+        header = dict(message_dict, content=content)
+        view = memoryview(audio)
+        frames: List[Frame] = [json.dumps(header)]
+        frames.extend(bytes(view[i:i + frame_size]) for i in range(0, len(audio), frame_size))
+        return frames
+
+    content["audio_data"] = base64.b64encode(audio).decode('utf-8')
+    return [json.dumps(dict(message_dict, content=content))]
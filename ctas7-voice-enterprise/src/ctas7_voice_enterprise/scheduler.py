@@ -0,0 +1,328 @@
+"""
+CTAS-7 Enterprise Voice Scheduler
+Priority scheduling, deadlines and request coalescing in front of the VoiceOrchestrator
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Any, Optional, List, Deque
+import structlog
+from prometheus_client import Counter, Histogram, Gauge
+
+from .config import SchedulerConfig
+from .core import VoiceOrchestrator, VoiceResponse
+from .protocol import DEFAULT_AUDIO_FORMAT
+from .telemetry import SynthesisTrace, current_trace
+
+# Prometheus metrics
+scheduler_queue_depth = Gauge('ctas7_voice_scheduler_queue_depth', 'Queued synthesis requests', ['priority'])
+scheduler_running = Gauge('ctas7_voice_scheduler_running', 'Synthesis requests currently running')
+scheduler_dropped_total = Counter('ctas7_voice_scheduler_dropped_total', 'Synthesis requests dropped by the scheduler', ['priority', 'reason'])
+scheduler_coalesced_total = Counter('ctas7_voice_scheduler_coalesced_total', 'Synthesis requests merged into a queued request', ['priority'])
+scheduler_queue_wait = Histogram('ctas7_voice_scheduler_queue_wait_seconds', 'Time spent queued before synthesis', ['priority'])
+
+class SynthesisPriority(Enum):
+    """Synthesis priority classes, most urgent first"""
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+    @classmethod
+    def parse(cls, value: Any) -> "SynthesisPriority":
+        """Parse a priority name, defaulting to MEDIUM"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(str(value).lower())
+        except ValueError:
+            return cls.MEDIUM
+
+# Dispatch order; shedding walks it in reverse
+PRIORITY_ORDER = [SynthesisPriority.CRITICAL, SynthesisPriority.HIGH, SynthesisPriority.MEDIUM, SynthesisPriority.LOW]
+PRIORITY_NAMES = [priority.value for priority in PRIORITY_ORDER]
+
+@dataclass
+class ScheduledRequest:
+    """A queued synthesis request and the callers waiting on it"""
+    agent_id: str
+    text: str
+    streaming: bool
+    priority: SynthesisPriority
+    deadline: float
+    enqueued_at: float
+    coalesce_key: Optional[str] = None
+    requester: Optional[str] = None
+    output_format: str = DEFAULT_AUDIO_FORMAT
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    traces: List[SynthesisTrace] = field(default_factory=list)
+    coalesced: int = 0
+
+class VoiceScheduler:
+    """Priority scheduler with deadlines, per-agent limits and coalescing"""
+
+    def __init__(self, orchestrator: VoiceOrchestrator, config: SchedulerConfig, max_concurrency: int):
+        self.orchestrator = orchestrator
+        self.config = config
+        self.max_concurrency = max_concurrency
+        self.logger = structlog.get_logger("voice_scheduler")
+
+        self._queues: Dict[SynthesisPriority, Deque[ScheduledRequest]] = {p: deque() for p in PRIORITY_ORDER}
+        self._coalesce_index: Dict[tuple, ScheduledRequest] = {}
+        self._agent_running: Dict[str, int] = {}
+        self._running = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+
+    def start(self):
+        """Start the dispatcher task"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._condition = self._condition or asyncio.Condition()
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+            self.logger.info("Voice scheduler started",
+                           max_concurrency=self.max_concurrency,
+                           per_agent_concurrency=self.config.per_agent_concurrency)
+
+    async def stop(self):
+        """Stop dispatching and fail any queued requests"""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for task in list(self._tasks):
+            task.cancel()
+        for priority in PRIORITY_ORDER:
+            while self._queues[priority]:
+                request = self._queues[priority].popleft()
+                self._unindex(request)
+                scheduler_queue_depth.labels(priority=priority.value).dec()
+                self._fail(request, "shutdown")
+
+    async def submit(
+        self,
+        agent_id: str,
+        text: str,
+        streaming: bool = False,
+        priority: Any = SynthesisPriority.MEDIUM,
+        deadline: Optional[float] = None,
+        coalesce_key: Optional[str] = None,
+        trace: Optional[SynthesisTrace] = None,
+        output_format: str = DEFAULT_AUDIO_FORMAT,
+        requester: Optional[str] = None
+    ) -> VoiceResponse:
+        """Queue a synthesis request and wait for its response.
+
+        ``deadline`` is the maximum queue wait in seconds (defaults per priority).
+        Requests from the same ``requester`` sharing ``coalesce_key`` for the
+        same agent and output format replace a queued, not-yet-started request;
+        all of that requester's callers receive the newest synthesis. Keys are
+        client-supplied, so requests without a ``requester`` are never coalesced.
+        """
+        self.start()
+        priority = SynthesisPriority.parse(priority)
+        now = time.monotonic()
+        if deadline is None:
+            deadline = self.config.deadlines.get(priority.value, 10.0)
+
+        future = asyncio.get_running_loop().create_future()
+
+        async with self._condition:
+            if requester is None:
+                coalesce_key = None
+            key = self._coalesce_key(requester, agent_id, output_format, coalesce_key)
+            queued = self._coalesce_index.get(key) if key else None
+
+            if queued is not None:
+                # Superseded update: keep the queue slot, take the newest text and deadline
+                queued.text = text
+                queued.streaming = streaming
+                queued.deadline = now + deadline
+                queued.coalesced += 1
+                queued.waiters.append(future)
+                if trace:
+                    queued.traces.append(trace)
+                scheduler_coalesced_total.labels(priority=queued.priority.value).inc()
+            elif not self._make_room(priority):
+                scheduler_dropped_total.labels(priority=priority.value, reason="queue_full").inc()
+                return self._dropped_response(agent_id, text, "queue_full")
+            else:
+                request = ScheduledRequest(
+                    agent_id=agent_id,
+                    text=text,
+                    streaming=streaming,
+                    priority=priority,
+                    deadline=now + deadline,
+                    enqueued_at=now,
+                    coalesce_key=coalesce_key,
+                    requester=requester,
+                    output_format=output_format,
+                    waiters=[future],
+                    traces=[trace] if trace else []
+                )
+                self._queues[priority].append(request)
+                if key:
+                    self._coalesce_index[key] = request
+                scheduler_queue_depth.labels(priority=priority.value).inc()
+
+            self._condition.notify_all()
+
+        return await future
+
+    def _queued_count(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _make_room(self, priority: SynthesisPriority) -> bool:
+        """Shed the oldest lower-priority request when the queue is full"""
+        if self._queued_count() < self.config.max_queue_size:
+            return True
+
+        incoming_rank = PRIORITY_ORDER.index(priority)
+        for victim_priority in reversed(PRIORITY_ORDER[incoming_rank + 1:]):
+            queue = self._queues[victim_priority]
+            if queue:
+                victim = queue.popleft()
+                self._unindex(victim)
+                scheduler_queue_depth.labels(priority=victim_priority.value).dec()
+                scheduler_dropped_total.labels(priority=victim_priority.value, reason="shed").inc()
+                self._fail(victim, "shed")
+                return True
+
+        # Critical requests are always admitted, even past the queue bound
+        return priority is SynthesisPriority.CRITICAL
+
+    def _can_run(self, request: ScheduledRequest) -> bool:
+        """Check global and per-agent capacity; critical requests may use the reserve"""
+        reserve = self.config.critical_reserve if request.priority is SynthesisPriority.CRITICAL else 0
+        agent_running = self._agent_running.get(request.agent_id, 0)
+        return (self._running < self.max_concurrency + reserve and
+                agent_running < self.config.per_agent_concurrency + reserve)
+
+    def _pop_runnable(self) -> Optional[ScheduledRequest]:
+        """Pop the most urgent request whose agent has capacity"""
+        now = time.monotonic()
+        for priority in PRIORITY_ORDER:
+            queue = self._queues[priority]
+            for request in list(queue):
+                if all(waiter.done() for waiter in request.waiters):
+                    # Every caller went away (e.g. client disconnected)
+                    queue.remove(request)
+                    self._unindex(request)
+                    scheduler_queue_depth.labels(priority=priority.value).dec()
+                    scheduler_dropped_total.labels(priority=priority.value, reason="abandoned").inc()
+                    continue
+                if request.deadline < now:
+                    queue.remove(request)
+                    self._unindex(request)
+                    scheduler_queue_depth.labels(priority=priority.value).dec()
+                    scheduler_dropped_total.labels(priority=priority.value, reason="deadline").inc()
+                    self._fail(request, "deadline_exceeded")
+                    continue
+                if self._can_run(request):
+                    queue.remove(request)
+                    self._unindex(request)
+                    scheduler_queue_depth.labels(priority=priority.value).dec()
+                    return request
+        return None
+
+    @staticmethod
+    def _coalesce_key(requester: Optional[str], agent_id: str, output_format: str,
+                      coalesce_key: Optional[str]) -> Optional[tuple]:
+        """Index key for coalescing; scoped to one requester so clients never share a slot"""
+        if requester is None or not coalesce_key:
+            return None
+        return (requester, agent_id, output_format, coalesce_key)
+
+    def _unindex(self, request: ScheduledRequest):
+        key = self._coalesce_key(request.requester, request.agent_id, request.output_format, request.coalesce_key)
+        if key:
+            if self._coalesce_index.get(key) is request:
+                del self._coalesce_index[key]
+
+    async def _dispatch_loop(self):
+        """Start queued requests as capacity frees up"""
+        while True:
+            async with self._condition:
+                request = self._pop_runnable()
+                while request is None:
+                    # Wake periodically so expired requests are failed promptly
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    request = self._pop_runnable()
+
+                self._running += 1
+                self._agent_running[request.agent_id] = self._agent_running.get(request.agent_id, 0) + 1
+                scheduler_running.inc()
+
+            task = asyncio.create_task(self._execute(request))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, request: ScheduledRequest):
+        """Run one synthesis and resolve all its waiters"""
+        queue_wait = time.monotonic() - request.enqueued_at
+        scheduler_queue_wait.labels(priority=request.priority.value).observe(queue_wait)
+        for trace in request.traces:
+            trace.record("queue", queue_wait)
+            trace.attributes["priority"] = request.priority.value
+
+        # Agent and orchestrator stages are recorded on the primary caller's trace
+        current_trace.set(request.traces[0] if request.traces else None)
+        try:
+            response = await self.orchestrator.synthesize_speech(
+                request.agent_id, request.text, request.streaming, output_format=request.output_format
+            )
+            if response.metadata is not None:
+                response.metadata["priority"] = request.priority.value
+                response.metadata["coalesced"] = request.coalesced
+            for waiter in request.waiters:
+                if not waiter.done():
+                    waiter.set_result(response)
+        except Exception as e:
+            for waiter in request.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        finally:
+            async with self._condition:
+                self._running -= 1
+                self._agent_running[request.agent_id] -= 1
+                if not self._agent_running[request.agent_id]:
+                    del self._agent_running[request.agent_id]
+                scheduler_running.dec()
+                self._condition.notify_all()
+
+    def _fail(self, request: ScheduledRequest, reason: str):
+        """Resolve a request's waiters with a dropped response"""
+        self.logger.warning("Synthesis request dropped",
+                          agent_id=request.agent_id,
+                          priority=request.priority.value,
+                          reason=reason)
+        response = self._dropped_response(request.agent_id, request.text, reason)
+        for waiter in request.waiters:
+            if not waiter.done():
+                waiter.set_result(response)
+
+    @staticmethod
+    def _dropped_response(agent_id: str, text: str, reason: str) -> VoiceResponse:
+        return VoiceResponse(
+            agent_name=agent_id,
+            text=text,
+            audio_data=b"",
+            duration=0.0,
+            success=False,
+            error=f"Synthesis request dropped: {reason}",
+            metadata={"agent_id": agent_id, "dropped": reason}
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler queue statistics"""
+        return {
+            "queued": {p.value: len(self._queues[p]) for p in PRIORITY_ORDER},
+            "running": self._running,
+            "running_by_agent": dict(self._agent_running),
+            "max_concurrency": self.max_concurrency
+        }
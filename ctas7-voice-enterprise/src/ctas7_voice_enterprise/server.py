@@ -3,13 +3,16 @@ CTAS-7 Enterprise Voice WebSocket Server
 Real-time bidirectional voice communication server with conversation management
 """
 
+import os
+import sys
+import socket
 import asyncio
 import json
 import time
 import uuid
 import base64
-from typing import Dict, Any, Optional, Set, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Set, Callable, List
+from dataclasses import dataclass, asdict, field
 import websockets
 from websockets.server import WebSocketServerProtocol
 import structlog
@@ -22,6 +25,15 @@ from prometheus_client import Counter, Histogram, Gauge, start_http_server
 from .config import VoiceConfig
 from .core import VoiceOrchestrator, VoiceResponse
 from .agents import VoiceAgentFactory, ConversationContext
+from .protocol import (
+    SUPPORTED_PROTOCOLS, PROTOCOL_JSON, AUDIO_FORMATS, DEFAULT_AUDIO_FORMAT,
+    negotiate_protocol, negotiate_audio_formats, select_audio_format, encode_message
+)
+from .scheduler import VoiceScheduler, PRIORITY_NAMES
+from .telemetry import SynthesisTrace, TraceLogger
+from .sessions import SessionStore
+from .shared_store import create_shared_store
+from .stt import SpeechToTextService, SpeechStream, SpeechEvent, stt_partials_skipped_total
 from .errors import (
     ErrorHandler, WebSocketError, VoiceAgentError,
     handle_error, ErrorSeverity, ErrorCategory, initialize_error_handler
@@ -32,6 +44,25 @@ voice_requests_total = Counter('ctas7_voice_requests_total', 'Total voice synthe
 voice_request_duration = Histogram('ctas7_voice_request_duration_seconds', 'Voice synthesis duration')
 active_connections = Gauge('ctas7_voice_active_connections', 'Active WebSocket connections')
 conversation_sessions = Gauge('ctas7_voice_conversation_sessions', 'Active conversation sessions')
+send_queue_depth = Gauge('ctas7_voice_send_queue_depth', 'Outbound messages queued across all connections')
+synthesis_in_flight = Gauge('ctas7_voice_synthesis_in_flight', 'Synthesis requests currently being processed')
+messages_dropped_total = Counter('ctas7_voice_messages_dropped_total', 'Outbound messages dropped for slow clients')
+requests_rejected_total = Counter('ctas7_voice_requests_rejected_total', 'Requests rejected before reaching the scheduler (max_connections, connection_busy, stt_connection_busy)', ['reason'])
+audio_format_downgrades_total = Counter('ctas7_voice_audio_format_downgrades_total', 'Responses sent in a lighter audio format due to send queue backlog', ['format'])
+
+def _process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            # Peak RSS; kilobytes on Linux, bytes on macOS
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == "darwin" else peak * 1024
+        except ImportError:
+            return None
 
 @dataclass
 class ConnectionInfo:
@@ -43,6 +74,14 @@ class ConnectionInfo:
     connect_time: float
     last_activity: float
     user_info: Dict[str, Any]
+    protocol: str = PROTOCOL_JSON
+    audio_formats: List[str] = field(default_factory=lambda: [DEFAULT_AUDIO_FORMAT])  # Client preference order
+    send_queue: Optional[asyncio.Queue] = None
+    writer_task: Optional[asyncio.Task] = None
+    synthesis_in_flight: int = 0
+    speech: Optional[SpeechStream] = None  # Created on the first audio_chunk
+    finals_pending: int = 0  # Final transcripts running or queued on the STT pool
+    pending_tasks: Set[asyncio.Task] = field(default_factory=set)
 
 @dataclass
 class VoiceMessage:
@@ -54,22 +93,53 @@ class VoiceMessage:
     content: Any
     timestamp: float
     metadata: Dict[str, Any]
+    audio: Optional[bytes] = None  # Raw audio, encoded per connection protocol on send
+    trace: Optional[SynthesisTrace] = None  # Finished by the writer once the message is sent
 
 class VoiceServer:
     """Main voice communication server"""
 
-    def __init__(self, config: VoiceConfig):
+    def __init__(self, config: VoiceConfig, worker_id: int = 0):
         self.config = config
-        self.logger = structlog.get_logger("voice_server")
+        self.worker_id = worker_id
+        self.logger = structlog.get_logger("voice_server", worker_id=worker_id)
         self.error_handler = initialize_error_handler(self.logger.logger, config.debug)
 
+        # Session and audio state visible to every worker process (None when single-process)
+        self.shared_store = create_shared_store(config.server)
+
         # Core components
-        self.orchestrator = VoiceOrchestrator(config)
+        self.orchestrator = VoiceOrchestrator(config, shared_store=self.shared_store)
 
         # Connection management
         self.connections: Dict[str, ConnectionInfo] = {}
         self.agent_connections: Dict[str, Set[str]] = {}  # agent_id -> connection_ids
-        self.conversation_sessions: Dict[str, ConversationContext] = {}
+        self.conversation_sessions = SessionStore(
+            max_sessions=config.server.max_sessions,
+            ttl=config.server.session_ttl,
+            archive_path=config.server.session_archive_path,
+            shared=self.shared_store,
+            owner=str(worker_id)
+        )
+        self._reaper_task: Optional[asyncio.Task] = None
+
+        # Readiness: set once startup prewarm has finished
+        self.ready = asyncio.Event()
+        self.prewarm_status: Optional[Dict[str, Any]] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+        # Streaming speech-to-text for audio_chunk messages
+        self.stt = SpeechToTextService(config.stt) if config.stt.enabled else None
+
+        # Stage timings and sampled trace log
+        self.trace_logger = TraceLogger(config.trace_sample_rate, config.trace_log_file)
+
+        # Priority scheduling and admission control for synthesis across all connections
+        self.scheduler = VoiceScheduler(
+            self.orchestrator,
+            config.scheduler,
+            max_concurrency=config.server.max_concurrent_synthesis
+        )
 
         # FastAPI app
         self.app = self._create_fastapi_app()
@@ -81,6 +151,8 @@ class VoiceServer:
             "conversation_end": self._handle_conversation_end,
             "agent_switch": self._handle_agent_switch,
             "ping": self._handle_ping,
+            "protocol_select": self._handle_protocol_select,
+            "audio_format_select": self._handle_audio_format_select,
             "audio_chunk": self._handle_audio_chunk
         }
 
@@ -121,14 +193,31 @@ class VoiceServer:
                 health = await self.orchestrator.health_check()
                 health["connections"] = {
                     "active": len(self.connections),
-                    "by_agent": {agent: len(conns) for agent, conns in self.agent_connections.items()}
+                    "max": self.config.server.max_connections,
+                    "by_agent": {agent: len(conns) for agent, conns in self.agent_connections.items()},
+                    "queued_messages": sum(
+                        conn.send_queue.qsize() for conn in self.connections.values() if conn.send_queue
+                    ),
+                    "synthesis_in_flight": sum(conn.synthesis_in_flight for conn in self.connections.values())
                 }
-                health["conversations"] = len(self.conversation_sessions)
+                health["conversations"] = self.conversation_sessions.get_stats()
+                health["scheduler"] = self.scheduler.get_stats()
+                health["process"] = {"rss_bytes": _process_rss_bytes()}
+                health["ready"] = self.ready.is_set()
+                health["worker"] = {"id": self.worker_id, "workers": self.config.server.workers}
+                health["shared_store"] = self.shared_store.get_stats() if self.shared_store else None
+                health["stt"] = self.stt.get_stats() if self.stt else None
                 return health
             except Exception as e:
                 self.error_handler.handle_error(e)
                 raise HTTPException(status_code=500, detail="Health check failed")
 
+        @app.get("/ready")
+        async def readiness_check():
+            """Readiness endpoint; 503 until upstream connections and the audio cache are warm"""
+            body = {"ready": self.ready.is_set(), "prewarm": self.prewarm_status}
+            return JSONResponse(status_code=200 if self.ready.is_set() else 503, content=body)
+
         @app.get("/agents")
         async def get_agents():
             """Get available voice agents"""
@@ -152,29 +241,55 @@ class VoiceServer:
                 agent_id = request.get("agent_id", "natasha")
                 text = request.get("text", "")
                 streaming = request.get("streaming", False)
+                output_format = request.get("audio_format", DEFAULT_AUDIO_FORMAT)
+                priority = request.get("priority", "medium")
 
                 if not text:
                     raise HTTPException(status_code=400, detail="Text is required")
+                if output_format not in AUDIO_FORMATS:
+                    raise HTTPException(status_code=400,
+                                        detail=f"Unsupported audio format. Supported: {list(AUDIO_FORMATS)}")
+                if str(priority).lower() not in PRIORITY_NAMES:
+                    raise HTTPException(status_code=400,
+                                        detail=f"Unsupported priority. Supported: {PRIORITY_NAMES}")
 
-                with voice_request_duration.time():
-                    response = await self.orchestrator.synthesize_speech(agent_id, text, streaming)
+                trace = self.trace_logger.start_trace(agent_id, "streaming" if streaming else "standard")
 
-                voice_requests_total.labels(agent=agent_id, streaming=streaming).inc()
+                try:
+                    with voice_request_duration.time():
+                        response = await self.scheduler.submit(
+                            agent_id, text, streaming,
+                            priority=priority,
+                            deadline=request.get("deadline"),
+                            trace=trace,
+                            output_format=output_format
+                        )
 
-                if response.success:
-                    # Return base64 encoded audio
-                    audio_b64 = base64.b64encode(response.audio_data).decode('utf-8')
-                    return {
-                        "success": True,
-                        "agent_name": response.agent_name,
-                        "text": response.text,
-                        "audio_data": audio_b64,
-                        "duration": response.duration,
-                        "metadata": response.metadata
-                    }
-                else:
+                    voice_requests_total.labels(agent=agent_id, streaming=streaming).inc()
+
+                    if response.success:
+                        # Return base64 encoded audio
+                        with trace.stage("encode"):
+                            audio_b64 = base64.b64encode(response.audio_data).decode('utf-8')
+                        trace.finish(transport="rest", audio_bytes=len(response.audio_data))
+                        return {
+                            "success": True,
+                            "agent_name": response.agent_name,
+                            "text": response.text,
+                            "audio_data": audio_b64,
+                            "audio_format": output_format,
+                            "duration": response.duration,
+                            "metadata": response.metadata
+                        }
+                    if (response.metadata or {}).get("dropped"):
+                        raise HTTPException(status_code=503, detail=response.error)
                     raise HTTPException(status_code=500, detail=response.error)
+                finally:
+                    # No-op after a successful finish; covers scheduler and encode errors
+                    trace.finish(transport="rest", success=False)
 
+            except HTTPException:
+                raise
             except Exception as e:
                 self.error_handler.handle_error(e)
                 raise HTTPException(status_code=500, detail=str(e))
@@ -188,6 +303,14 @@ class VoiceServer:
         """Handle new WebSocket connection"""
         connection_id = str(uuid.uuid4())
 
+        # Refuse new clients once the connection limit is reached
+        if len(self.connections) >= self.config.server.max_connections:
+            requests_rejected_total.labels(reason="max_connections").inc()
+            self.logger.warning("Connection limit reached, refusing client",
+                              max_connections=self.config.server.max_connections)
+            await websocket.close(code=1013)
+            return
+
         try:
             # Accept connection
             await websocket.accept()
@@ -200,8 +323,12 @@ class VoiceServer:
                 session_id=None,
                 connect_time=time.time(),
                 last_activity=time.time(),
-                user_info={}
+                user_info={},
+                protocol=negotiate_protocol(websocket.query_params.get("protocol")),
+                audio_formats=negotiate_audio_formats(websocket.query_params.get("audio_format")),
+                send_queue=asyncio.Queue(maxsize=self.config.server.send_queue_size)
             )
+            connection_info.writer_task = asyncio.create_task(self._connection_writer(connection_info))
 
             # Store connection
             self.connections[connection_id] = connection_info
@@ -212,7 +339,11 @@ class VoiceServer:
                            total_connections=len(self.connections))
 
             # Send welcome message
-            await self._send_message(websocket, VoiceMessage(
+            stt_ready = self.stt is not None and self.stt.available
+            capabilities = ["synthesis", "streaming", "conversations", "binary_audio"]
+            if stt_ready:
+                capabilities.append("speech_to_text")
+            await self._send_message(connection_id, VoiceMessage(
                 message_id=str(uuid.uuid4()),
                 message_type="connection_established",
                 session_id=None,
@@ -220,11 +351,17 @@ class VoiceServer:
                 content={
                     "connection_id": connection_id,
                     "available_agents": list((await self.orchestrator.get_available_agents()).keys()),
+                    "protocol": connection_info.protocol,
+                    "supported_protocols": list(SUPPORTED_PROTOCOLS),
+                    "audio_format": connection_info.audio_formats[0],
+                    "audio_formats": connection_info.audio_formats,
+                    "supported_audio_formats": list(AUDIO_FORMATS),
                     "server_info": {
                         "name": "CTAS-7 Enterprise Voice Server",
                         "version": "1.0.0",
-                        "capabilities": ["synthesis", "streaming", "conversations"]
-                    }
+                        "capabilities": capabilities
+                    },
+                    "stt": {"sample_rate": self.config.stt.sample_rate, "encoding": "pcm_s16le"} if stt_ready else None
                 },
                 timestamp=time.time(),
                 metadata={}
@@ -236,7 +373,7 @@ class VoiceServer:
                     await self._process_websocket_message(connection_id, raw_message)
                 except Exception as e:
                     self.error_handler.handle_error(e, {"connection_id": connection_id})
-                    await self._send_error_message(websocket, str(e))
+                    await self._send_error_message(connection_id, str(e))
 
         except WebSocketDisconnect:
             self.logger.info("WebSocket disconnected", connection_id=connection_id)
@@ -280,7 +417,10 @@ class VoiceServer:
                             message_id=message.message_id)
 
             # Route to appropriate handler
-            if message_type in self.message_handlers:
+            if message_type == "synthesis_request":
+                # Synthesis runs off the read loop so pings and control messages keep flowing
+                await self._dispatch_synthesis(connection_id, message)
+            elif message_type in self.message_handlers:
                 await self.message_handlers[message_type](connection_id, message)
             else:
                 raise ValueError(f"Unknown message type: {message_type}")
@@ -310,19 +450,25 @@ class VoiceServer:
                            text_length=len(text),
                            streaming=streaming)
 
-            # Synthesize speech
+            output_format = self._select_output_format(connection_id, content.get("audio_format"))
+
+            # Synthesize speech through the priority scheduler
+            trace = self.trace_logger.start_trace(agent_id, "streaming" if streaming else "standard")
             with voice_request_duration.time():
-                response = await self.orchestrator.synthesize_speech(agent_id, text, streaming)
+                response = await self.scheduler.submit(
+                    agent_id, text, streaming,
+                    priority=content.get("priority", "medium"),
+                    deadline=content.get("deadline"),
+                    coalesce_key=content.get("coalesce_key"),
+                    trace=trace,
+                    output_format=output_format,
+                    requester=connection_id
+                )
 
             voice_requests_total.labels(agent=agent_id, streaming=streaming).inc()
 
-            # Send response
-            websocket = self.connections[connection_id].websocket
-
             if response.success:
-                # Send audio response
-                audio_b64 = base64.b64encode(response.audio_data).decode('utf-8')
-
+                # Send audio response; audio is encoded by the writer per connection protocol
                 response_message = VoiceMessage(
                     message_id=str(uuid.uuid4()),
                     message_type="synthesis_response",
@@ -331,12 +477,14 @@ class VoiceServer:
                     content={
                         "success": True,
                         "text": response.text,
-                        "audio_data": audio_b64,
                         "duration": response.duration,
-                        "agent_name": response.agent_name
+                        "agent_name": response.agent_name,
+                        "audio_format": output_format
                     },
                     timestamp=time.time(),
-                    metadata=response.metadata or {}
+                    metadata=response.metadata or {},
+                    audio=response.audio_data,
+                    trace=trace
                 )
             else:
                 # Send error response
@@ -351,15 +499,15 @@ class VoiceServer:
                         "text": response.text
                     },
                     timestamp=time.time(),
-                    metadata={}
+                    metadata={},
+                    trace=trace
                 )
 
-            await self._send_message(websocket, response_message)
+            await self._send_message(connection_id, response_message)
 
         except Exception as e:
             self.error_handler.handle_error(e, {"connection_id": connection_id, "message_id": message.message_id})
-            websocket = self.connections[connection_id].websocket
-            await self._send_error_message(websocket, str(e), message.message_id)
+            await self._send_error_message(connection_id, str(e), message.message_id)
 
     async def _handle_conversation_start(self, connection_id: str, message: VoiceMessage):
         """Handle conversation session start"""
@@ -369,8 +517,11 @@ class VoiceServer:
             session_id = message.session_id or str(uuid.uuid4())
             user_preferences = content.get("user_preferences", {})
 
+            # Resume a known session (adopting it from another worker if needed)
+            resumed = message.session_id is not None and self.conversation_sessions.get(session_id) is not None
+
             # Create specialized agent if needed
-            if agent_id in ["natasha", "marcus"]:
+            if not resumed and agent_id in ["natasha", "marcus"]:
                 # Get the base agent from orchestrator
                 base_agent = self.orchestrator.agents.get(agent_id)
                 if base_agent:
@@ -386,10 +537,13 @@ class VoiceServer:
                     # Start conversation session
                     if hasattr(specialized_agent, 'start_conversation_session'):
                         conversation_context = specialized_agent.start_conversation_session(
-                            session_id, user_preferences
+                            session_id,
+                            user_preferences,
+                            history_window=self.config.server.history_window,
+                            summarize_evicted=self.config.server.summarize_evicted_history
                         )
-                        self.conversation_sessions[session_id] = conversation_context
-                        conversation_sessions.inc()
+                        self.conversation_sessions.put(session_id, conversation_context)
+                        conversation_sessions.set(len(self.conversation_sessions))
 
             # Update connection
             if connection_id in self.connections:
@@ -403,7 +557,6 @@ class VoiceServer:
                            agent_id=agent_id)
 
             # Send confirmation
-            websocket = self.connections[connection_id].websocket
             response_message = VoiceMessage(
                 message_id=str(uuid.uuid4()),
                 message_type="conversation_started",
@@ -412,18 +565,19 @@ class VoiceServer:
                 content={
                     "session_id": session_id,
                     "agent_id": agent_id,
-                    "agent_info": VoiceAgentFactory.get_agent_personality_info(agent_id)
+                    "agent_info": VoiceAgentFactory.get_agent_personality_info(agent_id),
+                    "resumed": resumed,
+                    "worker_id": self.worker_id
                 },
                 timestamp=time.time(),
                 metadata={}
             )
 
-            await self._send_message(websocket, response_message)
+            await self._send_message(connection_id, response_message)
 
         except Exception as e:
             self.error_handler.handle_error(e, {"connection_id": connection_id})
-            websocket = self.connections[connection_id].websocket
-            await self._send_error_message(websocket, str(e))
+            await self._send_error_message(connection_id, str(e))
 
     async def _handle_conversation_end(self, connection_id: str, message: VoiceMessage):
         """Handle conversation session end"""
@@ -434,27 +588,7 @@ class VoiceServer:
                 raise ValueError("Session ID required to end conversation")
 
             # End conversation session
-            summary = None
-            if session_id in self.conversation_sessions:
-                # Find the specialized agent
-                agent_id = self.connections[connection_id].agent_id
-                if agent_id in ["natasha", "marcus"]:
-                    base_agent = self.orchestrator.agents.get(agent_id)
-                    if base_agent:
-                        specialized_agent = VoiceAgentFactory.create_agent(
-                            agent_id,
-                            base_agent.config,
-                            base_agent.elevenlabs_client,
-                            base_agent.error_handler,
-                            self.config.debug
-                        )
-
-                        if hasattr(specialized_agent, 'end_conversation_session'):
-                            summary = specialized_agent.end_conversation_session(session_id)
-
-                # Clean up session
-                del self.conversation_sessions[session_id]
-                conversation_sessions.dec()
+            summary = self._end_conversation_session(session_id)
 
             # Update connection
             if connection_id in self.connections:
@@ -465,7 +599,6 @@ class VoiceServer:
                            session_id=session_id)
 
             # Send confirmation
-            websocket = self.connections[connection_id].websocket
             response_message = VoiceMessage(
                 message_id=str(uuid.uuid4()),
                 message_type="conversation_ended",
@@ -479,12 +612,11 @@ class VoiceServer:
                 metadata={}
             )
 
-            await self._send_message(websocket, response_message)
+            await self._send_message(connection_id, response_message)
 
         except Exception as e:
             self.error_handler.handle_error(e, {"connection_id": connection_id})
-            websocket = self.connections[connection_id].websocket
-            await self._send_error_message(websocket, str(e))
+            await self._send_error_message(connection_id, str(e))
 
     async def _handle_agent_switch(self, connection_id: str, message: VoiceMessage):
         """Handle agent switch request"""
@@ -514,7 +646,6 @@ class VoiceServer:
                            new_agent=new_agent_id)
 
             # Send confirmation
-            websocket = self.connections[connection_id].websocket
             response_message = VoiceMessage(
                 message_id=str(uuid.uuid4()),
                 message_type="agent_switched",
@@ -528,17 +659,14 @@ class VoiceServer:
                 metadata={}
             )
 
-            await self._send_message(websocket, response_message)
+            await self._send_message(connection_id, response_message)
 
         except Exception as e:
             self.error_handler.handle_error(e, {"connection_id": connection_id})
-            websocket = self.connections[connection_id].websocket
-            await self._send_error_message(websocket, str(e))
+            await self._send_error_message(connection_id, str(e))
 
     async def _handle_ping(self, connection_id: str, message: VoiceMessage):
         """Handle ping message"""
-        websocket = self.connections[connection_id].websocket
-
         response_message = VoiceMessage(
             message_id=str(uuid.uuid4()),
             message_type="pong",
@@ -549,17 +677,260 @@ class VoiceServer:
             metadata={}
         )
 
-        await self._send_message(websocket, response_message)
+        await self._send_message(connection_id, response_message)
+
+    async def _handle_protocol_select(self, connection_id: str, message: VoiceMessage):
+        """Handle wire protocol negotiation (json or binary audio frames)"""
+        try:
+            requested = message.content.get("protocol")
+            if requested not in SUPPORTED_PROTOCOLS:
+                raise ValueError(f"Unsupported protocol '{requested}'. Supported: {list(SUPPORTED_PROTOCOLS)}")
+
+            if connection_id in self.connections:
+                self.connections[connection_id].protocol = requested
+
+            self.logger.info("Protocol selected",
+                           connection_id=connection_id,
+                           protocol=requested)
+
+            response_message = VoiceMessage(
+                message_id=str(uuid.uuid4()),
+                message_type="protocol_selected",
+                session_id=message.session_id,
+                agent_id=message.agent_id,
+                content={"protocol": requested},
+                timestamp=time.time(),
+                metadata={}
+            )
+
+            await self._send_message(connection_id, response_message)
+
+        except Exception as e:
+            self.error_handler.handle_error(e, {"connection_id": connection_id})
+            await self._send_error_message(connection_id, str(e), message.message_id)
+
+    async def _handle_audio_format_select(self, connection_id: str, message: VoiceMessage):
+        """Handle audio output format negotiation (preference-ordered list or a single format)"""
+        try:
+            requested = message.content.get("audio_formats") or message.content.get("audio_format")
+            audio_formats = negotiate_audio_formats(requested, default=None)
+            if not audio_formats:
+                raise ValueError(f"Unsupported audio format {requested!r}. Supported: {list(AUDIO_FORMATS)}")
+
+            if connection_id in self.connections:
+                self.connections[connection_id].audio_formats = audio_formats
+
+            self.logger.info("Audio format selected",
+                           connection_id=connection_id,
+                           audio_formats=audio_formats)
+
+            response_message = VoiceMessage(
+                message_id=str(uuid.uuid4()),
+                message_type="audio_format_selected",
+                session_id=message.session_id,
+                agent_id=message.agent_id,
+                content={"audio_format": audio_formats[0], "audio_formats": audio_formats},
+                timestamp=time.time(),
+                metadata={}
+            )
+
+            await self._send_message(connection_id, response_message)
+
+        except Exception as e:
+            self.error_handler.handle_error(e, {"connection_id": connection_id})
+            await self._send_error_message(connection_id, str(e), message.message_id)
+
+    def _select_output_format(self, connection_id: str, requested: Optional[str] = None) -> str:
+        """Choose the audio format for one response on a connection.
+
+        A per-request ``audio_format`` goes to the front of the connection's
+        accepted formats. When the connection's send queue is backing up, the
+        lightest accepted format is used instead.
+        """
+        connection_info = self.connections.get(connection_id)
+        accepted = list(connection_info.audio_formats) if connection_info else [DEFAULT_AUDIO_FORMAT]
+        if requested:
+            if requested not in AUDIO_FORMATS:
+                raise ValueError(f"Unsupported audio format '{requested}'. Supported: {list(AUDIO_FORMATS)}")
+            accepted = [requested] + [fmt for fmt in accepted if fmt != requested]
+
+        queue = connection_info.send_queue if connection_info else None
+        queue_ratio = queue.qsize() / queue.maxsize if queue and queue.maxsize else 0.0
+        output_format = select_audio_format(accepted, queue_ratio, self.config.server.audio_degrade_queue_ratio)
+        if output_format != accepted[0]:
+            audio_format_downgrades_total.labels(format=output_format).inc()
+            self.logger.debug("Audio format downgraded for backlog",
+                            connection_id=connection_id,
+                            preferred=accepted[0],
+                            audio_format=output_format,
+                            queue_ratio=round(queue_ratio, 2))
+        return output_format
 
     async def _handle_audio_chunk(self, connection_id: str, message: VoiceMessage):
-        """Handle incoming audio chunk (for future speech-to-text)"""
-        # Placeholder for future STT implementation
-        self.logger.debug("Received audio chunk",
-                         connection_id=connection_id,
-                         chunk_size=len(str(message.content)))
+        """Handle incoming microphone audio (base64 16-bit mono PCM) for speech-to-text.
+
+        Chunks are segmented into utterances as they arrive; recognition runs on
+        the STT worker pool and transcripts stream back as ``transcript_partial``
+        and ``transcript_final`` messages. ``content.final`` ends the stream.
+        """
+        try:
+            connection_info = self.connections.get(connection_id)
+            if connection_info is None:
+                return
+            if self.stt is None or not self.stt.available:
+                raise ValueError("Speech-to-text is not enabled on this server")
 
-    async def _send_message(self, websocket: WebSocket, message: VoiceMessage):
+            content = message.content
+            sample_rate = content.get("sample_rate", self.config.stt.sample_rate)
+            if sample_rate != self.config.stt.sample_rate:
+                raise ValueError(f"Audio must be {self.config.stt.sample_rate} Hz mono 16-bit PCM")
+
+            if connection_info.speech is None:
+                connection_info.speech = self.stt.create_stream()
+
+            events = connection_info.speech.feed(base64.b64decode(content.get("audio_data") or ""))
+            if content.get("final"):
+                flushed = connection_info.speech.flush()
+                if flushed:
+                    events.append(flushed)
+
+            for event in events:
+                await self._dispatch_transcription(connection_info, message, event)
+
+        except Exception as e:
+            self.error_handler.handle_error(e, {"connection_id": connection_id})
+            await self._send_error_message(connection_id, str(e), message.message_id)
+
+    async def _dispatch_transcription(self, connection_info: ConnectionInfo, message: VoiceMessage, event: SpeechEvent):
+        """Recognize an utterance event as a tracked task.
+
+        Partials are dropped when recognizers are busy; finals are rejected once
+        the connection has ``max_finals_per_connection`` pending, so one client
+        cannot fill the shared STT pool.
+        """
+        speech = connection_info.speech
+        if not event.final:
+            if speech.partial_in_flight or self.stt.busy():
+                stt_partials_skipped_total.inc()
+                return
+            speech.partial_in_flight = True
+        elif connection_info.finals_pending >= self.config.stt.max_finals_per_connection:
+            requests_rejected_total.labels(reason="stt_connection_busy").inc()
+            await self._send_error_message(
+                connection_info.connection_id,
+                "Too many transcriptions pending for this connection",
+                message.message_id
+            )
+            return
+        else:
+            connection_info.finals_pending += 1
+
+        task = asyncio.create_task(self._run_transcription(connection_info, message, event))
+        connection_info.pending_tasks.add(task)
+        task.add_done_callback(connection_info.pending_tasks.discard)
+
+    async def _run_transcription(self, connection_info: ConnectionInfo, message: VoiceMessage, event: SpeechEvent):
+        """Transcribe one event and send the result"""
+        speech = connection_info.speech
+        try:
+            text = await self.stt.transcribe(event)
+        except Exception as e:
+            self.error_handler.handle_error(e, {"connection_id": connection_info.connection_id,
+                                                "utterance_id": event.utterance_id})
+            if event.final:
+                await self._send_error_message(connection_info.connection_id, str(e), message.message_id)
+            return
+        finally:
+            if event.final:
+                connection_info.finals_pending -= 1
+            else:
+                speech.partial_in_flight = False
+
+        # A partial that finishes after its utterance was finalized is stale
+        if not event.final and speech.utterance_id != event.utterance_id:
+            return
+
+        await self._send_message(connection_info.connection_id, VoiceMessage(
+            message_id=str(uuid.uuid4()),
+            message_type="transcript_final" if event.final else "transcript_partial",
+            session_id=message.session_id or connection_info.session_id,
+            agent_id=connection_info.agent_id,
+            content={
+                "utterance_id": event.utterance_id,
+                "sequence": event.sequence,
+                "text": text,
+                "final": event.final,
+                "reason": event.reason if event.final else None,
+                "audio_seconds": round(event.audio_seconds, 3),
+                "latency_ms": round((time.perf_counter() - event.ready_at) * 1000, 1)
+            },
+            timestamp=time.time(),
+            metadata={}
+        ))
+
+    async def _dispatch_synthesis(self, connection_id: str, message: VoiceMessage):
+        """Run a synthesis request as a tracked task, enforcing the per-connection limit"""
+        connection_info = self.connections.get(connection_id)
+        if connection_info is None:
+            return
+
+        if connection_info.synthesis_in_flight >= self.config.server.max_synthesis_per_connection:
+            requests_rejected_total.labels(reason="connection_busy").inc()
+            await self._send_error_message(
+                connection_id, "Too many synthesis requests in flight for this connection", message.message_id
+            )
+            return
+
+        connection_info.synthesis_in_flight += 1
+        synthesis_in_flight.inc()
+        task = asyncio.create_task(self._run_synthesis(connection_info, message))
+        connection_info.pending_tasks.add(task)
+        task.add_done_callback(connection_info.pending_tasks.discard)
+
+    async def _run_synthesis(self, connection_info: ConnectionInfo, message: VoiceMessage):
+        """Run synthesis handler and release the connection's in-flight slot"""
+        try:
+            await self._handle_synthesis_request(connection_info.connection_id, message)
+        finally:
+            connection_info.synthesis_in_flight -= 1
+            synthesis_in_flight.dec()
+
+    async def _send_message(self, connection_id: str, message: VoiceMessage):
+        """Queue message for delivery by the connection's writer task"""
+        connection_info = self.connections.get(connection_id)
+        if connection_info is None or connection_info.send_queue is None:
+            return
+
+        queue = connection_info.send_queue
+        if queue.full():
+            # Slow client: drop the oldest queued message rather than block the handler
+            dropped = queue.get_nowait()
+            queue.task_done()
+            if dropped.trace:
+                dropped.trace.finish(dropped=True)
+            send_queue_depth.dec()
+            messages_dropped_total.inc()
+            self.logger.warning("Send queue full, dropping oldest message",
+                              connection_id=connection_id,
+                              queue_size=queue.maxsize)
+
+        queue.put_nowait(message)
+        send_queue_depth.inc()
+
+    async def _connection_writer(self, connection_info: ConnectionInfo):
+        """Drain a connection's outbound queue onto its WebSocket"""
+        queue = connection_info.send_queue
+        while True:
+            message = await queue.get()
+            send_queue_depth.dec()
+            try:
+                await self._write_message(connection_info, message)
+            finally:
+                queue.task_done()
+
+    async def _write_message(self, connection_info: ConnectionInfo, message: VoiceMessage):
         """Send message to WebSocket client"""
+        trace = message.trace
         try:
             message_dict = {
                 "message_id": message.message_id,
@@ -571,12 +942,32 @@ class VoiceServer:
                 "metadata": message.metadata
             }
 
-            await websocket.send_text(json.dumps(message_dict))
+            websocket = connection_info.websocket
+            encode_start = time.perf_counter()
+            frames = encode_message(message_dict, message.audio, connection_info.protocol)
+            send_start = time.perf_counter()
+
+            for frame in frames:
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+
+            if trace:
+                trace.record("encode", send_start - encode_start)
+                trace.record("send", time.perf_counter() - send_start)
 
         except Exception as e:
             self.logger.error("Failed to send WebSocket message", error=str(e))
+        finally:
+            if trace:
+                trace.finish(
+                    transport="websocket",
+                    protocol=connection_info.protocol,
+                    audio_bytes=len(message.audio or b"")
+                )
 
-    async def _send_error_message(self, websocket: WebSocket, error_message: str, message_id: Optional[str] = None):
+    async def _send_error_message(self, connection_id: str, error_message: str, message_id: Optional[str] = None):
         """Send error message to WebSocket client"""
         error_response = VoiceMessage(
             message_id=str(uuid.uuid4()),
@@ -591,7 +982,7 @@ class VoiceServer:
             metadata={}
         )
 
-        await self._send_message(websocket, error_response)
+        await self._send_message(connection_id, error_response)
 
     def _update_agent_connections(self, agent_id: str, connection_id: str):
         """Update agent connections tracking"""
@@ -613,29 +1004,21 @@ class VoiceServer:
 
         connection_info = self.connections[connection_id]
 
+        # Stop in-flight synthesis and the outbound writer
+        for task in list(connection_info.pending_tasks):
+            task.cancel()
+        if connection_info.writer_task:
+            connection_info.writer_task.cancel()
+        if connection_info.send_queue:
+            send_queue_depth.dec(connection_info.send_queue.qsize())
+
         # Clean up agent connections
         if connection_info.agent_id:
             self._remove_agent_connection(connection_info.agent_id, connection_id)
 
-        # Clean up conversation session
-        if connection_info.session_id and connection_info.session_id in self.conversation_sessions:
-            # End conversation session if needed
-            if connection_info.agent_id in ["natasha", "marcus"]:
-                base_agent = self.orchestrator.agents.get(connection_info.agent_id)
-                if base_agent:
-                    specialized_agent = VoiceAgentFactory.create_agent(
-                        connection_info.agent_id,
-                        base_agent.config,
-                        base_agent.elevenlabs_client,
-                        base_agent.error_handler,
-                        self.config.debug
-                    )
-
-                    if hasattr(specialized_agent, 'end_conversation_session'):
-                        specialized_agent.end_conversation_session(connection_info.session_id)
-
-            del self.conversation_sessions[connection_info.session_id]
-            conversation_sessions.dec()
+        # Keep the conversation resumable; only conversation_end (or the TTL) ends it
+        if connection_info.session_id:
+            self.conversation_sessions.detach(connection_info.session_id)
 
         # Remove connection
         del self.connections[connection_id]
@@ -645,12 +1028,69 @@ class VoiceServer:
                         connection_id=connection_id,
                         remaining_connections=len(self.connections))
 
-    async def start_server(self):
-        """Start the voice server"""
-        # Start Prometheus metrics server
+    def _end_conversation_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """End a session, archive it and return its summary"""
+        context = self.conversation_sessions.get(session_id)
+        if context is None:
+            return None
+
+        end_time = time.time()
+        summary = {
+            "session_id": session_id,
+            "agent_name": context.agent_name,
+            "duration_seconds": end_time - context.start_time,
+            "total_interactions": context.total_turns,
+            "evicted_history": context.evicted_summary,
+            "start_time": context.start_time,
+            "end_time": end_time
+        }
+
+        self.conversation_sessions.end(session_id, summary)
+        conversation_sessions.set(len(self.conversation_sessions))
+        return summary
+
+    async def _reap_idle_resources(self):
+        """Periodically close idle connections and evict expired sessions"""
+        while True:
+            await asyncio.sleep(self.config.server.reaper_interval)
+            try:
+                now = time.time()
+                idle = [
+                    connection_id for connection_id, info in self.connections.items()
+                    if now - info.last_activity > self.config.server.idle_timeout
+                ]
+
+                for connection_id in idle:
+                    self.logger.info("Closing idle connection", connection_id=connection_id)
+                    try:
+                        await self.connections[connection_id].websocket.close(code=1001)
+                    except Exception:
+                        pass
+                    await self._cleanup_connection(connection_id)
+
+                expired = self.conversation_sessions.evict_expired(now)
+                conversation_sessions.set(len(self.conversation_sessions))
+
+                # Keep shared snapshots and ownership fresh for other workers
+                if self.shared_store:
+                    self.conversation_sessions.sync()
+                    self.shared_store.prune()
+
+                if idle or expired:
+                    self.logger.info("Reaper pass completed",
+                                   idle_connections=len(idle),
+                                   expired_sessions=len(expired))
+
+            except Exception as e:
+                self.error_handler.handle_error(e, {"component": "reaper"})
+
+    async def start_server(self, sockets: Optional[List[socket.socket]] = None):
+        """Start the voice server, optionally on pre-bound (SO_REUSEPORT) sockets"""
+        # Start Prometheus metrics server; each worker exports on its own port
         if self.config.enable_metrics:
-            start_http_server(self.config.metrics_port)
-            self.logger.info("Prometheus metrics server started", port=self.config.metrics_port)
+            metrics_port = self.config.metrics_port + self.worker_id
+            start_http_server(metrics_port)
+            self.logger.info("Prometheus metrics server started", port=metrics_port)
 
         # Start main server
         self.logger.info("Starting CTAS-7 Enterprise Voice Server",
@@ -666,17 +1106,57 @@ class VoiceServer:
             access_log=self.config.debug
         )
 
+        # Background reaper keeps connection and session memory bounded
+        self._reaper_task = asyncio.create_task(self._reap_idle_resources())
+
+        # Warm upstream connections and the audio cache while the listener comes up
+        self._prewarm_task = asyncio.create_task(self._prewarm())
+
         server = uvicorn.Server(config)
-        await server.serve()
+        await server.serve(sockets=sockets)
+
+    async def _prewarm(self):
+        """Run startup prewarm, then report ready"""
+        prewarm = self.config.prewarm
+        try:
+            if prewarm.enabled:
+                self.prewarm_status = await asyncio.wait_for(
+                    self.orchestrator.prewarm(prewarm.phrases, prewarm.connect_streaming),
+                    timeout=prewarm.timeout
+                )
+        except asyncio.TimeoutError:
+            self.prewarm_status = {"warm": False, "error": f"Prewarm exceeded {prewarm.timeout}s"}
+            self.logger.warning("Prewarm timed out, reporting ready cold", timeout=prewarm.timeout)
+        except Exception as e:
+            self.prewarm_status = {"warm": False, "error": str(e)}
+            self.error_handler.handle_error(e, {"phase": "prewarm"})
+        finally:
+            self.ready.set()
+            self.logger.info("Voice server ready", prewarm=self.prewarm_status)
 
     async def shutdown(self):
         """Gracefully shutdown the server"""
         self.logger.info("Shutting down voice server")
 
+        if self._reaper_task:
+            self._reaper_task.cancel()
+        if self._prewarm_task:
+            self._prewarm_task.cancel()
+
         # Close all WebSocket connections
         for connection_id in list(self.connections.keys()):
             await self._cleanup_connection(connection_id)
 
+        # Fail anything still queued for synthesis
+        await self.scheduler.stop()
+        self.trace_logger.close()
+        if self.stt:
+            self.stt.close()
+        self.conversation_sessions.sync()
+        self.conversation_sessions.close()
+        if self.shared_store:
+            self.shared_store.close()
+
         # Close orchestrator resources
         for agent in self.orchestrator.agents.values():
             if hasattr(agent, 'close_websocket'):
@@ -705,5 +1185,15 @@ async def main():
         import traceback
         traceback.print_exc()
 
+def run():
+    """Server entry point; runs a worker pool when CTAS7_VOICE_WORKERS > 1"""
+    config = VoiceConfig.from_env()
+    if config.server.workers > 1:
+        from .workers import run_workers
+        config.setup_logging()
+        run_workers(config)
+    else:
+        asyncio.run(main())
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run()
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+CTAS-7 Enterprise Voice Session Store
+Bounded conversation session storage with TTL eviction and optional spill-to-disk
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, TextIO
+import structlog
+
+from .agents import ConversationContext
+from .shared_store import SharedStore
+
+# Shared store namespaces: session snapshots and the worker that owns each session
+SESSION_NAMESPACE = "sessions"
+OWNER_NAMESPACE = "session_owner"
+
+class SessionStore:
+    """Bounded, TTL-evicting store of active conversation sessions.
+
+    Sessions are kept in least-recently-used order. When the store is full the
+    oldest session is evicted; sessions idle longer than ``ttl`` are evicted by
+    :meth:`evict_expired`. Ended and evicted sessions are appended to
+    ``archive_path`` as JSON lines when configured, then dropped from memory.
+
+    With a ``shared`` store, each session's snapshot and owning worker are
+    mirrored there. A worker that gets a session it does not hold, such as a
+    client reconnecting to a different worker, rebuilds it from the snapshot
+    and takes ownership. Ownership acts as the session's routing key, so the
+    session is live on one worker at a time: a worker that finds another owner
+    recorded for a session it holds drops its stale copy instead of
+    republishing it. Disconnected sessions are detached, not ended; they stay
+    published until the TTL so the client can resume them on any worker.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl: float = 3600.0,
+        archive_path: Optional[str] = None,
+        shared: Optional[SharedStore] = None,
+        owner: str = "0"
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.archive_path = archive_path
+        self.shared = shared
+        self.owner = owner
+        self.logger = structlog.get_logger("session_store")
+        self._sessions: "OrderedDict[str, ConversationContext]" = OrderedDict()
+        self._archive_file: Optional[TextIO] = None
+        self.evicted_total = 0
+        self.archived_total = 0
+        self.adopted_total = 0
+        self.released_total = 0
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[ConversationContext]:
+        context = self._sessions.get(session_id)
+        if context is not None and self._owned_elsewhere(session_id):
+            # Another worker adopted it since; its snapshot is newer than our copy
+            self._release(session_id)
+            context = None
+        if context is not None:
+            self._sessions.move_to_end(session_id)
+            return context
+        return self._adopt(session_id)
+
+    def put(self, session_id: str, context: ConversationContext):
+        """Store a session, evicting the least recently used one if full"""
+        self._sessions[session_id] = context
+        self._sessions.move_to_end(session_id)
+        self._publish(session_id, context)
+        while len(self._sessions) > self.max_sessions:
+            oldest_id, oldest = self._sessions.popitem(last=False)
+            if self._owned_elsewhere(oldest_id):
+                continue
+            self._archive(oldest, reason="capacity")
+            self._unpublish(oldest_id)
+            self.evicted_total += 1
+            self.logger.warning("Session store full, evicted oldest session", session_id=oldest_id)
+
+    def detach(self, session_id: str):
+        """Mark a session's client as gone; it stays resumable until the TTL"""
+        context = self._sessions.get(session_id)
+        if context is not None and not self._owned_elsewhere(session_id):
+            self._publish(session_id, context)
+
+    def end(self, session_id: str, summary: Optional[Dict[str, Any]] = None) -> Optional[ConversationContext]:
+        """Remove an ended session and archive it"""
+        context = self._sessions.pop(session_id, None)
+        if context is not None:
+            self._archive(context, reason="ended", summary=summary)
+            self._unpublish(session_id)
+        return context
+
+    def owner_of(self, session_id: str) -> Optional[str]:
+        """Worker currently owning a session"""
+        if session_id in self._sessions:
+            return self.owner
+        if self.shared is None:
+            return None
+        owner = self.shared.get(OWNER_NAMESPACE, session_id)
+        return owner.decode("utf-8") if owner else None
+
+    def sync(self):
+        """Refresh snapshots of sessions this worker still owns; drop ones adopted elsewhere"""
+        if self.shared is None:
+            return
+        for session_id in list(self._sessions):
+            if self._owned_elsewhere(session_id):
+                self._release(session_id)
+            else:
+                self._publish(session_id, self._sessions[session_id])
+
+    def _owned_elsewhere(self, session_id: str) -> bool:
+        if self.shared is None:
+            return False
+        owner = self.shared.get(OWNER_NAMESPACE, session_id)
+        return owner is not None and owner.decode("utf-8") != self.owner
+
+    def _release(self, session_id: str):
+        """Forget a local copy without archiving or unpublishing; its new owner keeps it"""
+        self._sessions.pop(session_id, None)
+        self.released_total += 1
+        self.logger.info("Session adopted by another worker, dropped local copy", session_id=session_id)
+
+    def _publish(self, session_id: str, context: ConversationContext):
+        if self.shared is None:
+            return
+        self.shared.set(SESSION_NAMESPACE, session_id, json.dumps(context.to_dict(), default=str).encode("utf-8"), self.ttl)
+        self.shared.set(OWNER_NAMESPACE, session_id, self.owner.encode("utf-8"), self.ttl)
+
+    def _unpublish(self, session_id: str):
+        if self.shared is None:
+            return
+        self.shared.delete(SESSION_NAMESPACE, session_id)
+        self.shared.delete(OWNER_NAMESPACE, session_id)
+
+    def _adopt(self, session_id: str) -> Optional[ConversationContext]:
+        """Take over a session another worker published"""
+        if self.shared is None:
+            return None
+        snapshot = self.shared.get(SESSION_NAMESPACE, session_id)
+        if snapshot is None:
+            return None
+        context = ConversationContext.from_dict(json.loads(snapshot))
+        previous_owner = self.owner_of(session_id)
+        self.put(session_id, context)
+        self.adopted_total += 1
+        self.logger.info("Adopted session from shared store", session_id=session_id, previous_owner=previous_owner)
+        return context
+
+    def evict_expired(self, now: Optional[float] = None) -> List[str]:
+        """Evict sessions with no interaction for longer than the TTL"""
+        now = now or time.time()
+        expired = [
+            session_id for session_id, context in self._sessions.items()
+            if now - context.last_interaction > self.ttl
+        ]
+        for session_id in expired:
+            if self._owned_elsewhere(session_id):
+                self._release(session_id)
+                continue
+            self._archive(self._sessions.pop(session_id), reason="expired")
+            self._unpublish(session_id)
+            self.evicted_total += 1
+        return expired
+
+    def _archive(self, context: ConversationContext, reason: str, summary: Optional[Dict[str, Any]] = None):
+        if not self.archive_path:
+            return
+        if self._archive_file is None:
+            self._archive_file = open(self.archive_path, "a", buffering=1)
+        record = {
+            "reason": reason,
+            "archived_at": time.time(),
+            "summary": summary,
+            "context": context.to_dict()
+        }
+        self._archive_file.write(json.dumps(record, default=str) + "\n")
+        self.archived_total += 1
+
+    def close(self):
+        if self._archive_file:
+            self._archive_file.close()
+            self._archive_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl,
+            "evicted_total": self.evicted_total,
+            "archived_total": self.archived_total,
+            "adopted_total": self.adopted_total,
+            "released_total": self.released_total,
+            "owner": self.owner
+        }
@@ -0,0 +1,152 @@
+"""
+CTAS-7 Enterprise Voice Shared Store
+Pluggable key/value store for state shared between server worker processes
+"""
+
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+import structlog
+
+from .config import ServerConfig
+
+class SharedStore:
+    """Namespaced key/value store with per-entry TTL.
+
+    The base implementation keeps entries in process memory (useful for a
+    single worker or tests); subclasses make the same interface visible
+    across processes.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, tuple]] = {}
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        entry = self._data.get(namespace, {}).get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._data[namespace][key]
+            return None
+        return value
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        self._data.setdefault(namespace, {})[key] = (value, expires_at)
+
+    def delete(self, namespace: str, key: str):
+        self._data.get(namespace, {}).pop(key, None)
+
+    def trim(self, namespace: str, max_bytes: int) -> int:
+        """Drop the entries closest to expiry until a namespace holds at most ``max_bytes``"""
+        entries = self._data.get(namespace, {})
+        newest_first = sorted(list(entries.items()), key=lambda item: item[1][1] or 0.0, reverse=True)
+        kept_bytes = 0
+        removed = 0
+        for key, (value, _) in newest_first:
+            kept_bytes += len(value)
+            if kept_bytes > max_bytes:
+                entries.pop(key, None)
+                removed += 1
+        return removed
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many were removed"""
+        now = time.time()
+        removed = 0
+        for entries in self._data.values():
+            for key in [k for k, (_, expires_at) in entries.items() if expires_at is not None and expires_at < now]:
+                del entries[key]
+                removed += 1
+        return removed
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "namespaces": {ns: len(entries) for ns, entries in self._data.items()}}
+
+class SQLiteSharedStore(SharedStore):
+    """Shared store backed by a local SQLite database in WAL mode.
+
+    Every worker opens its own connection to the same file. Reads and writes
+    are single-row primary-key operations; small values (session snapshots)
+    are accessed inline on the event loop, while callers moving large values
+    such as audio go through a worker thread. The connection is guarded by a
+    lock so both paths can share it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_kv ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM shared_kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shared_kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, value, expires_at)
+            )
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM shared_kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def trim(self, namespace: str, max_bytes: int) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM shared_kv WHERE namespace = ? AND key IN ("
+                " SELECT key FROM (SELECT key, SUM(LENGTH(value)) OVER"
+                "  (ORDER BY expires_at DESC ROWS UNBOUNDED PRECEDING) AS kept_bytes"
+                "  FROM shared_kv WHERE namespace = ?) WHERE kept_bytes > ?)",
+                (namespace, namespace, max_bytes)
+            )
+        return cursor.rowcount
+
+    def prune(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM shared_kv WHERE expires_at < ?", (time.time(),))
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT namespace, COUNT(*) FROM shared_kv GROUP BY namespace").fetchall()
+        return {"backend": "sqlite", "path": self.path, "namespaces": dict(rows)}
+
+def create_shared_store(config: ServerConfig) -> Optional[SharedStore]:
+    """Build the configured store, or None when a single worker keeps state in process.
+
+    Multiple workers always need a cross-process backend.
+    """
+    backend = config.shared_store
+    if config.workers > 1 and backend == "memory":
+        structlog.get_logger("shared_store").warning(
+            "In-process store cannot be shared between workers, using SQLite",
+            workers=config.workers, path=config.shared_store_path
+        )
+        backend = "sqlite"
+    if backend == "sqlite":
+        return SQLiteSharedStore(config.shared_store_path)
+    return None
@@ -0,0 +1,352 @@
+"""
+CTAS-7 Enterprise Voice Speech-to-Text
+Streaming ingestion of client audio: ring buffer, voice activity detection and pooled local recognition
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import wave
+import asyncio
+import operator
+import tempfile
+import subprocess
+import urllib.request
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List
+import structlog
+from prometheus_client import Counter, Histogram
+
+from .config import SpeechToTextConfig
+from .errors import SpeechRecognitionError
+
+# Inbound audio is 16-bit little-endian mono PCM
+SAMPLE_WIDTH = 2
+
+stt_utterances_total = Counter('ctas7_voice_stt_utterances_total', 'Utterances segmented from client audio', ['reason'])
+stt_partials_skipped_total = Counter('ctas7_voice_stt_partials_skipped_total', 'Partial transcripts skipped because recognizers were busy')
+stt_latency = Histogram('ctas7_voice_stt_latency_seconds', 'Time from utterance audio being available to its transcript', ['kind'])
+
+class PCMRingBuffer:
+    """Fixed-capacity ring of PCM samples addressed by absolute sample position.
+
+    Memory per connection stays constant however long the client streams;
+    positions older than ``capacity`` samples are overwritten.
+    """
+
+    def __init__(self, capacity_samples: int):
+        self.capacity = capacity_samples
+        self._buffer = bytearray(capacity_samples * SAMPLE_WIDTH)
+        self.end = 0  # Absolute samples written
+
+    @property
+    def start(self) -> int:
+        """Oldest sample position still held"""
+        return max(0, self.end - self.capacity)
+
+    def write(self, pcm: bytes):
+        samples = len(pcm) // SAMPLE_WIDTH
+        data = memoryview(pcm)[:samples * SAMPLE_WIDTH]
+        if samples > self.capacity:
+            data = data[-self.capacity * SAMPLE_WIDTH:]
+        offset = (self.end + samples - len(data) // SAMPLE_WIDTH) % self.capacity * SAMPLE_WIDTH
+        first = min(len(data), len(self._buffer) - offset)
+        self._buffer[offset:offset + first] = data[:first]
+        self._buffer[:len(data) - first] = data[first:]
+        self.end += samples
+
+    def read(self, start: int, end: int) -> bytes:
+        """PCM between two absolute positions, clamped to what is still held"""
+        start = max(start, self.start)
+        end = min(end, self.end)
+        if end <= start:
+            return b""
+        offset = start % self.capacity * SAMPLE_WIDTH
+        length = (end - start) * SAMPLE_WIDTH
+        first = min(length, len(self._buffer) - offset)
+        return bytes(self._buffer[offset:offset + first]) + bytes(self._buffer[:length - first])
+
+class EnergyVAD:
+    """Frame energy voice activity detector with an adaptive noise floor"""
+
+    def __init__(self, threshold_ratio: float = 3.0, min_rms: float = 300.0, floor_alpha: float = 0.05):
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.floor_alpha = floor_alpha
+        self.noise_floor = min_rms / threshold_ratio
+
+    def is_speech(self, frame: bytes) -> bool:
+        samples = array('h', frame)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        rms = math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples)) if samples else 0.0
+        speech = rms > max(self.min_rms, self.noise_floor * self.threshold_ratio)
+        if not speech:
+            # Track background noise only while nobody is talking
+            self.noise_floor += self.floor_alpha * (rms - self.noise_floor)
+        return speech
+
+@dataclass
+class SpeechEvent:
+    """Audio ready for recognition: a growing utterance (partial) or a completed one (final)"""
+    kind: str
+    utterance_id: str
+    sequence: int
+    audio: bytes
+    sample_rate: int
+    ready_at: float
+    reason: str = "silence"
+
+    @property
+    def final(self) -> bool:
+        return self.kind == "final"
+
+    @property
+    def audio_seconds(self) -> float:
+        return len(self.audio) / SAMPLE_WIDTH / self.sample_rate
+
+class SpeechStream:
+    """Per-connection segmenter turning a stream of PCM chunks into utterance events"""
+
+    def __init__(self, config: SpeechToTextConfig):
+        self.sample_rate = config.sample_rate
+        self.frame_samples = config.sample_rate * config.frame_ms // 1000
+        self.start_frames = max(1, config.vad_start_ms // config.frame_ms)
+        self.hangover_frames = max(1, config.vad_hangover_ms // config.frame_ms)
+        self.preroll_samples = config.sample_rate * config.preroll_ms // 1000
+        self.partial_samples = int(config.sample_rate * config.partial_interval)
+        self.max_samples = int(config.sample_rate * config.max_utterance_seconds)
+
+        self.ring = PCMRingBuffer(self.max_samples + self.preroll_samples + self.frame_samples)
+        self.vad = EnergyVAD(config.vad_threshold_ratio, config.vad_min_rms)
+        self._pending = bytearray()
+        self._position = 0  # Samples run through the VAD
+
+        self.utterance_id: Optional[str] = None
+        self.sequence = 0
+        self.partial_in_flight = False
+        self._speech_start = 0
+        self._last_partial = 0
+        self._voiced_run = 0
+        self._silence_run = 0
+
+    def feed(self, pcm: bytes) -> List[SpeechEvent]:
+        """Add audio; returns the partial/final events it completes.
+
+        Audio enters the ring one frame at a time as the VAD reaches it, so a
+        chunk longer than the ring cannot overwrite the utterance it starts.
+        """
+        if len(pcm) % SAMPLE_WIDTH:
+            raise ValueError("Audio chunk must contain whole 16-bit samples")
+        self._pending += pcm
+        frame_bytes = self.frame_samples * SAMPLE_WIDTH
+        events: List[SpeechEvent] = []
+
+        frames = len(self._pending) // frame_bytes
+        for index in range(frames):
+            frame = bytes(self._pending[index * frame_bytes:(index + 1) * frame_bytes])
+            self.ring.write(frame)
+            self._position += self.frame_samples
+            event = self._process_frame(self.vad.is_speech(frame))
+            if event:
+                events.append(event)
+        del self._pending[:frames * frame_bytes]
+        return events
+
+    def flush(self) -> Optional[SpeechEvent]:
+        """Finalize any utterance in progress (client end of stream)"""
+        if self.utterance_id is None:
+            return None
+        return self._finish(self._position, "flush")
+
+    def _process_frame(self, voiced: bool) -> Optional[SpeechEvent]:
+        if self.utterance_id is None:
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self.start_frames:
+                onset = self._position - self._voiced_run * self.frame_samples
+                self._speech_start = max(self.ring.start, onset - self.preroll_samples)
+                self._last_partial = self._position
+                self._silence_run = 0
+                self.sequence += 1
+                self.utterance_id = uuid.uuid4().hex[:12]
+            return None
+
+        self._silence_run = 0 if voiced else self._silence_run + 1
+        if self._silence_run >= self.hangover_frames:
+            return self._finish(self._position, "silence")
+        if self._position - self._speech_start >= self.max_samples:
+            return self._finish(self._position, "max_length")
+        if self.partial_samples and self._position - self._last_partial >= self.partial_samples:
+            self._last_partial = self._position
+            return self._event("partial", self._position)
+        return None
+
+    def _finish(self, end: int, reason: str) -> SpeechEvent:
+        event = self._event("final", end, reason)
+        stt_utterances_total.labels(reason=reason).inc()
+        self.utterance_id = None
+        self._voiced_run = 0
+        return event
+
+    def _event(self, kind: str, end: int, reason: str = "silence") -> SpeechEvent:
+        return SpeechEvent(
+            kind=kind,
+            utterance_id=self.utterance_id,
+            sequence=self.sequence,
+            audio=self.ring.read(self._speech_start, end),
+            sample_rate=self.sample_rate,
+            ready_at=time.perf_counter(),
+            reason=reason
+        )
+
+def _wav_bytes(pcm: bytes, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+class WhisperCppRecognizer:
+    """Runs the whisper.cpp CLI once per utterance; blocking, call from a worker thread"""
+
+    backend = "cli"
+
+    def __init__(self, binary: str, model: str, language: str = "en", threads: int = 2, timeout: float = 30.0):
+        self.binary = binary
+        self.model = model
+        self.language = language
+        self.threads = threads
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return os.access(self.binary, os.X_OK) and os.path.isfile(self.model)
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        with tempfile.NamedTemporaryFile(suffix=".wav") as wav_file:
+            wav_file.write(_wav_bytes(pcm, sample_rate))
+            wav_file.flush()
+            try:
+                result = subprocess.run(
+                    [self.binary, "-m", self.model, "-f", wav_file.name, "-l", self.language,
+                     "-t", str(self.threads), "-nt", "-np"],
+                    capture_output=True, text=True, timeout=self.timeout
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                raise SpeechRecognitionError(f"whisper.cpp failed: {e}", backend=self.backend)
+
+        if result.returncode != 0:
+            raise SpeechRecognitionError(
+                f"whisper.cpp exited with {result.returncode}",
+                backend=self.backend,
+                details={"stderr": result.stderr[-500:]}
+            )
+        return " ".join(line.strip() for line in result.stdout.splitlines() if line.strip())
+
+class WhisperServerRecognizer:
+    """Posts utterances to a resident whisper.cpp server, so the model is loaded once"""
+
+    backend = "server"
+
+    def __init__(self, url: str, language: str = "en", timeout: float = 30.0):
+        self.url = url
+        self.language = language
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return bool(self.url)
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        boundary = uuid.uuid4().hex
+        fields = {"response_format": "json", "language": self.language, "temperature": "0.0"}
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+            for name, value in fields.items()
+        ]
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="utterance.wav"\r\n'
+            f'Content-Type: audio/wav\r\n\r\n'.encode() + _wav_bytes(pcm, sample_rate) + b"\r\n"
+        )
+        parts.append(f"--{boundary}--\r\n".encode())
+
+        request = urllib.request.Request(
+            self.url,
+            data=b"".join(parts),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read()).get("text", "").strip()
+        except (OSError, ValueError) as e:
+            raise SpeechRecognitionError(f"whisper.cpp server request failed: {e}", backend=self.backend)
+
+def create_recognizer(config: SpeechToTextConfig):
+    if config.backend == "server":
+        return WhisperServerRecognizer(config.server_url, config.language, config.timeout)
+    return WhisperCppRecognizer(config.whisper_binary, config.whisper_model, config.language,
+                                config.threads, config.timeout)
+
+class SpeechToTextService:
+    """Server-wide recognizer pool shared by every connection's SpeechStream.
+
+    Recognition is blocking (a subprocess or HTTP call), so it runs on a
+    fixed-size thread pool. Finals queue, up to ``max_finals_per_connection``
+    per connection (enforced by the server); partials are skipped while every
+    worker is busy so a backlog cannot delay final transcripts.
+    """
+
+    def __init__(self, config: SpeechToTextConfig, recognizer=None):
+        self.config = config
+        self.recognizer = recognizer or create_recognizer(config)
+        self.logger = structlog.get_logger("voice_stt", backend=self.recognizer.backend)
+        self._executor = ThreadPoolExecutor(max_workers=config.workers, thread_name_prefix="ctas7-stt")
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+        self.available = self.recognizer.available()
+        if not self.available:
+            self.logger.warning("Speech recognizer unavailable; audio_chunk messages will be rejected",
+                              binary=getattr(self.recognizer, "binary", None),
+                              model=getattr(self.recognizer, "model", None))
+
+    def create_stream(self) -> SpeechStream:
+        return SpeechStream(self.config)
+
+    def busy(self) -> bool:
+        return self.in_flight >= self.config.workers
+
+    async def transcribe(self, event: SpeechEvent) -> str:
+        self.in_flight += 1
+        try:
+            text = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.recognizer.transcribe, event.audio, event.sample_rate
+            )
+            self.completed += 1
+            return text
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            stt_latency.labels(kind=event.kind).observe(time.perf_counter() - event.ready_at)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "backend": self.recognizer.backend,
+            "workers": self.config.workers,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed
+        }
@@ -0,0 +1,111 @@
+"""
+CTAS-7 Enterprise Voice Telemetry
+Per-stage latency timings and sampled trace logging for the voice pipeline
+"""
+
+import json
+import time
+import uuid
+import random
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, TextIO
+import structlog
+from prometheus_client import Histogram
+
+# Pipeline stages, in the order a spoken response passes through them
+STAGES = ("queue", "upstream_connect", "ttfb", "stream", "synthesis", "encode", "send", "total")
+
+voice_stage_duration = Histogram(
+    'ctas7_voice_stage_duration_seconds',
+    'Voice pipeline stage duration',
+    ['stage', 'agent', 'mode']
+)
+
+# Trace for the synthesis running in the current task, if any
+current_trace: contextvars.ContextVar[Optional["SynthesisTrace"]] = contextvars.ContextVar(
+    "ctas7_voice_trace", default=None
+)
+
+class SynthesisTrace:
+    """Stage timings for one spoken response"""
+
+    def __init__(self, agent_id: str, mode: str, sink: Optional["TraceLogger"] = None, sampled: bool = False):
+        self.trace_id = str(uuid.uuid4())
+        self.agent_id = agent_id
+        self.mode = mode
+        self.sampled = sampled
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.attributes: Dict[str, Any] = {}
+        self._sink = sink
+        self._finished = False
+
+    def record(self, stage: str, seconds: float):
+        """Record a stage duration (repeated stages accumulate)"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        voice_stage_duration.labels(stage=stage, agent=self.agent_id, mode=self.mode).observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as a pipeline stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def finish(self, **attributes):
+        """Record total latency and emit the trace if sampled"""
+        if self._finished:
+            return
+        self._finished = True
+        self.attributes.update(attributes)
+        self.record("total", time.perf_counter() - self.started)
+        if self.sampled and self._sink:
+            self._sink.emit(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "agent": self.agent_id,
+            "mode": self.mode,
+            "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            "attributes": self.attributes,
+            "timestamp": time.time()
+        }
+
+class TraceLogger:
+    """Creates traces and writes a sampled subset as JSON lines"""
+
+    def __init__(self, sample_rate: float = 0.0, file_path: Optional[str] = None):
+        self.sample_rate = sample_rate
+        self.file_path = file_path
+        self.logger = structlog.get_logger("voice_trace")
+        self._file: Optional[TextIO] = None
+
+    def start_trace(self, agent_id: str, mode: str) -> SynthesisTrace:
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        return SynthesisTrace(agent_id, mode, sink=self, sampled=sampled)
+
+    def emit(self, trace: SynthesisTrace):
+        record = trace.to_dict()
+        if self.file_path:
+            if self._file is None:
+                self._file = open(self.file_path, "a", buffering=1)
+            self._file.write(json.dumps(record, default=str) + "\n")
+        else:
+            self.logger.info("Voice trace", **record)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+def record_stage(stage: str, seconds: float, agent: str, mode: str):
+    """Record a stage on the current trace, or directly on the histogram when untraced"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.record(stage, seconds)
+    else:
+        voice_stage_duration.labels(stage=stage, agent=agent, mode=mode).observe(seconds)
@@ -0,0 +1,99 @@
+"""
+CTAS-7 Enterprise Voice Worker Pool
+Runs several VoiceServer processes on one port using SO_REUSEPORT
+"""
+
+import os
+import time
+import signal
+import socket
+import asyncio
+import multiprocessing
+from typing import List
+import structlog
+
+from .config import VoiceConfig
+from .errors import ConfigurationError
+
+# Seconds between liveness checks of worker processes
+SUPERVISE_INTERVAL = 1.0
+
+def _reuseport_socket(host: str, port: int) -> socket.socket:
+    """Bind a listening socket that other workers can bind to as well"""
+    family, sock_type, proto, _, address = socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE
+    )[0]
+    sock = socket.socket(family, sock_type, proto)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(address)
+    return sock
+
+async def _serve_worker(config: VoiceConfig, worker_id: int):
+    from .server import VoiceServer
+
+    config.setup_logging()
+    sock = _reuseport_socket(config.server.host, config.server.port)
+    server = VoiceServer(config, worker_id=worker_id)
+    try:
+        await server.start_server(sockets=[sock])
+    finally:
+        await server.shutdown()
+
+def _worker_main(config: VoiceConfig, worker_id: int):
+    """Worker process entry point"""
+    asyncio.run(_serve_worker(config, worker_id))
+
+def run_workers(config: VoiceConfig):
+    """Run ``config.server.workers`` server processes and restart any that exit unexpectedly.
+
+    Each worker binds its own SO_REUSEPORT socket on the configured port, and the
+    kernel spreads incoming connections across them. A WebSocket stays on the
+    worker that accepted it; sessions and cached audio are shared through the
+    configured shared store.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise ConfigurationError("Multiple workers require SO_REUSEPORT, which this platform lacks",
+                                 config_key="server.workers")
+
+    logger = structlog.get_logger("voice_workers")
+    context = multiprocessing.get_context("spawn")
+    stopping = False
+
+    def start(worker_id: int) -> multiprocessing.Process:
+        process = context.Process(
+            target=_worker_main,
+            args=(config, worker_id),
+            name=f"ctas7-voice-worker-{worker_id}",
+            daemon=False
+        )
+        process.start()
+        logger.info("Worker started", worker_id=worker_id, pid=process.pid)
+        return process
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    processes: List[multiprocessing.Process] = [start(worker_id) for worker_id in range(config.server.workers)]
+    logger.info("Voice worker pool running",
+                workers=config.server.workers,
+                port=config.server.port,
+                pid=os.getpid())
+
+    while not stopping:
+        time.sleep(SUPERVISE_INTERVAL)
+        for worker_id, process in enumerate(processes):
+            if not process.is_alive() and not stopping:
+                logger.warning("Worker exited, restarting", worker_id=worker_id, exitcode=process.exitcode)
+                processes[worker_id] = start(worker_id)
+
+    logger.info("Stopping voice worker pool")
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=10)
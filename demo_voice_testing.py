@@ -336,7 +336,10 @@ class VoiceTestingDemo:
 async def main():
     """Main demonstration function"""
     demo = VoiceTestingDemo()
-    await demo.run_full_demonstration()
+    try:
+        await demo.run_full_demonstration()
+    finally:
+        await demo.voice_reporter.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -7,76 +7,221 @@ import websockets
 import json
 import pyttsx3
 import threading
+import heapq
+import hashlib
+import itertools
+import tempfile
+import time
 from pathlib import Path
 
+# Speech priorities; lower values are spoken first
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+
+# Phrases allowed to wait for the TTS worker before the least urgent one is dropped
+SPEECH_QUEUE_SIZE = 8
+
+# Pre-rendered command acknowledgements, reused across runs
+AUDIO_CACHE_DIR = Path(tempfile.gettempdir()) / "natasha_voice_cache"
+
+# Smart Crate commands, checked in order: (trigger phrases, response, action, priority)
+COMMAND_RESPONSES = [
+    (("spin up crates",), "Da, Boss! Spinning up Smart Crate Orchestration system now...",
+     "spin_up_crates", PRIORITY_NORMAL),
+    (("retrofit crates",), "Copy zat, Boss! Retrofitting legacy crates through WASM pipeline...",
+     "retrofit_crates", PRIORITY_NORMAL),
+    (("build crate",), "Understood, Boss! Building new crate vith SLSA L3 certification...",
+     "build_new_crate", PRIORITY_NORMAL),
+    (("orchestrate", "swarm"), "Da! Initiating Docker Swarm orchestration across all nodes...",
+     "orchestrate_swarm", PRIORITY_NORMAL),
+    (("drop ui", "emergency"), "Boss, ve have some sheet happening, ve are dropping ze UIs, stand by!",
+     "emergency_mode", PRIORITY_URGENT),
+]
+UNKNOWN_COMMAND_RESPONSE = "Ya ne ponimayu, Boss. Please repeat command."
+
+class SpeechQueue:
+    """Bounded priority queue of phrases waiting to be spoken.
+
+    A phrase that is already waiting is not queued again (it keeps the more
+    urgent of the two priorities). When full, the oldest of the least urgent
+    phrases makes room, unless the new phrase is less urgent than all of them.
+    """
+
+    def __init__(self, maxsize=SPEECH_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._heap = []      # [priority, sequence, text]
+        self._waiting = {}   # text -> heap entry
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.coalesced = 0
+        self.dropped = 0
+
+    def put(self, text, priority=PRIORITY_NORMAL):
+        """Queue a phrase without blocking; returns False if it was dropped"""
+        with self._condition:
+            entry = self._waiting.get(text)
+            if entry is not None:
+                self.coalesced += 1
+                if priority < entry[0]:
+                    entry[0] = priority
+                    heapq.heapify(self._heap)
+                return True
+
+            if len(self._heap) >= self.maxsize:
+                victim = max(self._heap, key=lambda e: (e[0], -e[1]))
+                if priority > victim[0]:
+                    self.dropped += 1
+                    return False
+                self._heap.remove(victim)
+                heapq.heapify(self._heap)
+                del self._waiting[victim[2]]
+                self.dropped += 1
+
+            entry = [priority, next(self._sequence), text]
+            heapq.heappush(self._heap, entry)
+            self._waiting[text] = entry
+            self._condition.notify()
+            return True
+
+    def get(self):
+        """Block for the most urgent phrase; returns None once closed"""
+        with self._condition:
+            while not self._heap and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return None
+            _, _, text = heapq.heappop(self._heap)
+            del self._waiting[text]
+            return text
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
 class NatashaVoice:
     def __init__(self, port=8765):
         self.port = port
         self.clients = set()
 
-        # Initialize TTS with Russian accent
-        self.tts_engine = pyttsx3.init()
-        voices = self.tts_engine.getProperty('voices')
+        # The TTS engine and audio device belong to one worker thread, so
+        # phrases are spoken one at a time and never fight over the engine
+        self.tts_engine = None
+        self.speech_queue = SpeechQueue()
+        self.audio_cache = {}  # accented text -> preloaded pygame Sound
+        self.speech_ready = threading.Event()
+        self.speech_thread = threading.Thread(target=self._speech_worker, name="natasha-tts", daemon=True)
+        self.speech_thread.start()
+
+        print("🎙️ Natasha Voice System ready!")
+        print(f"🌐 WebSocket server will run on ws://localhost:{port}")
+
+    def _init_engine(self):
+        """Initialize TTS with Russian accent"""
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')
 
         # Find female voice
         for voice in voices:
             if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                self.tts_engine.setProperty('voice', voice.id)
+                engine.setProperty('voice', voice.id)
                 break
 
-        self.tts_engine.setProperty('rate', 150)  # Slower for accent
-        self.tts_engine.setProperty('volume', 0.9)
+        engine.setProperty('rate', 150)  # Slower for accent
+        engine.setProperty('volume', 0.9)
+        return engine
 
-        print("🎙️ Natasha Voice System ready!")
-        print(f"🌐 WebSocket server will run on ws://localhost:{port}")
+    def _prerender_command_responses(self):
+        """Render the fixed command acknowledgements once and keep them in memory"""
+        try:
+            import pygame
+            pygame.mixer.init()
+        except Exception as e:
+            print(f"⚠️ Audio playback unavailable, command responses will be synthesized live: {e}")
+            return
+
+        AUDIO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        voice_key = f"{self.tts_engine.getProperty('voice')}|{self.tts_engine.getProperty('rate')}"
+        phrases = [response for _, response, _, _ in COMMAND_RESPONSES] + [UNKNOWN_COMMAND_RESPONSE]
+
+        paths = {}
+        rendering = False
+        for phrase in phrases:
+            text = self.apply_russian_accent(phrase)
+            path = AUDIO_CACHE_DIR / f"{hashlib.sha1(f'{voice_key}|{text}'.encode()).hexdigest()}.wav"
+            if not path.exists():
+                self.tts_engine.save_to_file(text, str(path))
+                rendering = True
+            paths[text] = path
+        if rendering:
+            self.tts_engine.runAndWait()
+
+        for text, path in paths.items():
+            try:
+                self.audio_cache[text] = pygame.mixer.Sound(str(path))
+            except Exception as e:
+                print(f"⚠️ Could not load pre-rendered response ({path.name}): {e}")
+        print(f"🔊 Pre-rendered {len(self.audio_cache)} command responses")
+
+    def _speech_worker(self):
+        """Speak queued phrases one at a time"""
+        try:
+            self.tts_engine = self._init_engine()
+            self._prerender_command_responses()
+        except Exception as e:
+            print(f"🔴 TTS engine unavailable, Natasha will stay silent: {e}")
+            return
+        finally:
+            self.speech_ready.set()
+
+        while True:
+            text = self.speech_queue.get()
+            if text is None:
+                break
+            try:
+                sound = self.audio_cache.get(text)
+                if sound is not None:
+                    channel = sound.play()
+                    while channel is not None and channel.get_busy():
+                        time.sleep(0.01)
+                else:
+                    self.tts_engine.say(text)
+                    self.tts_engine.runAndWait()
+            except Exception as e:
+                print(f"🔴 Speech error: {e}")
 
     def apply_russian_accent(self, text):
         """Apply Russian accent to text"""
         accented = text.replace("th", "z").replace("w", "v").replace("W", "V")
         return accented
 
-    def speak_russian(self, text):
-        """Speak with Russian accent"""
+    def speak_russian(self, text, priority=PRIORITY_NORMAL):
+        """Queue a phrase to speak with Russian accent; returns immediately"""
         russian_text = self.apply_russian_accent(text)
-        def speak():
-            self.tts_engine.say(russian_text)
-            self.tts_engine.runAndWait()
-        thread = threading.Thread(target=speak)
-        thread.start()
+        if not self.speech_queue.put(russian_text, priority):
+            print(f"🟡 Speech queue full, dropped: {russian_text}")
 
     async def handle_voice_command(self, command):
         """Handle voice commands for Smart Crate Control"""
         command = command.lower()
 
-        if "spin up crates" in command:
-            response = "Da, Boss! Spinning up Smart Crate Orchestration system now..."
-            self.speak_russian(response)
-            return {"action": "spin_up_crates", "status": "initiated"}
+        for triggers, response, action, priority in COMMAND_RESPONSES:
+            if any(trigger in command for trigger in triggers):
+                self.speak_russian(response, priority)
+                return {"action": action, "status": "initiated"}
 
-        elif "retrofit crates" in command:
-            response = "Copy zat, Boss! Retrofitting legacy crates through WASM pipeline..."
-            self.speak_russian(response)
-            return {"action": "retrofit_crates", "status": "initiated"}
+        self.speak_russian(UNKNOWN_COMMAND_RESPONSE)
+        return {"action": "unknown", "status": "need_repeat"}
 
-        elif "build crate" in command:
-            response = "Understood, Boss! Building new crate vith SLSA L3 certification..."
-            self.speak_russian(response)
-            return {"action": "build_new_crate", "status": "initiated"}
-
-        elif "orchestrate" in command or "swarm" in command:
-            response = "Da! Initiating Docker Swarm orchestration across all nodes..."
-            self.speak_russian(response)
-            return {"action": "orchestrate_swarm", "status": "initiated"}
-
-        elif "drop ui" in command or "emergency" in command:
-            response = "Boss, ve have some sheet happening, ve are dropping ze UIs, stand by!"
-            self.speak_russian(response)
-            return {"action": "emergency_mode", "status": "initiated"}
-
-        else:
-            response = "Ya ne ponimayu, Boss. Please repeat command."
-            self.speak_russian(response)
-            return {"action": "unknown", "status": "need_repeat"}
+    def close(self):
+        """Stop the speech worker after the phrase it is speaking"""
+        self.speech_queue.close()
+        self.speech_thread.join(timeout=10)
 
     async def handle_client(self, websocket):
         """Handle WebSocket client connections"""
@@ -109,9 +254,14 @@ class NatashaVoice:
     async def start_server(self):
         """Start WebSocket server"""
         print(f"🚀 Starting Natasha voice server on port {self.port}")
+        # Accept commands only once acknowledgements can be played instantly
+        await asyncio.to_thread(self.speech_ready.wait)
         server = await websockets.serve(self.handle_client, "localhost", self.port)
         print(f"✅ Server running at ws://localhost:{self.port}")
-        await server.wait_closed()
+        try:
+            await server.wait_closed()
+        finally:
+            self.close()
 
 # Simple HTML client
 def create_client_html():
@@ -10,22 +10,141 @@ import json
 import sys
 import time
 import threading
+import bisect
+from collections import Counter, deque
+from itertools import islice
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable
 import websockets
 import hashlib
 from ascii_test_output_agent import AsciiTestOutputAgent
+from terminal_frame_renderer import DISPLAY_FPS, TerminalFrameRenderer
+
+# Completed tests kept in memory; totals and percentiles still cover every completion
+COMPLETED_HISTORY = 500
+# Minutes of completions averaged into the throughput figure
+THROUGHPUT_WINDOW_MINUTES = 15
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (Jain & Chlamtac P-squared)"""
+
+    def __init__(self, q: float):
+        self.q = q
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x: float):
+        h = self.heights
+        if len(h) < 5:
+            bisect.insort(h, x)
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(h, x) - 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Nudge the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not h[i - 1] < height < h[i + 1]:
+                    height = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = height
+                n[i] += d
+
+    def value(self) -> float:
+        h = self.heights
+        if not h:
+            return 0.0
+        if len(h) < 5:
+            return h[round(self.q * (len(h) - 1))]
+        return h[2]
+
+class CompletionStats:
+    """Rolling aggregates over completed tests, updated once per completion"""
+
+    def __init__(self):
+        self.total = 0
+        self.by_status = Counter()
+        self.last_failure: Optional[str] = None
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+        self.minute_counts = deque(maxlen=THROUGHPUT_WINDOW_MINUTES)  # [minute, completions]
+
+    @classmethod
+    def from_tests(cls, tests: List[Dict]) -> "CompletionStats":
+        stats = cls()
+        for test in tests:
+            stats.record(test)
+        return stats
+
+    def record(self, test_data: Dict, now: Optional[float] = None):
+        status = test_data.get('status')
+        self.total += 1
+        self.by_status[status] += 1
+        if status == 'FAILED':
+            self.last_failure = test_data.get('test_id', 'unknown test')
+
+        duration = test_data.get('duration', 0)
+        self.p50.add(duration)
+        self.p95.add(duration)
+
+        minute = int((now or time.time()) // 60)
+        if self.minute_counts and self.minute_counts[-1][0] == minute:
+            self.minute_counts[-1][1] += 1
+        else:
+            self.minute_counts.append([minute, 1])
+
+    @property
+    def passed(self) -> int:
+        return self.by_status['PASSED']
+
+    @property
+    def failed(self) -> int:
+        return self.by_status['FAILED']
+
+    def throughput_per_minute(self, now: Optional[float] = None) -> float:
+        """Average completions per minute over the last THROUGHPUT_WINDOW_MINUTES"""
+        if not self.minute_counts:
+            return 0.0
+        minute = int((now or time.time()) // 60)
+        first = max(self.minute_counts[0][0], minute - THROUGHPUT_WINDOW_MINUTES + 1)
+        recent = sum(count for m, count in self.minute_counts if m >= first)
+        return recent / max(1, minute - first + 1)
 
 class RealTimeAsciiMonitor:
     def __init__(self):
         self.agent_name = "Elena Rodriguez & Marcus Chen"
         self.agent_role = "Real-time Visualization Team"
         self.active_tests = {}
-        self.completed_tests = []
+        self.completed_tests = deque(maxlen=COMPLETED_HISTORY)
+        self.completion_stats = CompletionStats()
         self.voice_callbacks = []
         self.ui_callbacks = []
         self.running = False
         self.ascii_agent = AsciiTestOutputAgent()
+        self.renderer = TerminalFrameRenderer()
+        self.display_dirty = asyncio.Event()
+        self.display_loop_active = False
+        self.coalesced_updates = 0
 
     def register_voice_callback(self, callback: Callable):
         """Register callback for voice system integration"""
@@ -39,7 +158,7 @@ class RealTimeAsciiMonitor:
         """Generate main dashboard header"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
         active_count = len(self.active_tests)
-        completed_count = len(self.completed_tests)
+        completed_count = self.completion_stats.total
 
         return f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -77,8 +196,15 @@ class RealTimeAsciiMonitor:
 
     def generate_metrics_grid(self, tests: List[Dict]) -> str:
         """Generate compact metrics grid"""
+        stats = self.completion_stats
+        completion_row = ""
+        if stats.total:
+            completion_row = (f"│ Done: {stats.total:<5} │ ✓ {stats.passed:<4} ✗ {stats.failed:<4} │ "
+                              f"p50 {stats.p50.value():>5.1f}s p95 {stats.p95.value():>5.1f}s │ "
+                              f"{stats.throughput_per_minute():>5.1f}/min │\n")
+
         if not tests:
-            return "\n┌─────────────────────────────────────────────────────────────────┐\n│ No active tests - System ready for new test execution          │\n└─────────────────────────────────────────────────────────────────┘"
+            return "\n┌─────────────────────────────────────────────────────────────────┐\n│ No active tests - System ready for new test execution          │\n" + completion_row + "└─────────────────────────────────────────────────────────────────┘"
 
         grid = "\n┌─────────────────────── ACTIVE TEST METRICS ──────────────────────┐\n"
 
@@ -92,17 +218,15 @@ class RealTimeAsciiMonitor:
 
             grid += f"│ {test_id:<20} │ Exec: {exec_status:<4} │ Voice: {voice_status:<4} │ Step: {test.get('current_step', 'N/A'):<10} │\n"
 
+        grid += completion_row
         grid += "└─────────────────────────────────────────────────────────────────┘"
         return grid
 
-    def generate_voice_summary(self, active_tests: List[Dict], completed_tests: List[Dict]) -> str:
-        """Generate natural voice summary"""
+    def generate_voice_summary(self, active_tests: List[Dict], completed_tests: Optional[List[Dict]] = None) -> str:
+        """Generate natural voice summary (from the rolling aggregates unless tests are given)"""
         total_active = len(active_tests)
-        total_completed = len(completed_tests)
-
-        # Count status types
-        failed_tests = [t for t in completed_tests if t.get('status') == 'FAILED']
-        passed_tests = [t for t in completed_tests if t.get('status') == 'PASSED']
+        stats = self.completion_stats if completed_tests is None else CompletionStats.from_tests(completed_tests)
+        total_completed = stats.total
 
         summary = f"System status update from {self.agent_name}. "
 
@@ -118,12 +242,12 @@ class RealTimeAsciiMonitor:
 
         if total_completed > 0:
             summary += f"Completed {total_completed} test{'s' if total_completed != 1 else ''} - "
-            summary += f"{len(passed_tests)} passed, {len(failed_tests)} failed. "
+            summary += f"{stats.passed} passed, {stats.failed} failed. "
+            summary += f"Median duration {stats.p50.value():.1f} seconds, 95th percentile {stats.p95.value():.1f} seconds. "
 
         # Add specific alerts for failures
-        if failed_tests:
-            recent_failure = failed_tests[-1]
-            summary += f"Most recent failure: {recent_failure.get('test_id', 'unknown test')} - manual review recommended. "
+        if stats.last_failure:
+            summary += f"Most recent failure: {stats.last_failure} - manual review recommended. "
 
         return summary
 
@@ -156,12 +280,16 @@ class RealTimeAsciiMonitor:
             if test_id in self.active_tests:
                 del self.active_tests[test_id]
             self.completed_tests.append(test_data)
+            self.completion_stats.record(test_data)
 
             # Trigger voice callback for completion
             await self.trigger_voice_report(test_data, "completion")
 
         # Update display
-        await self.refresh_display()
+        if self.display_loop_active:
+            self.request_refresh()
+        else:
+            await self.refresh_display()
 
     async def trigger_voice_report(self, test_data: Dict, trigger_type: str):
         """Trigger voice system for important events"""
@@ -178,10 +306,7 @@ class RealTimeAsciiMonitor:
                 voice_summary = f"Test {test_id} completed successfully in {duration:.1f} seconds."
 
         elif trigger_type == "periodic":
-            voice_summary = self.generate_voice_summary(
-                list(self.active_tests.values()),
-                self.completed_tests[-10:]  # Last 10 completed
-            )
+            voice_summary = self.generate_voice_summary(list(self.active_tests.values()))
 
         # Send to voice callbacks
         for callback in self.voice_callbacks:
@@ -190,33 +315,59 @@ class RealTimeAsciiMonitor:
             except Exception as e:
                 print(f"[ERROR] Voice callback failed: {e}")
 
-    async def refresh_display(self):
-        """Refresh the ASCII display"""
-        # Clear screen
-        sys.stdout.write('\033[2J\033[H')
+        # Callbacks may have written to the terminal underneath the dashboard
+        if self.voice_callbacks:
+            self.renderer.invalidate()
 
-        # Display header
-        print(self.generate_dashboard_header())
+    def compose_frame(self) -> List[str]:
+        """Build the dashboard as a list of terminal lines"""
+        sections = [self.generate_dashboard_header()]
 
         # Display active tests as strip reports
         if self.active_tests:
-            print("\n" + "─" * 80)
-            print("ACTIVE TESTS:")
+            sections.append("\n" + "─" * 80)
+            sections.append("ACTIVE TESTS:")
             for test_data in self.active_tests.values():
-                print(self.generate_strip_report_line(test_data))
+                sections.append(self.generate_strip_report_line(test_data))
 
         # Display recent completed tests
         if self.completed_tests:
-            print("\n" + "─" * 80)
-            print("RECENT COMPLETIONS:")
-            for test_data in self.completed_tests[-5:]:  # Last 5
-                print(self.generate_strip_report_line(test_data))
+            sections.append("\n" + "─" * 80)
+            sections.append("RECENT COMPLETIONS:")
+            for test_data in reversed(list(islice(reversed(self.completed_tests), 5))):  # Last 5
+                sections.append(self.generate_strip_report_line(test_data))
 
         # Display metrics
-        print(self.generate_metrics_grid(list(self.active_tests.values())))
+        sections.append(self.generate_metrics_grid(list(self.active_tests.values())))
 
         # Footer with instructions
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Press Ctrl+C to exit | Voice reports: ENABLED | UI sync: ACTIVE")
+        sections.append(f"\n[{datetime.now().strftime('%H:%M:%S')}] Press Ctrl+C to exit | Voice reports: ENABLED | UI sync: ACTIVE")
+
+        return "\n".join(sections).split("\n")
+
+    async def refresh_display(self):
+        """Refresh the ASCII display now"""
+        self.renderer.render(self.compose_frame())
+
+    def request_refresh(self):
+        """Mark the display stale; the display loop draws it at its next frame"""
+        if self.display_dirty.is_set():
+            self.coalesced_updates += 1
+        self.display_dirty.set()
+
+    async def display_loop(self):
+        """Redraw on updates, at most DISPLAY_FPS times per second"""
+        self.display_loop_active = True
+        try:
+            while self.running:
+                await self.display_dirty.wait()
+                wait = self.renderer.last_render + self.renderer.min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.display_dirty.clear()
+                await self.refresh_display()
+        finally:
+            self.display_loop_active = False
 
     async def simulate_test_data(self):
         """Simulate test data for demonstration"""
@@ -333,9 +484,10 @@ class RealTimeAsciiMonitor:
         # Start tasks
         monitor_task = asyncio.create_task(self.monitor_test_stream())
         voice_task = asyncio.create_task(self.periodic_voice_updates())
+        display_task = asyncio.create_task(self.display_loop())
 
         try:
-            await asyncio.gather(monitor_task, voice_task)
+            await asyncio.gather(monitor_task, voice_task, display_task)
         except KeyboardInterrupt:
             print(f"\n[MONITOR] Shutting down gracefully...")
             self.running = False
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+CTAS-7 Terminal Frame Renderer
+Flicker-free full-screen ASCII dashboards that rewrite only the lines that changed
+"""
+
+import sys
+import time
+from typing import List, Optional
+
+# Upper bound on dashboard redraws per second; updates in between share one frame
+DISPLAY_FPS = 10
+
+class TerminalFrameRenderer:
+    """Draws full-screen text frames, rewriting only the lines that changed"""
+
+    def __init__(self, stream=None, fps: float = DISPLAY_FPS):
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / fps
+        self.last_render = 0.0
+        self.frames = 0
+        self.lines_written = 0
+        self._previous: Optional[List[str]] = None
+
+    def invalidate(self):
+        """Forget the previous frame so the next one repaints the whole screen"""
+        self._previous = None
+
+    def render(self, lines: List[str]) -> int:
+        """Draw a frame and return how many lines had to be written"""
+        previous = self._previous
+        if previous is None:
+            output = ['\033[2J']
+            changed = list(range(len(lines)))
+            previous = []
+        else:
+            output = []
+            changed = [i for i, line in enumerate(lines) if i >= len(previous) or previous[i] != line]
+
+        for i in changed:
+            output.append(f'\033[{i + 1};1H{lines[i]}\033[K')
+        if len(lines) < len(previous):
+            output.append(f'\033[{len(lines) + 1};1H\033[J')
+        # Park the cursor below the frame
+        output.append(f'\033[{len(lines) + 1};1H')
+
+        self.stream.write(''.join(output))
+        self.stream.flush()
+
+        self._previous = list(lines)
+        self.last_render = time.monotonic()
+        self.frames += 1
+        self.lines_written += len(changed)
+        return len(changed)
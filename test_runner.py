@@ -7,9 +7,14 @@ Comprehensive testing framework for ASCII output and voice reporting system
 import asyncio
 import sys
 import os
+import io
 import json
+import argparse
+import contextlib
+import multiprocessing
 import subprocess
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 import threading
@@ -21,11 +26,37 @@ from ascii_test_output_agent import AsciiTestOutputAgent
 from voice_test_reporter import VoiceTestReporter
 from real_time_ascii_monitor import RealTimeAsciiMonitor
 
+# Independent test methods, in reporting order
+SYNC_TESTS = [
+    "test_ascii_agent_basic",
+    "test_voice_reporter_basic",
+    "test_realtime_monitor_basic",
+    "test_json_format_validation",
+    "test_error_handling",
+]
+ASYNC_TESTS = [
+    "test_integration_mock_data",
+]
+
+# Slowest tests listed in the summary and timing report
+SLOWEST_N = 5
+
+def _run_isolated_test(method_name: str) -> Dict:
+    """Run one synchronous test in a fresh runner (executed in a worker process)"""
+    runner = TestRunner()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        runner.run_timed(method_name)
+    return {"results": runner.test_results, "timings": runner.timings, "output": output.getvalue()}
+
 class TestRunner:
     def __init__(self):
         self.test_results = []
         self.failed_tests = []
         self.passed_tests = []
+        self.timings = []
+        self.mode = "sequential"
+        self.wall_seconds = 0.0
 
     def log_test_result(self, test_name: str, status: str, details: str = ""):
         """Log test result"""
@@ -42,6 +73,55 @@ class TestRunner:
         else:
             self.failed_tests.append(result)
 
+    def _record_timing(self, method_name: str, kind: str, seconds: float, first_result: int):
+        statuses = [result["status"] for result in self.test_results[first_result:]]
+        self.timings.append({
+            "test": method_name,
+            "kind": kind,
+            "seconds": round(seconds, 4),
+            "status": "PASS" if statuses and all(status == "PASS" for status in statuses) else "FAIL"
+        })
+
+    def run_timed(self, method_name: str):
+        """Run a synchronous test method and record its wall time"""
+        first_result = len(self.test_results)
+        start = time.perf_counter()
+        getattr(self, method_name)()
+        self._record_timing(method_name, "sync", time.perf_counter() - start, first_result)
+
+    async def run_timed_async(self, method_name: str):
+        """Run an async test method and record its wall time"""
+        first_result = len(self.test_results)
+        start = time.perf_counter()
+        await getattr(self, method_name)()
+        self._record_timing(method_name, "async", time.perf_counter() - start, first_result)
+
+    def merge(self, results: List[Dict], timings: List[Dict]):
+        """Fold results from an isolated runner into this one"""
+        for result in results:
+            self.log_test_result(result["test_name"], result["status"], result["details"])
+            self.test_results[-1]["timestamp"] = result["timestamp"]
+        self.timings.extend(timings)
+
+    def slowest_tests(self, count: int = SLOWEST_N) -> List[Dict]:
+        return sorted(self.timings, key=lambda timing: timing["seconds"], reverse=True)[:count]
+
+    def timing_report(self, slowest: int = SLOWEST_N) -> Dict:
+        """Per-test wall times for the last run"""
+        return {
+            "mode": self.mode,
+            "timestamp": datetime.now().isoformat(),
+            "wall_seconds": round(self.wall_seconds, 4),
+            "sum_test_seconds": round(sum(timing["seconds"] for timing in self.timings), 4),
+            "tests": self.timings,
+            "slowest": self.slowest_tests(slowest)
+        }
+
+    def write_timing_report(self, path: str, slowest: int = SLOWEST_N):
+        with open(path, 'w') as f:
+            json.dump(self.timing_report(slowest), f, indent=2)
+        print(f"⏱️  Timing report written to {path}")
+
     def print_test_header(self, test_name: str):
         """Print formatted test header"""
         print(f"\n{'='*80}")
@@ -242,15 +322,19 @@ class TestRunner:
                 ]
             }
 
-            # Test ASCII agent processing
-            results = ascii_agent.real_time_monitor(test_scenario)
+            # Test ASCII agent processing; the monitor sleeps between steps, so it
+            # runs in a thread to keep the event loop free for concurrent tests
+            results = await asyncio.to_thread(ascii_agent.real_time_monitor, test_scenario)
             assert results["test_id"] == "integration_test_scenario"
             assert results["status"] == "PASSED"
 
             # Test voice report creation
-            voice_report = await voice_reporter.create_voice_report(results, "test_completion", "medium")
-            assert voice_report.agent_name == "Natasha Volkov"
-            assert "integration test scenario" in voice_report.voice_text.lower()
+            try:
+                voice_report = await voice_reporter.create_voice_report(results, "test_completion", "medium")
+                assert voice_report.agent_name == "Natasha Volkov"
+                assert "integration test scenario" in voice_report.voice_text.lower()
+            finally:
+                await voice_reporter.close()
 
             # Test Supabase payload generation
             supabase_payload = ascii_agent.log_to_supabase(results)
@@ -318,33 +402,78 @@ class TestRunner:
             for test in self.failed_tests:
                 print(f"   • {test['test_name']}: {test['details']}")
 
+        if self.timings:
+            print(f"\n⏱️  Wall time: {self.wall_seconds:.2f}s ({self.mode}) - slowest tests:")
+            for timing in self.slowest_tests():
+                print(f"   {timing['seconds']:8.3f}s  {timing['test']} [{timing['status']}]")
+
         if passed_count == total_tests:
             print(f"\n🎉 ALL TESTS PASSED! System ready for deployment.")
         else:
             print(f"\n⚠️  Some tests failed. Review before deployment.")
 
-    async def run_all_tests(self):
+    async def _run_async_isolated(self, method_name: str) -> "TestRunner":
+        runner = TestRunner()
+        await runner.run_timed_async(method_name)
+        return runner
+
+    async def run_parallel(self, workers: Optional[int] = None):
+        """Run sync tests in separate processes and async tests concurrently.
+
+        Every test gets its own TestRunner, and sync tests run in freshly spawned
+        interpreters, so module-level state is never shared between tests.
+        Output from worker processes is printed in test order once they finish.
+        """
+        loop = asyncio.get_running_loop()
+        workers = workers or min(len(SYNC_TESTS), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            sync_runs = asyncio.gather(*(loop.run_in_executor(pool, _run_isolated_test, name) for name in SYNC_TESTS))
+            async_runs = asyncio.gather(*(self._run_async_isolated(name) for name in ASYNC_TESTS))
+            sync_outcomes, async_runners = await asyncio.gather(sync_runs, async_runs)
+
+        for outcome in sync_outcomes:
+            print(outcome["output"], end="")
+            self.merge(outcome["results"], outcome["timings"])
+        for runner in async_runners:
+            self.merge(runner.test_results, runner.timings)
+
+    async def run_all_tests(self, parallel: bool = False, workers: Optional[int] = None):
         """Run all test scenarios"""
         print("🚀 Starting CTAS-7 Test Output System Validation")
         print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-        # Run synchronous tests
-        self.test_ascii_agent_basic()
-        self.test_voice_reporter_basic()
-        self.test_realtime_monitor_basic()
-        self.test_json_format_validation()
-        self.test_error_handling()
+        self.mode = "parallel" if parallel else "sequential"
+        start = time.perf_counter()
+
+        if parallel:
+            await self.run_parallel(workers)
+        else:
+            # Run synchronous tests
+            for name in SYNC_TESTS:
+                self.run_timed(name)
 
-        # Run async tests
-        await self.test_integration_mock_data()
+            # Run async tests
+            for name in ASYNC_TESTS:
+                await self.run_timed_async(name)
+
+        self.wall_seconds = time.perf_counter() - start
 
         # Print summary
         self.print_summary()
 
 def main():
     """Main test execution"""
+    parser = argparse.ArgumentParser(description="CTAS-7 test output system validation")
+    parser.add_argument("--parallel", action="store_true", help="Run independent tests concurrently")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for sync tests in parallel mode")
+    parser.add_argument("--timing-report", metavar="PATH", help="Write per-test wall times as JSON")
+    parser.add_argument("--slowest", type=int, default=SLOWEST_N, help="Slowest tests to include in the timing report")
+    args = parser.parse_args()
+
     runner = TestRunner()
-    asyncio.run(runner.run_all_tests())
+    asyncio.run(runner.run_all_tests(parallel=args.parallel, workers=args.workers))
+    if args.timing_report:
+        runner.write_timing_report(args.timing_report, args.slowest)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
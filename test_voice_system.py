@@ -207,7 +207,10 @@ class VoiceSystemTester:
 async def main():
     """Main test execution"""
     tester = VoiceSystemTester()
-    await tester.run_all_tests()
+    try:
+        await tester.run_all_tests()
+    finally:
+        await tester.voice_reporter.close()
 
 if __name__ == "__main__":
     # Ensure we have the API key
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+CTAS-7 Voice Report Sink
+Buffers voice reports and writes them in batches to a local stand-in for the Supabase voice_reports table
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+# Local store for voice reports: "sqlite", "jsonl" or "none"
+REPORT_SINK_BACKEND = os.getenv('VOICE_REPORT_SINK', 'sqlite')
+REPORT_SINK_PATH = os.getenv(
+    'VOICE_REPORT_SINK_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                 'voice_reports.jsonl' if REPORT_SINK_BACKEND == 'jsonl' else 'voice_reports.db')
+)
+# Flush once this many reports are buffered, or this many seconds after the first one
+REPORT_BATCH_SIZE = int(os.getenv('VOICE_REPORT_BATCH_SIZE', '100'))
+REPORT_FLUSH_INTERVAL = float(os.getenv('VOICE_REPORT_FLUSH_INTERVAL', '2.0'))
+
+# Mirrors the Supabase voice_reports table; test_context is stored as JSON text
+VOICE_REPORT_COLUMNS = (
+    "voice_report_id", "agent_name", "voice_text", "test_context",
+    "priority", "timestamp", "blockchain_hash", "audio_url"
+)
+
+class VoiceReportSink:
+    """Collects voice report rows and writes each batch in one transaction off the event loop.
+
+    ``add`` only appends to a buffer. A flush runs when ``batch_size`` rows are
+    waiting or ``flush_interval`` seconds after the first buffered row, so
+    high-frequency test runs do not pay for I/O per report.
+    """
+
+    def __init__(
+        self,
+        path: str = REPORT_SINK_PATH,
+        backend: str = REPORT_SINK_BACKEND,
+        batch_size: int = REPORT_BATCH_SIZE,
+        flush_interval: float = REPORT_FLUSH_INTERVAL
+    ):
+        self.path = path
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: List[Dict] = []
+        self.written = 0
+        self.batches = 0
+        self.rejected = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._batch_flush: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def add(self, row: Dict):
+        """Buffer one report row (a dict with VOICE_REPORT_COLUMNS keys)"""
+        if self.backend == 'none':
+            return
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            if self._batch_flush is None or self._batch_flush.done():
+                self._batch_flush = asyncio.get_running_loop().create_task(self.flush())
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Write everything buffered so far"""
+        async with self._flush_lock:
+            if not self.buffer:
+                return
+            batch, self.buffer = self.buffer, []
+            try:
+                rejected = await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                # Keep the rows and retry after the flush interval rather than
+                # waiting for the next add
+                self.buffer[:0] = batch
+                print(f"[SINK] Voice report flush failed ({len(batch)} rows kept): {e}")
+                if self._timer is None and not self._closing:
+                    self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+                return
+            if rejected:
+                # Never retried: the same rows would clash again
+                self.rejected += len(rejected)
+                print(f"[SINK] ERROR: {len(rejected)} voice reports rejected as duplicate IDs: {', '.join(rejected)}")
+            self.written += len(batch) - len(rejected)
+            self.batches += 1
+
+    def _write_batch(self, batch: List[Dict]) -> List[str]:
+        """Write one batch; returns the IDs of rows rejected because the ID already exists"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if self.backend == 'jsonl':
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(row) + '\n' for row in batch))
+            return []
+
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS voice_reports ("
+                " voice_report_id TEXT PRIMARY KEY, agent_name TEXT, voice_text TEXT, test_context TEXT,"
+                " priority TEXT, timestamp TEXT, blockchain_hash TEXT, audio_url TEXT)"
+            )
+        insert = (f"INSERT INTO voice_reports ({', '.join(VOICE_REPORT_COLUMNS)}) "
+                  f"VALUES ({', '.join('?' for _ in VOICE_REPORT_COLUMNS)})")
+        rows = [tuple(row.get(column) for column in VOICE_REPORT_COLUMNS) for row in batch]
+        try:
+            with self._conn:
+                self._conn.executemany(insert, rows)
+            return []
+        except sqlite3.IntegrityError:
+            pass
+
+        # A clashing ID rolled the batch back; keep the good rows and report the rest
+        rejected = []
+        with self._conn:
+            for row in rows:
+                try:
+                    self._conn.execute(insert, row)
+                except sqlite3.IntegrityError:
+                    rejected.append(str(row[0]))
+        return rejected
+
+    async def close(self):
+        """Flush outstanding rows and release the store"""
+        self._closing = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._batch_flush is not None:
+            await asyncio.gather(self._batch_flush, return_exceptions=True)
+            self._batch_flush = None
+        await self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "backend": self.backend,
+            "path": self.path,
+            "buffered": len(self.buffer),
+            "written": self.written,
+            "rejected": self.rejected,
+            "batches": self.batches
+        }
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+CTAS-7 Voice Templates
+Precompiled report templates, a render cache and a phrase-level audio cache
+"""
+
+import re
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in _SENTENCE_BREAK.split(text.strip()) if sentence]
+
+class CompiledTemplate:
+    """A format string parsed once into literal text and field lookups.
+
+    Sentences of the template that contain no fields are "stock" sentences:
+    they read the same in every render, so their audio can be reused.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: List[Tuple[str, Optional[str], str]] = [
+            (literal, field, spec or '') for literal, field, spec, _ in Formatter().parse(source)
+        ]
+        self.stock_sentences: Set[str] = {s for s in split_sentences(source) if '{' not in s}
+
+    def render(self, fields: Dict) -> str:
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(fields[field], spec))
+        return ''.join(out)
+
+def compile_templates(sources: Dict[str, str]) -> Dict[str, CompiledTemplate]:
+    return {name: CompiledTemplate(source) for name, source in sources.items()}
+
+class RenderCache:
+    """LRU of rendered texts keyed by (report_type, variant, salient fields)"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key: Hashable, template: CompiledTemplate, fields: Dict) -> str:
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = template.render(fields)
+        self._entries[key] = text
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return text
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+class PhraseAudioCache:
+    """LRU of synthesized sentence audio, bounded by total bytes"""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        audio = self._entries.get(key)
+        if audio is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return audio
+
+    def put(self, key: Hashable, audio: bytes):
+        if len(audio) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self._entries[key] = audio
+        self.size_bytes += len(audio)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def get_stats(self) -> Dict:
+        return {"entries": len(self._entries), "size_bytes": self.size_bytes, "hits": self.hits, "misses": self.misses}
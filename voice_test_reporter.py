@@ -9,10 +9,68 @@ import asyncio
 import json
 import requests
 import hashlib
+import uuid
+import time
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from typing import Dict, List, Optional
 import websockets
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from functools import lru_cache
+from voice_report_sink import VoiceReportSink
+from voice_templates import PhraseAudioCache, RenderCache, compile_templates, split_sentences
+
+# Reports kept in memory for conversational context; everything is persisted by the sink
+HISTORY_LIMIT = 200
+
+# Seconds before a stock passage whose synthesis failed is tried again
+PHRASE_RETRY_SECONDS = 60.0
+
+# Report wording, compiled once; "<report_type>:<variant>" picks a branch
+REPORT_TEMPLATES = compile_templates({
+    "test_start": "Hi, this is {agent}. I'm starting the {test} now. This is a {test_type} test that should take about {estimated_duration} seconds. I'll keep you updated on the progress.",
+    "test_progress": "Update on {test} - we're {status_phrase} at {progress:.0f} percent. Currently working on {step}. Everything looks good so far.",
+    "test_completion:passed": "Great news! The {test} completed successfully in {duration:.1f} seconds. All objectives were met and the system is ready for the next phase.",
+    "test_completion:failed": "I need to report an issue. The {test} failed after {duration:.1f} seconds due to {failure_reason}. I recommend a manual review before proceeding.",
+    "test_completion:other": "The {test} finished with status {status} after {duration:.1f} seconds. Please check the detailed logs for more information.",
+    "critical_alert": "Critical alert from {agent}. The {test} has encountered a serious issue: {issue}. Immediate attention required. I'm halting automated processes until this is resolved.",
+    "status_summary:quiet": "System status from {agent}: All quiet here. No active tests running and we're ready for new test execution whenever you are.",
+    "status_summary:header": "Status update from {agent}. ",
+    "status_summary:active": "I'm currently monitoring {active} active test{active_plural}. ",
+    "status_summary:issues": "I'm seeing {issues} test{issues_plural} with issues that may need attention. ",
+    "status_summary:completed": "Today we've completed {completed} tests - {passed} passed and {failed} failed. ",
+    "status_summary:recent_failure": "The most recent failure was {recent_failure}. ",
+    "conversation:problem": "The main issue I'm seeing is with the {test} test. It failed due to {reason}. Would you like me to provide more details or should we retry?",
+    "conversation:no_problem": "I'm not seeing any current problems. All recent tests have been passing normally. Is there something specific you're concerned about?",
+    "conversation:next": "Based on the current test results, I'd recommend reviewing any failed tests first, then we can proceed with the next phase of testing. Would you like me to prioritize any specific test types?",
+    "conversation:help": "I'm here to help with test monitoring and reporting. You can ask me about test status, current issues, or what we should do next. What would you like to know?",
+})
+
+# Sentences that read the same in every report; their audio is synthesized once
+STOCK_PHRASES = frozenset().union(*(template.stock_sentences for template in REPORT_TEMPLATES.values()))
+
+@lru_cache(maxsize=1024)
+def readable_test_name(test_id: str) -> str:
+    """Clean up test ID for natural speech"""
+    return test_id.replace('_', ' ').replace('docker', 'Docker').title()
+
+@lru_cache(maxsize=1024)
+def classify_query(query: str) -> str:
+    """Map a user query to the conversational intent that answers it"""
+    query = query.lower()
+    if 'status' in query or 'how' in query:
+        return "status"
+    if 'problem' in query or 'issue' in query or 'wrong' in query:
+        return "problem"
+    if 'next' in query or 'what should' in query:
+        return "next"
+    return "help"
+
+def canonical_json_bytes(data) -> bytes:
+    """Stable encoding used both for hashing and for the stored test context"""
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode()
 
 @dataclass
 class VoiceReport:
@@ -24,6 +82,21 @@ class VoiceReport:
     priority: str  # 'critical', 'high', 'medium', 'low'
     timestamp: datetime
     blockchain_hash: str
+    coalesce_key: Optional[str] = None  # Newer reports with the same key supersede queued ones
+    canonical_context: bytes = field(default=b'', repr=False)  # test_context as hashed and stored
+
+    def to_synthesis_request(self, agent_id: str = "natasha") -> Dict:
+        """Build a voice server synthesis_request carrying priority and coalescing hints"""
+        return {
+            "type": "synthesis_request",
+            "message_id": self.report_id,
+            "agent_id": agent_id,
+            "content": {
+                "text": self.voice_text,
+                "priority": self.priority,
+                "coalesce_key": self.coalesce_key
+            }
+        }
 
 class VoiceTestReporter:
     def __init__(self):
@@ -31,7 +104,15 @@ class VoiceTestReporter:
         self.secondary_agent = "Elena Rodriguez"
         self.voice_enabled = True
         self.elevenlabs_api_key = "demo_key"  # In production, use environment variable
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=HISTORY_LIMIT)
+        self.report_count = 0
+        self.report_sink = VoiceReportSink()
+        # Hash state with the agent already absorbed; copied for each report
+        self._report_hasher = hashlib.blake2b(self.agent_name.encode())
+        self.render_cache = RenderCache()
+        self.phrase_audio = PhraseAudioCache()
+        self._warming: Dict[str, asyncio.Task] = {}
+        self._warm_failed_at: Dict[str, float] = {}
         self.user_preferences = {
             "detail_level": "medium",  # 'brief', 'medium', 'detailed'
             "voice_speed": "normal",
@@ -57,24 +138,29 @@ class VoiceTestReporter:
         else:
             return f"Unknown report type: {report_type}"
 
+    def _render(self, name: str, **fields) -> str:
+        """Render a compiled template, reusing the text for identical salient fields"""
+        key = (name, tuple(sorted(fields.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # A dict or list from test_data cannot key the cache; render it directly
+            return REPORT_TEMPLATES[name].render(fields)
+        return self.render_cache.render(key, REPORT_TEMPLATES[name], fields)
+
     def _generate_test_start_report(self, test_data: Dict) -> str:
         """Generate natural voice report for test start"""
-        test_id = test_data.get('test_id', 'unknown test')
-        test_type = test_data.get('test_type', 'general')
-
-        # Clean up test ID for natural speech
-        readable_test = test_id.replace('_', ' ').replace('docker', 'Docker').title()
-
-        return f"Hi, this is {self.agent_name}. I'm starting the {readable_test} now. This is a {test_type} test that should take about {test_data.get('estimated_duration', 'a few')} seconds. I'll keep you updated on the progress."
+        return self._render(
+            "test_start",
+            agent=self.agent_name,
+            test=readable_test_name(test_data.get('test_id', 'unknown test')),
+            test_type=test_data.get('test_type', 'general'),
+            estimated_duration=test_data.get('estimated_duration', 'a few')
+        )
 
     def _generate_progress_report(self, test_data: Dict) -> str:
         """Generate natural voice report for test progress"""
-        test_id = test_data.get('test_id', 'unknown test')
         progress = test_data.get('progress_percentage', 0)
-        current_step = test_data.get('current_step', 'unknown step')
-
-        readable_test = test_id.replace('_', ' ').replace('docker', 'Docker').title()
-        readable_step = current_step.replace('_', ' ').title()
 
         if progress < 25:
             status_phrase = "just getting started"
@@ -85,82 +171,93 @@ class VoiceTestReporter:
         else:
             status_phrase = "almost finished"
 
-        return f"Update on {readable_test} - we're {status_phrase} at {progress:.0f} percent. Currently working on {readable_step}. Everything looks good so far."
+        return self._render(
+            "test_progress",
+            test=readable_test_name(test_data.get('test_id', 'unknown test')),
+            status_phrase=status_phrase,
+            progress=round(progress),
+            step=readable_test_name(test_data.get('current_step', 'unknown step'))
+        )
 
     def _generate_completion_report(self, test_data: Dict) -> str:
         """Generate natural voice report for test completion"""
-        test_id = test_data.get('test_id', 'unknown test')
         status = test_data.get('status', 'unknown')
-        duration = test_data.get('duration', 0)
-
-        readable_test = test_id.replace('_', ' ').replace('docker', 'Docker').title()
+        fields = {
+            "test": readable_test_name(test_data.get('test_id', 'unknown test')),
+            "duration": round(test_data.get('duration', 0), 1)
+        }
 
         if status == "PASSED":
-            return f"Great news! The {readable_test} completed successfully in {duration:.1f} seconds. All objectives were met and the system is ready for the next phase."
+            return self._render("test_completion:passed", **fields)
         elif status == "FAILED":
-            failure_reason = test_data.get('failure_reason', 'unspecified error')
-            return f"I need to report an issue. The {readable_test} failed after {duration:.1f} seconds due to {failure_reason}. I recommend a manual review before proceeding."
+            return self._render("test_completion:failed", failure_reason=test_data.get('failure_reason', 'unspecified error'), **fields)
         else:
-            return f"The {readable_test} finished with status {status} after {duration:.1f} seconds. Please check the detailed logs for more information."
+            return self._render("test_completion:other", status=status, **fields)
 
     def _generate_critical_alert(self, test_data: Dict) -> str:
         """Generate urgent voice alert for critical issues"""
-        test_id = test_data.get('test_id', 'unknown test')
-        issue = test_data.get('critical_issue', 'unspecified critical error')
-
-        readable_test = test_id.replace('_', ' ').replace('docker', 'Docker').title()
-
-        return f"Critical alert from {self.agent_name}. The {readable_test} has encountered a serious issue: {issue}. Immediate attention required. I'm halting automated processes until this is resolved."
+        return self._render(
+            "critical_alert",
+            agent=self.agent_name,
+            test=readable_test_name(test_data.get('test_id', 'unknown test')),
+            issue=test_data.get('critical_issue', 'unspecified critical error')
+        )
 
     def _generate_status_summary(self, test_data: Dict) -> str:
         """Generate comprehensive status summary"""
         active_tests = test_data.get('active_tests', [])
         completed_tests = test_data.get('completed_tests', [])
-        failed_tests = [t for t in completed_tests if t.get('status') == 'FAILED']
 
         if not active_tests and not completed_tests:
-            return f"System status from {self.agent_name}: All quiet here. No active tests running and we're ready for new test execution whenever you are."
+            return self._render("status_summary:quiet", agent=self.agent_name)
 
-        summary = f"Status update from {self.agent_name}. "
+        summary = self._render("status_summary:header", agent=self.agent_name)
 
         if active_tests:
-            summary += f"I'm currently monitoring {len(active_tests)} active test{'s' if len(active_tests) != 1 else ''}. "
+            active = len(active_tests)
+            summary += self._render("status_summary:active", active=active, active_plural='s' if active != 1 else '')
 
             # Check for any issues
-            issues = [t for t in active_tests if t.get('health_indicator') == '🔴']
+            issues = sum(1 for t in active_tests if t.get('health_indicator') == '🔴')
             if issues:
-                summary += f"I'm seeing {len(issues)} test{'s' if len(issues) != 1 else ''} with issues that may need attention. "
+                summary += self._render("status_summary:issues", issues=issues, issues_plural='s' if issues != 1 else '')
 
         if completed_tests:
-            passed_count = len(completed_tests) - len(failed_tests)
-            summary += f"Today we've completed {len(completed_tests)} tests - {passed_count} passed and {len(failed_tests)} failed. "
+            failed_tests = [t for t in completed_tests if t.get('status') == 'FAILED']
+            summary += self._render(
+                "status_summary:completed",
+                completed=len(completed_tests),
+                passed=len(completed_tests) - len(failed_tests),
+                failed=len(failed_tests)
+            )
 
             if failed_tests:
                 recent_failure = failed_tests[-1].get('test_id', 'unknown test')
-                summary += f"The most recent failure was {recent_failure.replace('_', ' ')}. "
+                summary += self._render("status_summary:recent_failure", recent_failure=recent_failure.replace('_', ' '))
 
         return summary
 
     def _generate_conversational_response(self, query_data: Dict) -> str:
         """Generate conversational response to user queries"""
-        query = query_data.get('user_query', '').lower()
+        intent = classify_query(query_data.get('user_query', ''))
         context = query_data.get('context', {})
 
-        if 'status' in query or 'how' in query:
+        if intent == "status":
             return self._generate_status_summary(context)
-        elif 'problem' in query or 'issue' in query or 'wrong' in query:
+        elif intent == "problem":
             failed_tests = [t for t in context.get('completed_tests', []) if t.get('status') == 'FAILED']
             if failed_tests:
                 latest_failure = failed_tests[-1]
-                test_name = latest_failure.get('test_id', 'unknown test').replace('_', ' ')
-                reason = latest_failure.get('failure_reason', 'unspecified error')
-                return f"The main issue I'm seeing is with the {test_name} test. It failed due to {reason}. Would you like me to provide more details or should we retry?"
-            else:
-                return "I'm not seeing any current problems. All recent tests have been passing normally. Is there something specific you're concerned about?"
-        elif 'next' in query or 'what should' in query:
-            return "Based on the current test results, I'd recommend reviewing any failed tests first, then we can proceed with the next phase of testing. Would you like me to prioritize any specific test types?"
+                return self._render(
+                    "conversation:problem",
+                    test=latest_failure.get('test_id', 'unknown test').replace('_', ' '),
+                    reason=latest_failure.get('failure_reason', 'unspecified error')
+                )
+            return self._render("conversation:no_problem")
+        elif intent == "next":
+            return self._render("conversation:next")
         else:
-            return f"I'm here to help with test monitoring and reporting. You can ask me about test status, current issues, or what we should do next. What would you like to know?"
+            return self._render("conversation:help")
 
     async def create_voice_report(self, test_data: Dict, report_type: str, priority: str = "medium") -> VoiceReport:
         """Create a structured voice report"""
@@ -168,17 +265,20 @@ class VoiceTestReporter:
         # Generate natural voice text
         voice_text = self.generate_natural_voice_text(test_data, report_type)
 
-        # Create report ID
-        report_id = f"voice_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(self.conversation_history)}"
-
-        # Generate blockchain hash for verification
-        report_content = {
-            "agent": self.agent_name,
-            "text": voice_text,
-            "test_data": test_data,
-            "timestamp": datetime.now().isoformat()
-        }
-        blockchain_hash = hashlib.blake2b(json.dumps(report_content, sort_keys=True).encode()).hexdigest()
+        # Create report ID; the uuid suffix keeps IDs unique across reporters,
+        # processes and restarts that share one report store
+        now = datetime.now()
+        report_id = f"voice_report_{now.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}"
+        self.report_count += 1
+
+        # Generate blockchain hash for verification, fed field by field with
+        # canonical bytes instead of serializing one combined document
+        test_context = canonical_json_bytes(test_data)
+        hasher = self._report_hasher.copy()
+        for part in (voice_text.encode(), test_context, now.isoformat().encode()):
+            hasher.update(len(part).to_bytes(8, 'big'))
+            hasher.update(part)
+        blockchain_hash = hasher.hexdigest()
 
         # Create voice report
         voice_report = VoiceReport(
@@ -187,8 +287,11 @@ class VoiceTestReporter:
             test_context=test_data,
             voice_text=voice_text,
             priority=priority,
-            timestamp=datetime.now(),
-            blockchain_hash=blockchain_hash
+            timestamp=now,
+            blockchain_hash=blockchain_hash,
+            # Progress chatter for a test is superseded by its next update
+            coalesce_key=f"test_progress:{test_data.get('test_id')}" if report_type == "test_progress" else None,
+            canonical_context=test_context
         )
 
         # Add to conversation history
@@ -217,7 +320,57 @@ class VoiceTestReporter:
         # Log to Supabase for UI consumption
         await self._log_voice_report_to_supabase(voice_report)
 
-    async def _elevenlabs_synthesize(self, text: str):
+    async def _elevenlabs_synthesize(self, text: str) -> bytes:
+        """Synthesize a report, reusing cached audio for its stock passages.
+
+        Adjacent stock sentences form one passage, cached as a unit. Only when
+        every passage of the report is cached are the sentences between them
+        synthesized on their own; otherwise the whole report is one call, as
+        without the cache, and missing passages are warmed in the background.
+        """
+        segments = []  # [is_stock, text]
+        for sentence in split_sentences(text):
+            is_stock = sentence in STOCK_PHRASES
+            if segments and segments[-1][0] == is_stock:
+                segments[-1][1] += ' ' + sentence
+            else:
+                segments.append([is_stock, sentence])
+
+        cached = {passage: self.phrase_audio.get(passage) for is_stock, passage in segments if is_stock}
+        missing = [passage for passage, audio in cached.items() if audio is None]
+        if not cached or missing:
+            for passage in missing:
+                self._warm_passage(passage)
+            return await self._synthesize_phrase(text)
+
+        audio = []
+        for is_stock, passage in segments:
+            audio.append(cached[passage] if is_stock else await self._synthesize_phrase(passage))
+        return b''.join(audio)
+
+    def _warm_passage(self, passage: str):
+        """Synthesize a stock passage for later reports, once at a time"""
+        failed_at = self._warm_failed_at.get(passage)
+        if passage in self._warming or (failed_at and time.monotonic() - failed_at < PHRASE_RETRY_SECONDS):
+            return
+        self._warming[passage] = asyncio.get_running_loop().create_task(self._warm(passage))
+
+    async def _warm(self, passage: str):
+        try:
+            audio = await self._synthesize_phrase(passage)
+            if audio:
+                self.phrase_audio.put(passage, audio)
+                self._warm_failed_at.pop(passage, None)
+            else:
+                # Empty audio means the call failed; never cache it
+                self._warm_failed_at[passage] = time.monotonic()
+        except Exception as e:
+            self._warm_failed_at[passage] = time.monotonic()
+            print(f"[ELEVENLABS] Phrase warm-up failed: {e}")
+        finally:
+            self._warming.pop(passage, None)
+
+    async def _synthesize_phrase(self, text: str) -> bytes:
         """Synthesize speech using ElevenLabs API (mock implementation)"""
 
         # Mock API call - in production this would be:
@@ -229,23 +382,33 @@ class VoiceTestReporter:
 
         print(f"[ELEVENLABS] Synthesizing: '{text[:50]}...' for voice agent {self.agent_name}")
         await asyncio.sleep(0.5)  # Simulate API call delay
+        return b''
 
     async def _log_voice_report_to_supabase(self, voice_report: VoiceReport):
         """Log voice report to Supabase for React/iOS consumption"""
 
+        canonical_context = voice_report.canonical_context or canonical_json_bytes(voice_report.test_context)
         supabase_payload = {
             "voice_report_id": voice_report.report_id,
             "agent_name": voice_report.agent_name,
             "voice_text": voice_report.voice_text,
-            "test_context": voice_report.test_context,
+            "test_context": canonical_context.decode(),
             "priority": voice_report.priority,
             "timestamp": voice_report.timestamp.isoformat(),
             "blockchain_hash": voice_report.blockchain_hash,
             "audio_url": f"https://ctas7-audio.internal/{voice_report.report_id}.mp3"  # Mock URL
         }
 
-        print(f"[SUPABASE] Logging voice report: {voice_report.report_id}")
-        # In production: await supabase.table('voice_reports').insert(supabase_payload)
+        # Batched into the local voice_reports store; in production the same
+        # batches go to supabase.table('voice_reports').insert(rows)
+        self.report_sink.add(supabase_payload)
+
+    async def close(self):
+        """Flush buffered voice reports and stop phrase warm-up"""
+        for task in self._warming.values():
+            task.cancel()
+        await asyncio.gather(*self._warming.values(), return_exceptions=True)
+        await self.report_sink.close()
 
     async def handle_conversational_query(self, user_query: str, test_context: Dict) -> VoiceReport:
         """Handle natural language queries from user"""
@@ -253,7 +416,7 @@ class VoiceTestReporter:
         query_data = {
             "user_query": user_query,
             "context": test_context,
-            "conversation_history": [r.voice_text for r in self.conversation_history[-5:]]  # Last 5 exchanges
+            "conversation_history": [r.voice_text for r in reversed(list(islice(reversed(self.conversation_history), 5)))]  # Last 5 exchanges
         }
 
         # Create conversational response
@@ -360,7 +523,10 @@ class VoiceTestReporter:
 async def main():
     """Main execution function"""
     reporter = VoiceTestReporter()
-    await reporter.start_voice_monitoring()
+    try:
+        await reporter.start_voice_monitoring()
+    finally:
+        await reporter.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -18,10 +18,12 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from voice_test_reporter import VoiceTestReporter
+from websocket_broadcaster import Broadcaster
 
 class VoiceTestServer:
     def __init__(self):
         self.connected_clients = set()
+        self.broadcaster = Broadcaster("voice_test_server")
         self.voice_reporter = VoiceTestReporter()
         self.test_scenarios = []
         self.running = False
@@ -29,21 +31,18 @@ class VoiceTestServer:
     async def register_client(self, websocket):
         """Register new client connection"""
         self.connected_clients.add(websocket)
+        self.broadcaster.add(websocket)
         print(f"[VOICE SERVER] Client connected. Total clients: {len(self.connected_clients)}")
 
     async def unregister_client(self, websocket):
         """Unregister client connection"""
         self.connected_clients.discard(websocket)
+        await self.broadcaster.remove(websocket)
         print(f"[VOICE SERVER] Client disconnected. Total clients: {len(self.connected_clients)}")
 
     async def broadcast_voice_report(self, voice_report_data: Dict):
-        """Broadcast voice report to all connected clients"""
-        if self.connected_clients:
-            message = json.dumps(voice_report_data)
-            await asyncio.gather(
-                *[client.send(message) for client in self.connected_clients],
-                return_exceptions=True
-            )
+        """Broadcast voice report to all connected clients (queued per client, never waits on a slow one)"""
+        self.broadcaster.publish(voice_report_data)
 
     async def handle_client_message(self, websocket, message: str):
         """Handle incoming message from client"""
@@ -69,7 +68,7 @@ class VoiceTestServer:
                     'timestamp': voice_report.timestamp.isoformat(),
                     'blockchain_hash': voice_report.blockchain_hash
                 }
-                await websocket.send(json.dumps(response))
+                self.broadcaster.send_to(websocket, response)
 
             elif command == 'conversational_query':
                 # Handle natural language query
@@ -85,17 +84,17 @@ class VoiceTestServer:
                     'agent': voice_report.agent_name,
                     'timestamp': voice_report.timestamp.isoformat()
                 }
-                await websocket.send(json.dumps(response))
+                self.broadcaster.send_to(websocket, response)
 
             elif command == 'start_demo':
                 # Start demonstration scenario
                 await self.start_voice_demo_scenario(websocket)
 
             else:
-                await websocket.send(json.dumps({'error': f'Unknown command: {command}'}))
+                self.broadcaster.send_to(websocket, {'error': f'Unknown command: {command}'})
 
         except json.JSONDecodeError:
-            await websocket.send(json.dumps({'error': 'Invalid JSON format'}))
+            self.broadcaster.send_to(websocket, {'error': 'Invalid JSON format'})
 
     async def start_voice_demo_scenario(self, websocket):
         """Start a demonstration voice scenario"""
@@ -174,7 +173,7 @@ class VoiceTestServer:
                 'agent': voice_report.agent_name,
                 'timestamp': voice_report.timestamp.isoformat()
             }
-            await websocket.send(json.dumps(response))
+            self.broadcaster.send_to(websocket, response)
 
         # Final status summary
         await asyncio.sleep(2)
@@ -191,11 +190,11 @@ class VoiceTestServer:
             'medium'
         )
 
-        await websocket.send(json.dumps({
+        self.broadcaster.send_to(websocket, {
             'type': 'demo_complete',
             'summary': summary_report.voice_text,
             'agent': summary_report.agent_name
-        }))
+        })
 
     async def handle_connection(self, websocket, path):
         """Handle new WebSocket connection"""
@@ -213,7 +212,7 @@ class VoiceTestServer:
                 ],
                 'timestamp': datetime.now().isoformat()
             }
-            await websocket.send(json.dumps(welcome))
+            self.broadcaster.send_to(websocket, welcome)
 
             # Listen for messages
             async for message in websocket:
@@ -235,9 +234,17 @@ class VoiceTestServer:
 
         self.running = True
 
-        async with websockets.serve(self.handle_connection, host, port):
-            print(f"[VOICE SERVER] Server ready! Connect with WebSocket client")
-            await asyncio.Future()  # Run forever
+        try:
+            async with websockets.serve(self.handle_connection, host, port):
+                print(f"[VOICE SERVER] Server ready! Connect with WebSocket client")
+                await asyncio.Future()  # Run forever
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Disconnect broadcast clients and flush buffered voice reports"""
+        await self.broadcaster.close()
+        await self.voice_reporter.close()
 
 class VoiceTestClient:
     """Test client for voice system"""
@@ -8,10 +8,10 @@ import asyncio
 import websockets
 import json
 import os
-import requests
+import aiohttp
 import hashlib
 from datetime import datetime
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 import sys
 
 # Add current directory to path
@@ -19,12 +19,40 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from voice_test_reporter import VoiceTestReporter
 
+ELEVENLABS_BASE_URL = os.getenv('ELEVENLABS_BASE_URL', 'https://api.elevenlabs.io')
+# Upper bound on synthesis requests in flight to ElevenLabs (also the keep-alive pool size)
+TTS_MAX_CONCURRENCY = int(os.getenv('VOICE_TTS_MAX_CONCURRENCY', '8'))
+# Seconds for the whole synthesis request / for establishing the connection
+TTS_TIMEOUT = float(os.getenv('VOICE_TTS_TIMEOUT', '30'))
+TTS_CONNECT_TIMEOUT = float(os.getenv('VOICE_TTS_CONNECT_TIMEOUT', '5'))
+
 class VoiceWebSocketServer:
     def __init__(self):
         self.connected_clients: Set = set()
         self.voice_reporter = VoiceTestReporter()
         self.elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY', '')
         self.voice_id = "EXAVITQu4vr4xnSDxMaL"  # Natasha voice ID
+        self.max_concurrency = TTS_MAX_CONCURRENCY
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._synthesis_slots = asyncio.Semaphore(self.max_concurrency)
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session to ElevenLabs, created on first use inside the running loop"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                base_url=ELEVENLABS_BASE_URL,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=TTS_TIMEOUT, connect=TTS_CONNECT_TIMEOUT),
+                headers={"xi-api-key": self.elevenlabs_api_key}
+            )
+        return self._http_session
+
+    async def close(self):
+        """Release pooled upstream connections and flush buffered reports"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+        await self.voice_reporter.close()
 
     async def register_client(self, websocket):
         """Register new WebSocket client"""
@@ -57,12 +85,11 @@ class VoiceWebSocketServer:
             print("[VOICE] ElevenLabs API key not configured")
             return b''
 
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}"
+        url = f"/v1/text-to-speech/{self.voice_id}"
 
         headers = {
             "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self.elevenlabs_api_key
+            "Content-Type": "application/json"
         }
 
         data = {
@@ -75,12 +102,17 @@ class VoiceWebSocketServer:
         }
 
         try:
-            response = requests.post(url, json=data, headers=headers)
-            if response.status_code == 200:
-                return response.content
-            else:
-                print(f"[VOICE] ElevenLabs API error: {response.status_code}")
-                return b''
+            # Wait for a slot before starting the request so queueing time
+            # does not count against the request timeout
+            async with self._synthesis_slots:
+                async with self._get_http_session().post(url, json=data, headers=headers) as response:
+                    if response.status == 200:
+                        return await response.read()
+                    print(f"[VOICE] ElevenLabs API error: {response.status}")
+                    return b''
+        except asyncio.TimeoutError:
+            print(f"[VOICE] ElevenLabs request timed out after {TTS_TIMEOUT}s")
+            return b''
         except Exception as e:
             print(f"[VOICE] Speech synthesis error: {e}")
             return b''
@@ -247,9 +279,12 @@ class VoiceWebSocketServer:
         print(f"[SERVER] Voice Agent: {self.voice_reporter.agent_name}")
         print(f"[SERVER] ElevenLabs: {'ENABLED' if self.elevenlabs_api_key else 'DISABLED (set ELEVENLABS_API_KEY)'}")
 
-        async with websockets.serve(self.handle_connection, host, port):
-            print(f"[SERVER] Server running! Ready for connections...")
-            await asyncio.Future()  # Run forever
+        try:
+            async with websockets.serve(self.handle_connection, host, port):
+                print(f"[SERVER] Server running! Ready for connections...")
+                await asyncio.Future()  # Run forever
+        finally:
+            await self.close()
 
 async def main():
     """Main server startup"""
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+CTAS-7 WebSocket Broadcaster
+Fan-out of one message to many WebSocket clients without letting a slow client hold up the rest
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Union
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # Metrics are optional outside the enterprise voice package
+    Counter = Gauge = Histogram = None
+
+if Histogram is not None:
+    broadcast_delivery_lag = Histogram(
+        'ctas7_broadcast_delivery_lag_seconds',
+        'Time a broadcast message waited in a client queue before it was sent',
+        ['broadcaster'],
+        buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    )
+    broadcast_client_max_lag = Gauge(
+        'ctas7_broadcast_client_max_lag_seconds',
+        'Age of the oldest undelivered message across clients',
+        ['broadcaster']
+    )
+    broadcast_messages_total = Counter(
+        'ctas7_broadcast_messages_total',
+        'Per-client broadcast outcomes',
+        ['broadcaster', 'result']
+    )
+    broadcast_clients = Gauge('ctas7_broadcast_clients', 'Connected broadcast clients', ['broadcaster'])
+
+# Messages allowed to wait per client before the oldest is dropped
+DEFAULT_QUEUE_SIZE = 32
+# A client that cannot accept one message in this many seconds is disconnected
+DEFAULT_SEND_TIMEOUT = 10.0
+
+class ClientChannel:
+    """Bounded send queue and writer task for one client.
+
+    Messages published with a conflation key replace an undelivered message
+    with the same key, so a lagging client only receives the latest snapshot.
+    """
+
+    def __init__(self, broadcaster: "Broadcaster", websocket):
+        self.broadcaster = broadcaster
+        self.websocket = websocket
+        self.pending = deque()  # [conflate_key, message, enqueued_at]
+        self.pending_by_key: Dict[str, list] = {}
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.last_lag = 0.0
+        self.task = asyncio.create_task(self._writer())
+
+    def enqueue(self, message: str, conflate_key: Optional[str] = None):
+        if conflate_key is not None:
+            entry = self.pending_by_key.get(conflate_key)
+            if entry is not None:
+                entry[1] = message
+                self.conflated += 1
+                self.broadcaster._count("conflated")
+                return
+
+        if len(self.pending) >= self.broadcaster.max_queue:
+            stale_key, _, _ = self.pending.popleft()
+            if stale_key is not None:
+                self.pending_by_key.pop(stale_key, None)
+            self.dropped += 1
+            self.broadcaster._count("dropped")
+
+        entry = [conflate_key, message, time.monotonic()]
+        self.pending.append(entry)
+        if conflate_key is not None:
+            self.pending_by_key[conflate_key] = entry
+        self.ready.set()
+
+    async def _close(self):
+        try:
+            await asyncio.wait_for(self.websocket.close(), self.broadcaster.send_timeout)
+        except Exception:
+            # The closing handshake stalled too; drop the connection outright
+            transport = getattr(self.websocket, "transport", None)
+            if transport is not None:
+                transport.abort()
+
+    def lag(self, now: Optional[float] = None) -> float:
+        """Seconds the oldest undelivered message has been waiting"""
+        if not self.pending:
+            return 0.0
+        return (now or time.monotonic()) - self.pending[0][2]
+
+    async def _writer(self):
+        while True:
+            if not self.pending:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+
+            conflate_key, message, enqueued_at = self.pending.popleft()
+            if conflate_key is not None:
+                self.pending_by_key.pop(conflate_key, None)
+
+            try:
+                await asyncio.wait_for(self.websocket.send(message), self.broadcaster.send_timeout)
+            except Exception:
+                # Closed, or too slow to accept even one message. A timed-out send
+                # may have stopped mid-frame, so the connection cannot be reused:
+                # close it so the server's handler ends and the client can reconnect.
+                self.broadcaster._count("disconnected")
+                await self._close()
+                self.broadcaster._discard(self)
+                return
+
+            self.sent += 1
+            self.last_lag = time.monotonic() - enqueued_at
+            self.broadcaster._count("sent")
+            if Histogram is not None:
+                broadcast_delivery_lag.labels(broadcaster=self.broadcaster.name).observe(self.last_lag)
+
+class Broadcaster:
+    """Serializes each message once and hands it to every client's own queue.
+
+    ``publish`` never waits on a client; each client drains its queue in its
+    own writer task, so one slow or stalled connection only delays itself.
+    """
+
+    def __init__(self, name: str, max_queue: int = DEFAULT_QUEUE_SIZE, send_timeout: float = DEFAULT_SEND_TIMEOUT):
+        self.name = name
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.channels: Dict[Any, ClientChannel] = {}
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def add(self, websocket) -> ClientChannel:
+        channel = self.channels.get(websocket)
+        if channel is None:
+            channel = self.channels[websocket] = ClientChannel(self, websocket)
+            self._update_client_gauge()
+        return channel
+
+    async def remove(self, websocket):
+        channel = self.channels.pop(websocket, None)
+        if channel is not None:
+            channel.task.cancel()
+            await asyncio.gather(channel.task, return_exceptions=True)
+            self._update_client_gauge()
+
+    def publish(self, message: Union[str, Dict], conflate_key: Optional[str] = None) -> int:
+        """Queue a message for every client; returns how many clients it was queued for"""
+        if not isinstance(message, str):
+            message = json.dumps(message)
+        for channel in list(self.channels.values()):
+            channel.enqueue(message, conflate_key)
+        self._update_lag_gauge()
+        return len(self.channels)
+
+    def send_to(self, websocket, message: Union[str, Dict], conflate_key: Optional[str] = None):
+        """Queue a message for one client, in order with its broadcasts"""
+        if not isinstance(message, str):
+            message = json.dumps(message)
+        self.add(websocket).enqueue(message, conflate_key)
+
+    async def close(self):
+        for websocket in list(self.channels):
+            await self.remove(websocket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        clients = [
+            {
+                "remote_address": str(getattr(channel.websocket, "remote_address", "")),
+                "queued": len(channel.pending),
+                "lag_seconds": round(channel.lag(now), 3),
+                "last_delivery_lag_seconds": round(channel.last_lag, 3),
+                "sent": channel.sent,
+                "dropped": channel.dropped,
+                "conflated": channel.conflated
+            }
+            for channel in self.channels.values()
+        ]
+        return {
+            "broadcaster": self.name,
+            "clients": len(clients),
+            "max_lag_seconds": max((c["lag_seconds"] for c in clients), default=0.0),
+            "per_client": clients
+        }
+
+    def _discard(self, channel: ClientChannel):
+        if self.channels.get(channel.websocket) is channel:
+            del self.channels[channel.websocket]
+            self._update_client_gauge()
+
+    def _count(self, result: str):
+        if Counter is not None:
+            broadcast_messages_total.labels(broadcaster=self.name, result=result).inc()
+
+    def _update_client_gauge(self):
+        if Gauge is not None:
+            broadcast_clients.labels(broadcaster=self.name).set(len(self.channels))
+
+    def _update_lag_gauge(self):
+        if Gauge is not None:
+            now = time.monotonic()
+            max_lag = max((channel.lag(now) for channel in self.channels.values()), default=0.0)
+            broadcast_client_max_lag.labels(broadcaster=self.name).set(max_lag)